@@ -1,5 +1,6 @@
 import importlib.util
 import os
+import sqlite3
 import sys
 from logging.config import fileConfig
 from pathlib import Path
@@ -78,10 +79,16 @@ def run_migrations_turso() -> None:
     class MockOp:
         @staticmethod
         def execute(sql: str):
-            for stmt in sql.strip().split(";"):
-                stmt = stmt.strip()
-                if stmt:
-                    conn.execute(stmt)
+            # Split on ";" but keep trigger bodies (BEGIN ...; ...; END) together
+            stmt = ""
+            for part in sql.strip().split(";"):
+                stmt = f"{stmt};{part}" if stmt else part
+                if sqlite3.complete_statement(stmt + ";"):
+                    if stmt.strip():
+                        conn.execute(stmt.strip())
+                    stmt = ""
+            if stmt.strip():
+                conn.execute(stmt.strip())
 
     # Run each migration
     for revision, module in pending:
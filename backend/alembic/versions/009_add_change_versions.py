@@ -0,0 +1,70 @@
+"""Add change version counter for delta sync
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = '009'
+down_revision: Union[str, None] = '008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VERSIONED_TABLES = ("tasks", "household_members", "task_completions", "notes")
+
+
+def upgrade() -> None:
+    # Single-row table holding the household-wide change version
+    op.execute("""
+        CREATE TABLE sync_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+    """)
+    op.execute("INSERT INTO sync_state (id, version) VALUES (1, 1)")
+
+    for table in VERSIONED_TABLES:
+        # Existing rows belong to version 1 so a sync from version 0 returns everything
+        op.execute(f"ALTER TABLE {table} ADD COLUMN updated_version INTEGER NOT NULL DEFAULT 1")
+        op.execute(f"CREATE INDEX idx_{table}_updated_version ON {table}(updated_version)")
+
+        # Triggers bump the counter in the same transaction as the write and
+        # stamp the row with the new version. The WHEN guard skips the stamping
+        # UPDATE itself so a write bumps the version exactly once.
+        op.execute(f"""
+            CREATE TRIGGER {table}_version_insert AFTER INSERT ON {table}
+            BEGIN
+                UPDATE sync_state SET version = version + 1 WHERE id = 1;
+                UPDATE {table} SET updated_version = (SELECT version FROM sync_state WHERE id = 1)
+                WHERE id = NEW.id;
+            END
+        """)
+        op.execute(f"""
+            CREATE TRIGGER {table}_version_update AFTER UPDATE ON {table}
+            WHEN NEW.updated_version IS OLD.updated_version
+            BEGIN
+                UPDATE sync_state SET version = version + 1 WHERE id = 1;
+                UPDATE {table} SET updated_version = (SELECT version FROM sync_state WHERE id = 1)
+                WHERE id = NEW.id;
+            END
+        """)
+        op.execute(f"""
+            CREATE TRIGGER {table}_version_delete AFTER DELETE ON {table}
+            BEGIN
+                UPDATE sync_state SET version = version + 1 WHERE id = 1;
+            END
+        """)
+
+
+def downgrade() -> None:
+    for table in VERSIONED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_version_delete")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_version_update")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_version_insert")
+        op.execute(f"DROP INDEX IF EXISTS idx_{table}_updated_version")
+        op.execute(f"ALTER TABLE {table} DROP COLUMN updated_version")
+    op.execute("DROP TABLE IF EXISTS sync_state")
@@ -0,0 +1,60 @@
+"""Add append-only change_log table for cross-worker change notification
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = '010'
+down_revision: Union[str, None] = '009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LOGGED_TABLES = ("tasks", "household_members", "task_completions", "notes")
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE change_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            operation TEXT NOT NULL,
+            changed_at TEXT NOT NULL DEFAULT (datetime('now'))
+        )
+    """)
+
+    # Triggers write the log entry in the same transaction as the change itself.
+    # The update trigger skips the updated_version stamping done by the 009 triggers.
+    for table in LOGGED_TABLES:
+        op.execute(f"""
+            CREATE TRIGGER {table}_change_log_insert AFTER INSERT ON {table}
+            BEGIN
+                INSERT INTO change_log (table_name, row_id, operation) VALUES ('{table}', NEW.id, 'insert');
+            END
+        """)
+        op.execute(f"""
+            CREATE TRIGGER {table}_change_log_update AFTER UPDATE ON {table}
+            WHEN NEW.updated_version IS OLD.updated_version
+            BEGIN
+                INSERT INTO change_log (table_name, row_id, operation) VALUES ('{table}', NEW.id, 'update');
+            END
+        """)
+        op.execute(f"""
+            CREATE TRIGGER {table}_change_log_delete AFTER DELETE ON {table}
+            BEGIN
+                INSERT INTO change_log (table_name, row_id, operation) VALUES ('{table}', OLD.id, 'delete');
+            END
+        """)
+
+
+def downgrade() -> None:
+    for table in LOGGED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_change_log_delete")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_change_log_update")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_change_log_insert")
+    op.execute("DROP TABLE IF EXISTS change_log")
@@ -0,0 +1,32 @@
+"""Stamp a member's tasks when the member is renamed
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = '011'
+down_revision: Union[str, None] = '010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Task responses carry the assignee's name, so a rename changes them too.
+    # The no-op update fires the tasks' 009 and 010 triggers, which give each
+    # task a new version and a change_log entry in the rename's transaction.
+    op.execute("""
+        CREATE TRIGGER household_members_rename_tasks AFTER UPDATE OF name ON household_members
+        WHEN NEW.name IS NOT OLD.name
+        BEGIN
+            UPDATE tasks SET assigned_to_id = assigned_to_id WHERE assigned_to_id = NEW.id;
+        END
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS household_members_rename_tasks")
@@ -0,0 +1,35 @@
+"""Load-test and latency benchmarks for the API.
+
+Seeds a household of configurable size into a fresh SQLite database, then
+drives the read endpoints with concurrent clients and reports throughput and
+latency percentiles per endpoint. Run from the backend directory:
+
+    python -m bench --tasks 500 --completions 5000 --concurrency 8
+    python -m bench --mode http --baseline bench/results/baseline.json
+
+`--mode inprocess` (the default) calls the ASGI app directly, so the numbers
+cover routing, dependencies, database and serialization. `--mode http` runs
+uvicorn in a background thread and adds the HTTP server and socket overhead.
+
+`--backend turso` serves the seeded file through the local Hrana stand-in
+(bench/hrana_server.py), with `--turso-latency-ms` added to each round trip.
+
+`python -m bench.micro` times the inner loops (domain services, row mapping,
+Turso response parsing) on their own; see bench/micro.py.
+`python -m bench.startup` times importing the app and a cold start; see
+bench/startup.py.
+"""
+from .load import ENDPOINTS, run_benchmark
+from .report import compare, percentile, summarize
+from .seed import HouseholdSpec, create_database, seed_household
+
+__all__ = [
+    "ENDPOINTS",
+    "run_benchmark",
+    "compare",
+    "percentile",
+    "summarize",
+    "HouseholdSpec",
+    "create_database",
+    "seed_household",
+]
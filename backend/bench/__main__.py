@@ -0,0 +1,74 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from .load import BACKENDS, MODES, run_benchmark
+from .report import compare, format_table
+from .seed import HouseholdSpec
+
+RESULTS_DIR = Path(__file__).parent / "results"
+# Settings that must match for a comparison against a baseline to mean much
+COMPARABLE_SETTINGS = ("mode", "backend", "turso_latency_ms", "tasks", "members", "completions", "concurrency")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench", description="Load-test the read endpoints.")
+    parser.add_argument("--mode", choices=MODES, default="inprocess")
+    parser.add_argument("--backend", choices=BACKENDS, default="sqlite", help="turso: through the local Hrana stand-in")
+    parser.add_argument("--turso-latency-ms", type=float, default=0.0, help="added to every Turso round trip")
+    parser.add_argument("--turso-jitter-ms", type=float, default=0.0, help="random extra delay, up to this much")
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--members", type=int, default=4)
+    parser.add_argument("--completions", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--concurrency", type=int, default=4, help="concurrent clients")
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint")
+    parser.add_argument("--output", type=Path, default=RESULTS_DIR / "latest.json")
+    parser.add_argument("--baseline", type=Path, help="report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown as a fraction")
+    parser.add_argument("--save-baseline", action="store_true", help="also write the report to --baseline")
+    args = parser.parse_args(argv)
+
+    spec = HouseholdSpec(tasks=args.tasks, members=args.members, completions=args.completions, seed=args.seed)
+    report = run_benchmark(
+        spec,
+        mode=args.mode,
+        concurrency=args.concurrency,
+        requests=args.requests,
+        backend=args.backend,
+        turso_latency=args.turso_latency_ms / 1000,
+        turso_jitter=args.turso_jitter_ms / 1000,
+    )
+    print(format_table(report))
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"\nReport written to {args.output}")
+
+    if args.baseline is None:
+        return 0
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2))
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save-baseline first", file=sys.stderr)
+        return 2
+
+    baseline = json.loads(args.baseline.read_text())
+    differing = [key for key in COMPARABLE_SETTINGS if baseline["meta"].get(key) != report["meta"][key]]
+    if differing:
+        print(f"Warning: baseline was run with different {', '.join(differing)}", file=sys.stderr)
+
+    regressions = compare(report, baseline, args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if not regressions:
+        print("No regressions against the baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+"""Generate a production-scale household with years of completion history.
+
+Each task gets a start date somewhere in the covered period and a completion
+history that follows its recurrence: every due date is completed on the day
+or a little late, at an hour that fits its time of day, mostly by the member
+it is assigned to, or is occasionally skipped. Tasks end up with the
+last_completed, next_due and is_active the app would have given them, and a
+share of them are left overdue.
+
+    python -m bench.dataset --path bench/results/large.db --tasks 2000 --years 3
+    python -m bench.dataset --turso --tasks 500  # migrated database at TURSO_DATABASE_URL
+
+Writes go through the repositories, in one snapshot, with completions
+inserted in bulk.
+"""
+import argparse
+import random
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Iterator
+
+from src.domain import (
+    HouseholdMember,
+    RecurrencePattern,
+    RecurrenceType,
+    Task,
+    TaskCompletion,
+    TimeOfDay,
+    Urgency,
+    calculate_next_due,
+)
+from src.infrastructure import (
+    Database,
+    SQLiteCompletionRepository,
+    SQLiteMemberRepository,
+    SQLiteTaskRepository,
+)
+from .seed import TASK_NAMES, create_database
+
+# (pattern, weight): roughly the mix of a real household's task list
+RECURRENCE_MIX = (
+    (RecurrencePattern(type=RecurrenceType.DAILY), 8),
+    (RecurrencePattern(type=RecurrenceType.DAILY, time_of_day=TimeOfDay.MORNING), 5),
+    (RecurrencePattern(type=RecurrenceType.DAILY, time_of_day=TimeOfDay.EVENING), 5),
+    (RecurrencePattern(type=RecurrenceType.DAILY, interval=2), 4),
+    (RecurrencePattern(type=RecurrenceType.WEEKLY), 14),
+    (RecurrencePattern(type=RecurrenceType.WEEKLY, days=(0, 3)), 6),
+    (RecurrencePattern(type=RecurrenceType.WEEKLY, days=(6,)), 4),
+    (RecurrencePattern(type=RecurrenceType.BIWEEKLY), 10),
+    (RecurrencePattern(type=RecurrenceType.MONTHLY), 16),
+    (RecurrencePattern(type=RecurrenceType.MONTHLY, interval=3), 5),
+    (RecurrencePattern(type=RecurrenceType.QUARTERLY), 8),
+    (RecurrencePattern(type=RecurrenceType.YEARLY), 4),
+    (RecurrencePattern(type=RecurrenceType.YEARLY, interval=3), 3),
+    (RecurrencePattern(type=RecurrenceType.EENMALIG), 8),
+)
+PATTERNS = tuple(pattern for pattern, _ in RECURRENCE_MIX)
+WEIGHTS = tuple(weight for _, weight in RECURRENCE_MIX)
+
+# Hours at which tasks get done
+HOURS = {
+    TimeOfDay.MORNING: (6, 10),
+    TimeOfDay.EVENING: (18, 23),
+    None: (8, 22),
+}
+FLUSH_EVERY = 5000  # completions buffered before a bulk insert
+
+
+@dataclass
+class DatasetSpec:
+    tasks: int = 1000
+    members: int = 4
+    years: float = 3.0
+    seed: int = 42
+    skip_rate: float = 0.1  # share of due dates nobody completes
+    late_rate: float = 0.3  # share of completions done after the due date
+    max_late_days: int = 3
+    assigned_share: float = 0.6  # share of tasks assigned to a member
+
+
+@dataclass
+class DatasetStats:
+    members: int
+    tasks: int
+    completions: int
+    seconds: float
+
+
+def completion_history(
+    task: Task,
+    start: date,
+    today: date,
+    spec: DatasetSpec,
+    rng: random.Random,
+) -> tuple[list[datetime], date | None]:
+    """Completion times of `task` from `start` up to `today`, and its resulting next due date.
+
+    The next due date is None once a one-time task is done. When the last due
+    date before today is skipped, it stays the next due date, so the task is
+    overdue.
+    """
+    now = datetime.combine(today, datetime.min.time()) + timedelta(hours=23, minutes=59)
+    low, high = HOURS[task.recurrence.time_of_day]
+    completed: list[datetime] = []
+    due = start
+    while due is not None and due <= today:
+        if rng.random() < spec.skip_rate:
+            following = calculate_next_due(task, datetime.combine(due, datetime.min.time()))
+            if following is None or following > today:
+                break  # the last occurrence before today is left undone
+            due = following
+            continue
+
+        late = rng.randint(1, spec.max_late_days) if rng.random() < spec.late_rate else 0
+        completed_at = datetime.combine(due + timedelta(days=late), datetime.min.time()) + timedelta(
+            hours=rng.randint(low, high - 1), minutes=rng.randrange(60)
+        )
+        completed_at = min(completed_at, now)
+        completed.append(completed_at)
+        due = calculate_next_due(task, completed_at)
+    return completed, due
+
+
+def generate_tasks(
+    spec: DatasetSpec,
+    members: list[HouseholdMember],
+    today: date,
+    rng: random.Random,
+) -> Iterator[tuple[Task, date]]:
+    """New tasks, each with the date its history starts."""
+    span = int(spec.years * 365)
+    for i in range(spec.tasks):
+        pattern = rng.choices(PATTERNS, WEIGHTS)[0]
+        if pattern.type == RecurrenceType.EENMALIG:
+            # One-time tasks are mostly recent
+            start = today - timedelta(days=rng.randint(0, min(span, 90)))
+        else:
+            # Most tasks have been around a long time; a few were added lately
+            start = today - timedelta(days=int(span * (1 - rng.random() ** 3)))
+        assigned = rng.choice(members) if members and rng.random() < spec.assigned_share else None
+        task = Task(
+            id=None,
+            name=f"{TASK_NAMES[i % len(TASK_NAMES)]} {i // len(TASK_NAMES) + 1}",
+            recurrence=pattern,
+            urgency_label=rng.choices((None, Urgency.HIGH, Urgency.MEDIUM, Urgency.LOW), (6, 1, 1, 2))[0],
+            assigned_to_id=assigned.id if assigned else None,
+            autocomplete=rng.random() < 0.03,
+        )
+        yield task, start
+
+
+def build_dataset(db: Database, spec: DatasetSpec, today: date | None = None) -> DatasetStats:
+    """Write a household per `spec` into `db`, which must have the schema and no tasks yet."""
+    started = time.perf_counter()
+    today = today or date.today()
+    rng = random.Random(spec.seed)
+
+    member_repo = SQLiteMemberRepository(db)
+    task_repo = SQLiteTaskRepository(db)
+    completion_repo = SQLiteCompletionRepository(db)
+
+    pending: list[TaskCompletion] = []
+    completions = 0
+    with db.snapshot():
+        members = [
+            member_repo.save(HouseholdMember(id=None, name=f"Member {i + 1}", email=f"member{i + 1}@example.com"))
+            for i in range(spec.members)
+        ]
+        # Some members do far more than others
+        activity = [rng.uniform(0.2, 1.0) for _ in members]
+
+        for task, start in generate_tasks(spec, members, today, rng):
+            history, next_due = completion_history(task, start, today, spec, rng)
+            task.last_completed = history[-1] if history else None
+            task.next_due = next_due
+            task.is_active = next_due is not None or not history  # done one-time tasks are retired
+            task_repo.save(task)
+
+            for completed_at in history:
+                if task.assigned_to_id is not None and rng.random() < 0.8:
+                    member_id = task.assigned_to_id
+                else:
+                    member_id = rng.choices(members, activity)[0].id if members else None
+                pending.append(TaskCompletion(id=None, task_id=task.id, completed_at=completed_at, completed_by_id=member_id))
+
+            if len(pending) >= FLUSH_EVERY:
+                completions += len(completion_repo.save_many(pending))
+                pending = []
+        completions += len(completion_repo.save_many(pending))
+
+    return DatasetStats(len(members), spec.tasks, completions, time.perf_counter() - started)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench.dataset", description="Generate a large household.")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--path", help="new SQLite database file to create")
+    target.add_argument("--turso", action="store_true", help="write to the configured Turso database")
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--members", type=int, default=4)
+    parser.add_argument("--years", type=float, default=3.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    db = Database(use_turso=True) if args.turso else create_database(args.path)
+    spec = DatasetSpec(tasks=args.tasks, members=args.members, years=args.years, seed=args.seed)
+    stats = build_dataset(db, spec)
+    db.close()
+    print(
+        f"Wrote {stats.members} members, {stats.tasks} tasks and {stats.completions} completions "
+        f"in {stats.seconds:.1f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
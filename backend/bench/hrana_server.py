@@ -0,0 +1,312 @@
+"""Local stand-in for Turso: the Hrana `/v2/pipeline` endpoint over a SQLite file.
+
+Implements the subset TursoConnection and alembic's run_migrations_turso use:
+execute (positional and named args), store_sql, close_sql, get_autocommit
+and close, with batons handed out per stream. A stream is one SQLite
+connection, so transactions span pipelines just as they do on Turso.
+Unknown or expired batons get HTTP 400.
+
+Latency, jitter and failures can be injected, to measure round-trip savings
+and tail behaviour without a network:
+
+    python -m bench.hrana_server --db bench/results/turso.db --latency-ms 30 --jitter-ms 20
+    TURSO_DATABASE_URL=http://127.0.0.1:8080 TURSO_AUTH_TOKEN=local alembic upgrade head
+
+In tests, use it as a context manager:
+
+    with HranaServer(path, latency=0.01) as server:
+        db = Database(use_turso=True, turso_url=server.url, turso_token=server.token)
+"""
+import argparse
+import base64
+import json
+import random
+import secrets
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STREAM_TIMEOUT = 10.0  # seconds an idle stream is kept open
+FAILURE_DISCONNECT = "disconnect"  # failure mode: drop the connection without answering
+
+
+class HranaError(Exception):
+    pass
+
+
+def to_value(value) -> dict:
+    """Python value -> Hrana value."""
+    if value is None:
+        return {"type": "null"}
+    if isinstance(value, int):
+        return {"type": "integer", "value": str(value)}
+    if isinstance(value, float):
+        return {"type": "float", "value": value}
+    if isinstance(value, bytes):
+        return {"type": "blob", "base64": base64.b64encode(value).decode().rstrip("=")}
+    return {"type": "text", "value": str(value)}
+
+
+def from_value(value: dict):
+    """Hrana value -> Python value."""
+    value_type = value.get("type")
+    if value_type == "null":
+        return None
+    if value_type == "integer":
+        return int(value["value"])
+    if value_type == "float":
+        return float(value["value"])
+    if value_type == "blob":
+        data = value["base64"]
+        return base64.b64decode(data + "=" * (-len(data) % 4))
+    if value_type == "text":
+        return value["value"]
+    raise HranaError(f"Unsupported value type: {value_type}")
+
+
+class Stream:
+    """One Hrana stream: a SQLite connection and the statements stored on it."""
+
+    def __init__(self, db_path: str):
+        # Autocommit, like Turso: statements commit unless a BEGIN is open
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self.stored_sql: dict[int, str] = {}
+        self.last_used = time.monotonic()
+
+    def execute(self, stmt: dict) -> dict:
+        if "sql" in stmt:
+            sql = stmt["sql"]
+        elif stmt.get("sql_id") in self.stored_sql:
+            sql = self.stored_sql[stmt["sql_id"]]
+        else:
+            raise HranaError(f"SQL text with id {stmt.get('sql_id')} was not stored")
+
+        if stmt.get("named_args"):
+            params = {arg["name"].lstrip(":@$"): from_value(arg["value"]) for arg in stmt["named_args"]}
+        else:
+            params = [from_value(arg) for arg in stmt.get("args", [])]
+
+        cursor = self.conn.execute(sql, params)
+        rows = cursor.fetchall() if stmt.get("want_rows", True) else []
+        return {
+            "cols": [{"name": column[0], "decltype": None} for column in cursor.description or ()],
+            "rows": [[to_value(value) for value in row] for row in rows],
+            "affected_row_count": max(cursor.rowcount, 0),
+            "last_insert_rowid": str(cursor.lastrowid) if cursor.lastrowid else None,
+        }
+
+    def handle(self, request: dict) -> dict:
+        request_type = request.get("type")
+        if request_type == "execute":
+            return {"type": "execute", "result": self.execute(request["stmt"])}
+        if request_type == "store_sql":
+            self.stored_sql[request["sql_id"]] = request["sql"]
+        elif request_type == "close_sql":
+            self.stored_sql.pop(request["sql_id"], None)
+        elif request_type == "get_autocommit":
+            return {"type": "get_autocommit", "is_autocommit": not self.conn.in_transaction}
+        elif request_type != "close":
+            raise HranaError(f"Unsupported request type: {request_type}")
+        return {"type": request_type}
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class HranaServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        db_path: str,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        token: str = "local",
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        failure_status: int | str = 503,
+        seed: int | None = None,
+    ):
+        """`latency` and `jitter` are in seconds; each pipeline waits latency plus up to
+        jitter. `failure_rate` of pipelines fail with `failure_status`, an HTTP status
+        or FAILURE_DISCONNECT, before any statement runs."""
+        super().__init__((host, port), PipelineHandler)
+        self.db_path = db_path
+        self.token = token
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.stream_timeout = STREAM_TIMEOUT
+        self.pipelines = 0  # pipelines answered, failures included
+        self.statements = 0  # execute requests run
+        self._rng = random.Random(seed)
+        self._failures: list[int | str] = []
+        self._slow: list[float] = []
+        self._streams: dict[str, Stream] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def fail_next(self, count: int = 1, status: int | str = 503) -> None:
+        """Fail the next `count` pipelines with `status`, on top of the random failures."""
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def slow_next(self, count: int = 1, seconds: float = 1.0) -> None:
+        """Delay the next `count` pipelines by `seconds` instead of the usual latency."""
+        with self._lock:
+            self._slow.extend([seconds] * count)
+
+    def injected_failure(self) -> int | str | None:
+        with self._lock:
+            self.pipelines += 1
+            if self._failures:
+                return self._failures.pop(0)
+            if self.failure_rate and self._rng.random() < self.failure_rate:
+                return self.failure_status
+            return None
+
+    def delay(self) -> float:
+        with self._lock:
+            if self._slow:
+                return self._slow.pop(0)
+            return self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def _take_stream(self, baton: str | None) -> Stream:
+        with self._lock:
+            now = time.monotonic()
+            for expired in [b for b, s in self._streams.items() if now - s.last_used > self.stream_timeout]:
+                self._streams.pop(expired).close()
+            if baton is None:
+                return Stream(self.db_path)
+            stream = self._streams.pop(baton, None)
+        if stream is None:
+            raise HranaError("Stream handle is invalid or expired")
+        return stream
+
+    def pipeline(self, payload: dict) -> dict:
+        stream = self._take_stream(payload.get("baton"))
+        results = []
+        closed = False
+        for request in payload.get("requests", []):
+            try:
+                results.append({"type": "ok", "response": stream.handle(request)})
+            except (sqlite3.Error, HranaError, KeyError) as e:
+                results.append({"type": "error", "error": {"message": str(e), "code": "SQLITE_ERROR"}})
+            if request.get("type") == "close":
+                closed = True
+                break
+
+        with self._lock:
+            self.statements += sum(request.get("type") == "execute" for request in payload.get("requests", []))
+        if closed:
+            stream.close()
+            return {"baton": None, "base_url": None, "results": results}
+        baton = secrets.token_urlsafe(12)
+        stream.last_used = time.monotonic()
+        with self._lock:
+            self._streams[baton] = stream
+        return {"baton": baton, "base_url": None, "results": results}
+
+    def open_streams(self) -> int:
+        with self._lock:
+            return len(self._streams)
+
+    def start(self) -> "HranaServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        with self._lock:
+            streams, self._streams = self._streams, {}
+        for stream in streams.values():
+            stream.close()
+
+    def __enter__(self) -> "HranaServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+class PipelineHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, Nagle's
+    # algorithm and delayed ACKs add ~40 ms to every keep-alive round trip
+    disable_nagle_algorithm = True
+    server: HranaServer
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path.rstrip("/") != "/v2/pipeline":
+            self._reply(404, {"error": f"Not found: {self.path}"})
+            return
+        if self.headers.get("Authorization") != f"Bearer {self.server.token}":
+            self._reply(401, {"error": "Unauthorized"})
+            return
+
+        failure = self.server.injected_failure()
+        time.sleep(self.server.delay())
+        if failure == FAILURE_DISCONNECT:
+            self.close_connection = True
+            return
+        if failure is not None:
+            self._reply(int(failure), {"error": "Injected failure"})
+            return
+
+        try:
+            self._reply(200, self.server.pipeline(json.loads(body)))
+        except HranaError as e:
+            self._reply(400, {"error": str(e)})
+
+    def _reply(self, status: int, payload: dict) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m bench.hrana_server", description="Serve a SQLite file over Hrana.")
+    parser.add_argument("--db", required=True, help="SQLite database file")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--token", default="local", help="expected bearer token")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="share of pipelines that fail")
+    parser.add_argument("--failure-status", default="503", help=f"HTTP status, or {FAILURE_DISCONNECT!r}")
+    args = parser.parse_args(argv)
+
+    failure_status = args.failure_status if args.failure_status == FAILURE_DISCONNECT else int(args.failure_status)
+    server = HranaServer(
+        args.db, args.host, args.port, args.token,
+        latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+        failure_rate=args.failure_rate, failure_status=failure_status,
+    )
+    print(f"Serving {args.db} at {server.url}/v2/pipeline (token {args.token!r})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
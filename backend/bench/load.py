@@ -0,0 +1,152 @@
+"""Drive the read endpoints with concurrent clients and time every request."""
+import asyncio
+import os
+import platform
+import socket
+import tempfile
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timezone
+from typing import Iterator
+
+import httpx
+import uvicorn
+
+from src.infrastructure import AuthService, Database, set_database
+from src.presentation.main import app
+from .hrana_server import HranaServer
+from .report import EndpointRun, summarize
+from .seed import HouseholdSpec, create_database, seed_household
+
+ENDPOINTS = (
+    "/api/tasks",
+    "/api/tasks/urgent",
+    "/api/tasks/upcoming",
+    "/api/dashboard",
+    "/api/history",
+    "/api/members",
+    "/api/notes",
+)
+MODES = ("inprocess", "http")
+BACKENDS = ("sqlite", "turso")
+WARMUP_REQUESTS = 3
+SERVER_START_TIMEOUT = 10.0
+
+
+@contextmanager
+def serve(application) -> Iterator[str]:
+    """Run `application` under uvicorn in a background thread; yields its base URL."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(application, log_level="warning"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while not server.started:
+        if not thread.is_alive() or time.monotonic() > deadline:
+            raise RuntimeError("uvicorn did not start")
+        time.sleep(0.01)
+
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=SERVER_START_TIMEOUT)
+        sock.close()
+
+
+async def _measure(client: httpx.AsyncClient, path: str, requests: int, concurrency: int) -> EndpointRun:
+    for _ in range(WARMUP_REQUESTS):
+        await client.get(path)
+
+    run = EndpointRun(path)
+    remaining = iter(range(requests))  # shared by the workers; each takes the next request
+
+    async def worker() -> None:
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                response = await client.get(path)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                run.latencies.append(time.perf_counter() - started)
+            else:
+                run.errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    run.elapsed = time.perf_counter() - started
+    return run
+
+
+async def _drive(client: httpx.AsyncClient, endpoints, requests: int, concurrency: int) -> list[EndpointRun]:
+    # One endpoint at a time, so each gets the whole client pool and its own throughput figure
+    return [await _measure(client, path, requests, concurrency) for path in endpoints]
+
+
+def run_benchmark(
+    spec: HouseholdSpec,
+    mode: str = "inprocess",
+    concurrency: int = 4,
+    requests: int = 200,
+    endpoints: tuple[str, ...] = ENDPOINTS,
+    backend: str = "sqlite",
+    turso_latency: float = 0.0,
+    turso_jitter: float = 0.0,
+) -> dict:
+    """Seed a fresh database per `spec`, load the endpoints and return the report.
+
+    With backend "turso" the app reads the seeded file through the local
+    Hrana stand-in, which adds `turso_latency` plus up to `turso_jitter`
+    seconds to every round trip.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode!r}, expected one of {MODES}")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+
+    with tempfile.TemporaryDirectory() as tmp, ExitStack() as stack:
+        path = os.path.join(tmp, "bench.db")
+        db = create_database(path)
+        member = seed_household(db, spec)
+        if backend == "turso":
+            server = stack.enter_context(HranaServer(path, latency=turso_latency, jitter=turso_jitter))
+            db = Database(use_turso=True, turso_url=server.url, turso_token=server.token)
+            stack.callback(db.close)
+        set_database(db)
+        headers = {"Authorization": f"Bearer {AuthService().create_access_token(member.id)}"}
+
+        async def drive(base_url: str, transport: httpx.AsyncBaseTransport | None = None) -> list[EndpointRun]:
+            async with httpx.AsyncClient(base_url=base_url, headers=headers, transport=transport, timeout=30) as client:
+                return await _drive(client, endpoints, requests, concurrency)
+
+        try:
+            if mode == "http":
+                with serve(app) as base_url:
+                    runs = asyncio.run(drive(base_url))
+            else:
+                runs = asyncio.run(drive("http://bench", httpx.ASGITransport(app=app)))
+        finally:
+            set_database(None)
+
+    meta = {
+        "mode": mode,
+        "backend": backend,
+        "turso_latency_ms": turso_latency * 1000,
+        "turso_jitter_ms": turso_jitter * 1000,
+        "tasks": spec.tasks,
+        "members": spec.members,
+        "completions": spec.completions,
+        "seed": spec.seed,
+        "concurrency": concurrency,
+        "requests_per_endpoint": requests,
+        "python": platform.python_version(),
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    return summarize(runs, meta)
@@ -0,0 +1,250 @@
+"""Microbenchmarks for the per-request inner loops.
+
+Covers the domain services, the recurrence parser, task row mapping and
+Turso response parsing, each over synthetic inputs of several sizes:
+
+    python -m bench.micro
+    python -m bench.micro --sizes 100 10000 --filter urgency
+    python -m bench.micro --output bench/results/micro.json --baseline bench/results/micro-baseline.json
+
+Every case processes `size` items per call. Throughput is reported in items
+per second. Allocations are measured in a separate call under tracemalloc,
+so they don't skew the timings. `peak KiB` is the most memory held at once
+during the call, and `blocks` is the number of allocations still alive when
+the call returns, which is mostly the result the call built.
+"""
+import argparse
+import gc
+import json
+import random
+import sqlite3
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable
+
+from src.domain import Task, Urgency, auto_advance_due_date, calculate_next_due, calculate_urgency
+from src.domain.services import _add_months, _next_weekday
+from src.infrastructure import Database, SQLiteTaskRepository
+from src.infrastructure.database import TursoCursor
+from src.infrastructure.repositories import TASK_COLUMNS
+from src.infrastructure.task_importer import parse_recurrence
+from .seed import RECURRENCES
+
+DEFAULT_SIZES = (10, 100, 1000)
+MIN_TIME = 0.2  # seconds of timed calls per case
+
+RECURRENCE_STRINGS = (
+    "Elke ochtend", "Elke avond", "Elke dag", "Elke twee dagen", "Ma do", "Zondag",
+    "2 keer per week", "Elke week", "Elke twee weken", "Om de drie weken", "Elke maand",
+    "Elke drie maanden", "1 keer per kwartaal", "3 keer per jaar", "Eenmalig", "Dinsdag avond",
+)
+
+
+@dataclass
+class Result:
+    name: str
+    size: int
+    items_per_second: float
+    ns_per_item: float
+    peak_kib: float
+    blocks: int
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "size": self.size,
+            "items_per_second": round(self.items_per_second),
+            "ns_per_item": round(self.ns_per_item, 1),
+            "peak_kib": round(self.peak_kib, 1),
+            "blocks": self.blocks,
+        }
+
+
+def make_tasks(size: int, today: date, rng: random.Random) -> list[Task]:
+    return [
+        Task(
+            id=i + 1,
+            name=f"Task {i + 1}",
+            recurrence=RECURRENCES[i % len(RECURRENCES)],
+            urgency_label=rng.choice((None, None, Urgency.HIGH, Urgency.MEDIUM, Urgency.LOW)),
+            next_due=today + timedelta(days=rng.randint(-90, 60)),
+            autocomplete=rng.random() < 0.5,
+            assigned_to_id=rng.choice((None, 1, 2)),
+        )
+        for i in range(size)
+    ]
+
+
+def task_values(task: Task) -> tuple:
+    """A tasks-table row for `task`, in TASK_COLUMNS order."""
+    recurrence = task.recurrence
+    return (
+        task.id,
+        recurrence.type.value,
+        json.dumps(list(recurrence.days)) if recurrence.days else None,
+        recurrence.interval,
+        task.urgency_label.value if task.urgency_label else None,
+        task.next_due.isoformat() if task.next_due else None,
+        int(task.is_active),
+        int(task.autocomplete),
+        task.name,
+        recurrence.time_of_day.value if recurrence.time_of_day else None,
+        "2026-01-05T08:30:00",
+        task.assigned_to_id,
+        None,
+    )
+
+
+def sqlite_rows(tasks: list[Task]) -> list[sqlite3.Row]:
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute(f"CREATE TABLE tasks ({', '.join(TASK_COLUMNS)})")
+    conn.executemany(
+        f"INSERT INTO tasks VALUES ({', '.join('?' * len(TASK_COLUMNS))})",
+        [task_values(task) for task in tasks],
+    )
+    rows = conn.execute("SELECT * FROM tasks").fetchall()
+    conn.close()
+    return rows
+
+
+def hrana_cell(value) -> dict:
+    if value is None:
+        return {"type": "null"}
+    if isinstance(value, int):
+        return {"type": "integer", "value": str(value)}
+    return {"type": "text", "value": value}
+
+
+def hrana_result(tasks: list[Task]) -> dict:
+    """A Turso execute result holding `tasks`, shaped like the pipeline response."""
+    return {"type": "ok", "response": {"type": "execute", "result": {
+        "cols": [{"name": name, "decltype": None} for name in TASK_COLUMNS],
+        "rows": [[hrana_cell(value) for value in task_values(task)] for task in tasks],
+    }}}
+
+
+def build_cases(size: int, seed: int = 42) -> dict[str, Callable[[], object]]:
+    """Name -> zero-argument callable processing `size` items."""
+    rng = random.Random(seed)
+    today = date.today()
+    tasks = make_tasks(size, today, rng)
+    completed = [datetime.combine(task.next_due, datetime.min.time()) for task in tasks]
+    dates = [today + timedelta(days=rng.randint(0, 3650)) for _ in range(size)]
+    weekday_sets = [rng.choice(((0,), (0, 3), (1, 4, 6), (5, 6))) for _ in range(size)]
+    month_offsets = [rng.choice((1, 2, 3, 6, 12, 13)) for _ in range(size)]
+    recurrence_strings = [RECURRENCE_STRINGS[i % len(RECURRENCE_STRINGS)] for i in range(size)]
+    repo = SQLiteTaskRepository(Database(":memory:", use_turso=False))
+    rows = sqlite_rows(tasks)
+    result = hrana_result(tasks)
+
+    return {
+        "calculate_urgency": lambda: [calculate_urgency(task, today) for task in tasks],
+        "calculate_next_due": lambda: [calculate_next_due(task, at) for task, at in zip(tasks, completed)],
+        "auto_advance_due_date": lambda: [auto_advance_due_date(task, today) for task in tasks],
+        "_next_weekday": lambda: [_next_weekday(d, days, 2) for d, days in zip(dates, weekday_sets)],
+        "_add_months": lambda: [_add_months(d, months) for d, months in zip(dates, month_offsets)],
+        "parse_recurrence": lambda: [parse_recurrence(s) for s in recurrence_strings],
+        "rows_to_tasks": lambda: repo._rows_to_tasks(rows),
+        "turso_parse_rows": lambda: TursoCursor(result)._parse_rows(),
+        "turso_rows_to_tasks": lambda: repo._rows_to_tasks(TursoCursor(result).fetchall()),
+    }
+
+
+def measure(name: str, size: int, func: Callable[[], object], min_time: float = MIN_TIME) -> Result:
+    func()  # warm caches, as they are in a running server
+
+    # Double the loop count until one timed batch takes long enough to trust
+    loops = 1
+    while True:
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - started
+        if gc_was_enabled:
+            gc.enable()
+        if elapsed >= min_time:
+            break
+        loops *= 2
+    items = loops * size
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    kept = func()
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    del kept
+
+    return Result(name, size, items / elapsed, elapsed / items * 1e9, peak / 1024, blocks)
+
+
+def run(sizes=DEFAULT_SIZES, pattern: str | None = None, min_time: float = MIN_TIME) -> list[Result]:
+    results = []
+    for size in sizes:
+        for name, func in build_cases(size).items():
+            if pattern and pattern not in name:
+                continue
+            results.append(measure(name, size, func, min_time))
+    return results
+
+
+def format_table(results: list[Result]) -> str:
+    header = f"{'case':<24}{'size':>7}{'items/s':>14}{'ns/item':>11}{'peak KiB':>11}{'blocks':>9}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lines.append(
+            f"{r.name:<24}{r.size:>7}{r.items_per_second:>14,.0f}{r.ns_per_item:>11,.1f}"
+            f"{r.peak_kib:>11,.1f}{r.blocks:>9}"
+        )
+    return "\n".join(lines)
+
+
+def compare(current: list[dict], baseline: list[dict], tolerance: float = 0.2) -> list[str]:
+    """Cases whose throughput dropped by more than `tolerance` against the baseline."""
+    before = {(r["name"], r["size"]): r for r in baseline}
+    regressions = []
+    for r in current:
+        old = before.get((r["name"], r["size"]))
+        if old and r["items_per_second"] < old["items_per_second"] * (1 - tolerance):
+            regressions.append(
+                f"{r['name']}[{r['size']}]: {old['items_per_second']:,} -> {r['items_per_second']:,} items/s"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench.micro", description="Microbenchmark the inner loops.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--filter", help="only cases whose name contains this")
+    parser.add_argument("--min-time", type=float, default=MIN_TIME, help="seconds of timed calls per case")
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    parser.add_argument("--baseline", type=Path, help="results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown as a fraction")
+    args = parser.parse_args(argv)
+
+    measured = run(args.sizes, args.filter, args.min_time)
+    print(format_table(measured))
+    results = [r.to_dict() for r in measured]
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2))
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
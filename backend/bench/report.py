@@ -0,0 +1,70 @@
+"""Latency summaries and comparison against a saved baseline."""
+import math
+from dataclasses import dataclass, field
+
+
+@dataclass
+class EndpointRun:
+    """Raw measurements for one endpoint."""
+    path: str
+    latencies: list[float] = field(default_factory=list)  # seconds, successful requests only
+    errors: int = 0
+    elapsed: float = 0.0  # wall-clock seconds for the whole run
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of `values` (need not be sorted), `q` in 0..100."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(q / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summarize(runs: list[EndpointRun], meta: dict) -> dict:
+    """JSON-ready report: the run settings plus throughput and latency per endpoint."""
+    endpoints = {}
+    for run in runs:
+        requests = len(run.latencies) + run.errors
+        endpoints[run.path] = {
+            "requests": requests,
+            "errors": run.errors,
+            "throughput_rps": round(requests / run.elapsed, 1) if run.elapsed else 0.0,
+            "mean_ms": round(sum(run.latencies) / len(run.latencies) * 1000, 2) if run.latencies else 0.0,
+            "p50_ms": round(percentile(run.latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(run.latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(run.latencies, 99) * 1000, 2),
+        }
+    return {"meta": meta, "endpoints": endpoints}
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.2) -> list[str]:
+    """Regressions of `current` against `baseline`, as readable lines.
+
+    An endpoint regresses when its p95 grows or its throughput drops by more
+    than `tolerance` (a fraction), or when it starts returning errors.
+    Endpoints missing from either report are skipped.
+    """
+    regressions = []
+    for path, now in current["endpoints"].items():
+        before = baseline["endpoints"].get(path)
+        if before is None:
+            continue
+        if before["p95_ms"] and now["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{path}: p95 {before['p95_ms']} ms -> {now['p95_ms']} ms")
+        if before["throughput_rps"] and now["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{path}: throughput {before['throughput_rps']} -> {now['throughput_rps']} req/s")
+        if now["errors"] > before["errors"]:
+            regressions.append(f"{path}: errors {before['errors']} -> {now['errors']}")
+    return regressions
+
+
+def format_table(report: dict) -> str:
+    header = f"{'endpoint':<24}{'req':>7}{'err':>5}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    lines = [header, "-" * len(header)]
+    for path, stats in report["endpoints"].items():
+        lines.append(
+            f"{path:<24}{stats['requests']:>7}{stats['errors']:>5}{stats['throughput_rps']:>9}"
+            f"{stats['p50_ms']:>9}{stats['p95_ms']:>9}{stats['p99_ms']:>9}"
+        )
+    return "\n".join(lines)
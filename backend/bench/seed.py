@@ -0,0 +1,107 @@
+"""Seed a synthetic household into a fresh database."""
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+
+from alembic import command
+from alembic.config import Config
+
+from src.domain import (
+    HouseholdMember,
+    Note,
+    RecurrencePattern,
+    RecurrenceType,
+    Task,
+    TaskCompletion,
+    TimeOfDay,
+    Urgency,
+)
+from src.infrastructure import (
+    Database,
+    SQLiteCompletionRepository,
+    SQLiteMemberRepository,
+    SQLiteNoteRepository,
+    SQLiteTaskRepository,
+)
+
+TASK_NAMES = (
+    "Stofzuigen", "Dweilen", "Badkamer schoonmaken", "Toilet schoonmaken", "Was draaien",
+    "Was opvouwen", "Vaatwasser uitruimen", "Boodschappen doen", "Planten water geven",
+    "Bedden verschonen", "Ramen lappen", "Koelkast schoonmaken", "Afval buiten zetten",
+    "Oven schoonmaken", "Tuin bijhouden", "Filter afzuigkap", "Rookmelders testen",
+)
+
+# Cycled through so every recurrence type is represented
+RECURRENCES = (
+    RecurrencePattern(type=RecurrenceType.DAILY),
+    RecurrencePattern(type=RecurrenceType.DAILY, time_of_day=TimeOfDay.MORNING),
+    RecurrencePattern(type=RecurrenceType.DAILY, time_of_day=TimeOfDay.EVENING),
+    RecurrencePattern(type=RecurrenceType.DAILY, interval=3),
+    RecurrencePattern(type=RecurrenceType.WEEKLY),
+    RecurrencePattern(type=RecurrenceType.WEEKLY, days=(0, 3)),
+    RecurrencePattern(type=RecurrenceType.BIWEEKLY),
+    RecurrencePattern(type=RecurrenceType.MONTHLY),
+    RecurrencePattern(type=RecurrenceType.MONTHLY, interval=2),
+    RecurrencePattern(type=RecurrenceType.QUARTERLY),
+    RecurrencePattern(type=RecurrenceType.YEARLY),
+    RecurrencePattern(type=RecurrenceType.EENMALIG),
+)
+
+
+@dataclass
+class HouseholdSpec:
+    tasks: int = 200
+    members: int = 4
+    completions: int = 2000
+    seed: int = 42
+
+
+def create_database(path: str) -> Database:
+    """Create a SQLite database at `path` with the schema at alembic head."""
+    alembic_cfg = Config("alembic.ini")
+    alembic_cfg.set_main_option("sqlalchemy.url", f"sqlite:///{path}")
+    command.upgrade(alembic_cfg, "head")
+    return Database(path, use_turso=False)
+
+
+def seed_household(db: Database, spec: HouseholdSpec) -> HouseholdMember:
+    """Fill `db` with the household described by `spec`. Returns the first member."""
+    rng = random.Random(spec.seed)
+    today = date.today()
+
+    with db.snapshot():
+        member_repo = SQLiteMemberRepository(db)
+        members = [
+            member_repo.save(HouseholdMember(id=None, name=f"Member {i + 1}", email=f"member{i + 1}@example.com"))
+            for i in range(max(spec.members, 1))
+        ]
+
+        task_repo = SQLiteTaskRepository(db)
+        tasks = []
+        for i in range(spec.tasks):
+            task = Task(
+                id=None,
+                name=f"{TASK_NAMES[i % len(TASK_NAMES)]} {i // len(TASK_NAMES) + 1}",
+                recurrence=RECURRENCES[i % len(RECURRENCES)],
+                urgency_label=rng.choice((None, None, Urgency.HIGH, Urgency.MEDIUM, Urgency.LOW)),
+                next_due=today + timedelta(days=rng.randint(-30, 60)),
+                assigned_to_id=rng.choice(members).id if rng.random() < 0.6 else None,
+                autocomplete=rng.random() < 0.1,
+            )
+            tasks.append(task_repo.save(task))
+
+        completion_repo = SQLiteCompletionRepository(db)
+        start = datetime.combine(today - timedelta(days=365), time(7))
+        completion_repo.save_many([
+            TaskCompletion(
+                id=None,
+                task_id=rng.choice(tasks).id,
+                completed_at=start + timedelta(minutes=rng.randrange(365 * 24 * 60)),
+                completed_by_id=rng.choice(members).id,
+            )
+            for _ in range(spec.completions if tasks else 0)
+        ])
+
+        SQLiteNoteRepository(db).save(Note(id=None, content="Boodschappenlijst: melk, brood", updated_at=datetime.now()))
+
+    return members[0]
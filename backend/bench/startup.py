@@ -0,0 +1,229 @@
+"""Cold-start timings: what importing the app costs, and how soon a fresh process answers.
+
+    python -m bench.startup
+    python -m bench.startup --backend turso --turso-latency-ms 40 --output bench/results/startup.json
+
+Imports are timed with `python -X importtime` and summed per top-level
+package, so a dependency that starts loading eagerly shows up at once. The
+cold start runs uvicorn in a new process on a seeded database and times
+how long it takes until /health answers, then the first and second
+authenticated /api/tasks request. The server's own startup report (import,
+warm-up steps) is read back from /metrics.
+"""
+import argparse
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+
+import httpx
+
+from src.infrastructure import AuthService
+from src.infrastructure.auth import SECRET_KEY
+from .hrana_server import HranaServer
+from .load import BACKENDS
+from .seed import HouseholdSpec, create_database, seed_household
+
+APP_MODULE = "src.presentation.main"
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+SERVER_START_TIMEOUT = 30.0
+TOP_PACKAGES = 15
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)$")
+STARTUP_METRIC = re.compile(r'^aivin_startup_seconds\{phase="([^"]+)"\} (\S+)$')
+
+
+@dataclass(frozen=True)
+class ModuleImport:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int  # 0 for modules imported directly by the measured one
+
+
+def parse_importtime(output: str) -> list[ModuleImport]:
+    """The modules listed in `-X importtime` output, in the order it lists them."""
+    imports = []
+    for line in output.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            imports.append(ModuleImport(name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return imports
+
+
+def by_package(imports: list[ModuleImport]) -> dict[str, float]:
+    """Milliseconds spent importing each top-level package, slowest first.
+
+    Sums the modules' own (self) times, so a package isn't charged for the
+    other packages it imports.
+    """
+    totals: dict[str, float] = defaultdict(float)
+    for module in imports:
+        totals[module.name.split(".")[0]] += module.self_us / 1000
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def _child_env(**extra: str) -> dict[str, str]:
+    env = {
+        name: value
+        for name, value in os.environ.items()
+        if name not in ("PYTEST_CURRENT_TEST", "METRICS_TOKEN", "TURSO_DATABASE_URL", "TURSO_AUTH_TOKEN")
+    }
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, (str(BACKEND_DIR), env.get("PYTHONPATH"))))
+    env.update(extra)
+    return env
+
+
+def measure_imports(module: str = APP_MODULE) -> dict:
+    """Import `module` in a fresh interpreter; its total and per-package import times."""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=_child_env(),
+        cwd=BACKEND_DIR,
+        check=True,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    imports = parse_importtime(result.stderr)
+    return {
+        "interpreter_ms": round(wall_ms, 1),
+        "import_ms": round(sum(m.cumulative_us for m in imports if m.depth == 0) / 1000, 1),
+        "packages": {name: round(ms, 1) for name, ms in by_package(imports).items()},
+        "loaded": sorted({m.name.split(".")[0] for m in imports}),
+    }
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _timed_get(client: httpx.Client, url: str, **kwargs) -> float:
+    started = time.perf_counter()
+    response = client.get(url, **kwargs)
+    response.raise_for_status()
+    return (time.perf_counter() - started) * 1000
+
+
+def measure_cold_start(
+    backend: str = "sqlite",
+    spec: HouseholdSpec | None = None,
+    turso_latency_ms: float = 0.0,
+) -> dict:
+    """Start the app in a new uvicorn process and time its first requests, in milliseconds."""
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend {backend!r}; expected one of {BACKENDS}")
+    spec = spec or HouseholdSpec(tasks=200, completions=2000)
+
+    with ExitStack() as stack:
+        workdir = stack.enter_context(tempfile.TemporaryDirectory(prefix="aivin-startup-"))
+        db_path = os.path.join(workdir, "aivin.db")
+        member = seed_household(create_database(db_path), spec)
+        headers = {"Authorization": f"Bearer {AuthService().create_access_token(member.id)}"}
+
+        env = _child_env(JWT_SECRET_KEY=SECRET_KEY)
+        if backend == "turso":
+            server = stack.enter_context(HranaServer(db_path, latency=turso_latency_ms / 1000))
+            env.update(TURSO_DATABASE_URL=server.url, TURSO_AUTH_TOKEN=server.token)
+
+        port = _free_port()
+        base = f"http://127.0.0.1:{port}"
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", f"{APP_MODULE}:app", "--port", str(port), "--log-level", "warning"],
+            cwd=workdir,
+            env=env,
+        )
+        stack.callback(process.wait, SERVER_START_TIMEOUT)
+        stack.callback(process.terminate)
+        client = stack.enter_context(httpx.Client(timeout=SERVER_START_TIMEOUT))
+
+        deadline = started + SERVER_START_TIMEOUT
+        while True:
+            if process.poll() is not None or time.perf_counter() > deadline:
+                raise RuntimeError("uvicorn did not start")
+            try:
+                client.get(f"{base}/health").raise_for_status()
+                break
+            except httpx.TransportError:
+                time.sleep(0.005)
+        ready_ms = (time.perf_counter() - started) * 1000
+
+        first_ms = _timed_get(client, f"{base}/api/tasks", headers=headers)
+        warm_ms = _timed_get(client, f"{base}/api/tasks", headers=headers)
+        server_phases = {}
+        for line in client.get(f"{base}/metrics").text.splitlines():
+            match = STARTUP_METRIC.match(line)
+            if match:
+                server_phases[match.group(1)] = round(float(match.group(2)) * 1000, 1)
+
+    return {
+        "backend": backend,
+        "turso_latency_ms": turso_latency_ms if backend == "turso" else None,
+        "ready_ms": round(ready_ms, 1),
+        "first_request_ms": round(first_ms, 1),
+        "warm_request_ms": round(warm_ms, 1),
+        "server_ms": server_phases,
+    }
+
+
+def format_report(report: dict) -> str:
+    imports, cold = report["imports"], report["cold_start"]
+    lines = [
+        f"import {APP_MODULE}: {imports['import_ms']:,.1f} ms "
+        f"({imports['interpreter_ms']:,.1f} ms with interpreter start)",
+        f"{'package':<28}{'ms':>10}",
+        "-" * 38,
+    ]
+    for name, ms in list(imports["packages"].items())[:TOP_PACKAGES]:
+        lines.append(f"{name:<28}{ms:>10,.1f}")
+    lines += [
+        "",
+        f"cold start ({cold['backend']}):",
+        f"  ready (/health answers) {cold['ready_ms']:>10,.1f} ms",
+        f"  first /api/tasks        {cold['first_request_ms']:>10,.1f} ms",
+        f"  second /api/tasks       {cold['warm_request_ms']:>10,.1f} ms",
+    ]
+    for phase, ms in cold["server_ms"].items():
+        lines.append(f"  server {phase:<16} {ms:>10,.1f} ms")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench.startup", description="Time imports and a cold start.")
+    parser.add_argument("--backend", choices=BACKENDS, default="sqlite", help="turso: through the local Hrana stand-in")
+    parser.add_argument("--turso-latency-ms", type=float, default=0.0, help="added to every Turso round trip")
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--completions", type=int, default=2000)
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    args = parser.parse_args(argv)
+
+    report = {
+        "imports": measure_imports(),
+        "cold_start": measure_cold_start(
+            args.backend,
+            HouseholdSpec(tasks=args.tasks, completions=args.completions),
+            args.turso_latency_ms,
+        ),
+    }
+    print(format_report(report))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
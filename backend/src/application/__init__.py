@@ -1,13 +1,24 @@
-from .interfaces import TaskRepository, MemberRepository, CompletionRepository, NoteRepository
+from .interfaces import (
+    TaskRepository,
+    MemberRepository,
+    CompletionRepository,
+    CompletionJournal,
+    NoteRepository,
+    ChangeVersionRepository,
+    EventPublisher,
+)
+from .events import ChangeEvent, ChangeEventType
 from .task_usecases import (
     CreateTask,
     UpdateTask,
     CompleteTask,
     GetAllTasks,
+    GetTaskChanges,
     GetUrgentTasks,
     GetUpcomingTasks,
     DeactivateTask,
     TaskWithUrgency,
+    TaskChanges,
 )
 from .member_usecases import (
     CreateMember,
@@ -19,20 +30,28 @@ from .member_usecases import (
 )
 from .auth_usecases import RegisterUser, LoginUser, GetCurrentUser
 from .note_usecases import GetNote, UpdateNote
+from .dashboard_usecases import GetDashboard, Dashboard
 
 __all__ = [
     "TaskRepository",
     "MemberRepository",
     "CompletionRepository",
+    "CompletionJournal",
     "NoteRepository",
+    "ChangeVersionRepository",
+    "EventPublisher",
+    "ChangeEvent",
+    "ChangeEventType",
     "CreateTask",
     "UpdateTask",
     "CompleteTask",
     "GetAllTasks",
+    "GetTaskChanges",
     "GetUrgentTasks",
     "GetUpcomingTasks",
     "DeactivateTask",
     "TaskWithUrgency",
+    "TaskChanges",
     "CreateMember",
     "GetAllMembers",
     "DeleteMember",
@@ -44,4 +63,6 @@ __all__ = [
     "GetCurrentUser",
     "GetNote",
     "UpdateNote",
+    "GetDashboard",
+    "Dashboard",
 ]
@@ -0,0 +1,67 @@
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from src.domain import (
+    HouseholdMember,
+    Note,
+    Urgency,
+    calculate_urgency,
+    auto_advance_due_date,
+)
+from .interfaces import TaskRepository, MemberRepository, NoteRepository
+from .task_usecases import TaskWithUrgency
+
+
+@dataclass
+class Dashboard:
+    """Everything the dashboard shows, taken from one scan of the data."""
+    tasks: list[TaskWithUrgency]
+    urgent: list[TaskWithUrgency]
+    upcoming: list[TaskWithUrgency]
+    members: list[HouseholdMember]
+    note: Note | None
+
+
+class GetDashboard:
+    def __init__(
+        self,
+        task_repo: TaskRepository,
+        member_repo: MemberRepository,
+        note_repo: NoteRepository,
+    ):
+        self.task_repo = task_repo
+        self.member_repo = member_repo
+        self.note_repo = note_repo
+
+    def execute(self, upcoming_days: int = 7) -> Dashboard:
+        today = date.today()
+        end_date = today + timedelta(days=upcoming_days)
+
+        # Single pass over the active tasks: advance overdue autocomplete tasks
+        # and sort each task into the urgent/upcoming views as we go
+        tasks = []
+        urgent = []
+        upcoming = []
+        advanced = {}
+        for task in self.task_repo.get_all(active_only=True):
+            new_due = auto_advance_due_date(task, today)
+            if new_due:
+                task.next_due = new_due
+                advanced[task.id] = new_due
+
+            twu = TaskWithUrgency(task=task, calculated_urgency=calculate_urgency(task, today))
+            tasks.append(twu)
+            if twu.calculated_urgency == Urgency.HIGH:
+                urgent.append(twu)
+            if task.next_due is not None and today <= task.next_due <= end_date:
+                upcoming.append(twu)
+
+        self.task_repo.update_next_due_dates(advanced)
+
+        return Dashboard(
+            tasks=tasks,
+            urgent=urgent,
+            upcoming=upcoming,
+            members=self.member_repo.get_all(),
+            note=self.note_repo.get(),
+        )
@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+from enum import Enum
+
+from src.domain import Task, Note
+
+
+class ChangeEventType(str, Enum):
+    TASK_CREATED = "task.created"
+    TASK_UPDATED = "task.updated"
+    TASK_COMPLETED = "task.completed"
+    TASK_DEACTIVATED = "task.deactivated"
+    NOTE_UPDATED = "note.updated"
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """A write made through a use case, carrying the saved entity."""
+    type: ChangeEventType
+    task: Task | None = None
+    note: Note | None = None
@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from datetime import date
 
 from src.domain import Task, HouseholdMember, TaskCompletion, Note
+from .events import ChangeEvent
 
 
 class TaskRepository(ABC):
@@ -17,10 +18,20 @@ class TaskRepository(ABC):
     def get_by_due_date_range(self, start: date, end: date) -> list[Task]:
         pass
 
+    @abstractmethod
+    def get_changed_since(self, version: int) -> list[Task]:
+        """Get all tasks (active or not) written after the given change version."""
+        pass
+
     @abstractmethod
     def save(self, task: Task) -> Task:
         pass
 
+    @abstractmethod
+    def update_next_due_dates(self, next_due_by_id: dict[int, date | None]) -> None:
+        """Write only the due dates of the given tasks, in as few statements as possible."""
+        pass
+
     @abstractmethod
     def delete(self, task_id: int) -> bool:
         pass
@@ -69,6 +80,19 @@ class CompletionRepository(ABC):
     def save(self, completion: TaskCompletion) -> TaskCompletion:
         pass
 
+    @abstractmethod
+    def save_many(self, completions: list[TaskCompletion]) -> list[TaskCompletion]:
+        """Insert new completions with as few statements as possible."""
+        pass
+
+
+class CompletionJournal(ABC):
+    @abstractmethod
+    def record(self, completion: TaskCompletion, task: Task) -> TaskCompletion:
+        """Queue a completion, and the task's resulting last_completed, next_due
+        and is_active, to be written later. Must not wait for the database."""
+        pass
+
 
 class NoteRepository(ABC):
     @abstractmethod
@@ -80,3 +104,17 @@ class NoteRepository(ABC):
     def save(self, note: Note) -> Note:
         """Save the shared household note."""
         pass
+
+
+class ChangeVersionRepository(ABC):
+    @abstractmethod
+    def get_version(self) -> int:
+        """Get the household-wide change version, bumped on every write."""
+        pass
+
+
+class EventPublisher(ABC):
+    @abstractmethod
+    def publish(self, event: ChangeEvent) -> None:
+        """Publish a change to live subscribers. Must not block."""
+        pass
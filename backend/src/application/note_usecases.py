@@ -1,7 +1,8 @@
 from datetime import datetime
 
 from src.domain import Note
-from .interfaces import NoteRepository
+from .interfaces import NoteRepository, EventPublisher
+from .events import ChangeEvent, ChangeEventType
 
 
 class GetNote:
@@ -13,8 +14,9 @@ class GetNote:
 
 
 class UpdateNote:
-    def __init__(self, note_repo: NoteRepository):
+    def __init__(self, note_repo: NoteRepository, publisher: EventPublisher | None = None):
         self.note_repo = note_repo
+        self.publisher = publisher
 
     def execute(self, content: str) -> Note:
         note = self.note_repo.get()
@@ -23,4 +25,7 @@ class UpdateNote:
         else:
             note.content = content
             note.updated_at = datetime.now()
-        return self.note_repo.save(note)
+        saved_note = self.note_repo.save(note)
+        if self.publisher is not None:
+            self.publisher.publish(ChangeEvent(type=ChangeEventType.NOTE_UPDATED, note=saved_note))
+        return saved_note
@@ -10,7 +10,14 @@ from src.domain import (
     calculate_urgency,
     calculate_next_due,
 )
-from .interfaces import TaskRepository, CompletionRepository
+from .interfaces import (
+    TaskRepository,
+    CompletionRepository,
+    CompletionJournal,
+    ChangeVersionRepository,
+    EventPublisher,
+)
+from .events import ChangeEvent, ChangeEventType
 
 
 @dataclass
@@ -19,9 +26,17 @@ class TaskWithUrgency:
     calculated_urgency: Urgency
 
 
+@dataclass
+class TaskChanges:
+    version: int
+    tasks: list[TaskWithUrgency]
+    deleted_ids: list[int]
+
+
 class CreateTask:
-    def __init__(self, task_repo: TaskRepository):
+    def __init__(self, task_repo: TaskRepository, publisher: EventPublisher | None = None):
         self.task_repo = task_repo
+        self.publisher = publisher
 
     def execute(
         self,
@@ -43,12 +58,16 @@ class CreateTask:
             autocomplete=autocomplete,
             description=description,
         )
-        return self.task_repo.save(task)
+        saved_task = self.task_repo.save(task)
+        if self.publisher is not None:
+            self.publisher.publish(ChangeEvent(type=ChangeEventType.TASK_CREATED, task=saved_task))
+        return saved_task
 
 
 class UpdateTask:
-    def __init__(self, task_repo: TaskRepository):
+    def __init__(self, task_repo: TaskRepository, publisher: EventPublisher | None = None):
         self.task_repo = task_repo
+        self.publisher = publisher
 
     def execute(
         self,
@@ -83,17 +102,33 @@ class UpdateTask:
         if description is not ...:
             task.description = description
 
-        return self.task_repo.save(task)
+        saved_task = self.task_repo.save(task)
+        if self.publisher is not None:
+            event_type = ChangeEventType.TASK_UPDATED if saved_task.is_active else ChangeEventType.TASK_DEACTIVATED
+            self.publisher.publish(ChangeEvent(type=event_type, task=saved_task))
+        return saved_task
 
 
 class CompleteTask:
+    """Record a completion and move the task to its next due date.
+
+    With a journal, both writes are queued there instead of made directly
+    (write-behind), so completing doesn't wait for the database. `task_repo`
+    should then apply the journal's unwritten completions to its reads, or
+    a second completion starts from the task as it was before the first.
+    """
+
     def __init__(
         self,
         task_repo: TaskRepository,
         completion_repo: CompletionRepository,
+        publisher: EventPublisher | None = None,
+        journal: CompletionJournal | None = None,
     ):
         self.task_repo = task_repo
         self.completion_repo = completion_repo
+        self.publisher = publisher
+        self.journal = journal
 
     def execute(self, task_id: int, member_id: int | None = None) -> tuple[Task, TaskCompletion] | None:
         task = self.task_repo.get_by_id(task_id)
@@ -109,7 +144,6 @@ class CompleteTask:
             completed_at=completed_at,
             completed_by_id=member_id,
         )
-        saved_completion = self.completion_repo.save(completion)
 
         # Update task with completion info and next due date
         task.last_completed = completed_at
@@ -119,7 +153,15 @@ class CompleteTask:
         if task.recurrence.type == RecurrenceType.EENMALIG:
             task.is_active = False
 
-        saved_task = self.task_repo.save(task)
+        if self.journal is not None:
+            saved_completion = self.journal.record(completion, task)
+            saved_task = task
+        else:
+            saved_completion = self.completion_repo.save(completion)
+            saved_task = self.task_repo.save(task)
+
+        if self.publisher is not None:
+            self.publisher.publish(ChangeEvent(type=ChangeEventType.TASK_COMPLETED, task=saved_task))
 
         return saved_task, saved_completion
 
@@ -137,6 +179,31 @@ class GetAllTasks:
         ]
 
 
+class GetTaskChanges:
+    """Tasks written since a change version, for clients that sync incrementally.
+
+    Urgency and auto-advanced due dates depend on the date rather than on writes,
+    so clients should do a full refresh when the date changes.
+    """
+
+    def __init__(self, task_repo: TaskRepository, version_repo: ChangeVersionRepository):
+        self.task_repo = task_repo
+        self.version_repo = version_repo
+
+    def execute(self, since: int, active_only: bool = True) -> TaskChanges:
+        # Read the version before the rows so no write can fall between the two
+        version = self.version_repo.get_version()
+        today = date.today()
+        tasks = []
+        deleted_ids = []
+        for task in self.task_repo.get_changed_since(since):
+            if active_only and not task.is_active:
+                deleted_ids.append(task.id)
+            else:
+                tasks.append(TaskWithUrgency(task=task, calculated_urgency=calculate_urgency(task, today)))
+        return TaskChanges(version=version, tasks=tasks, deleted_ids=deleted_ids)
+
+
 class GetUrgentTasks:
     def __init__(self, task_repo: TaskRepository):
         self.task_repo = task_repo
@@ -167,8 +234,9 @@ class GetUpcomingTasks:
 
 
 class DeactivateTask:
-    def __init__(self, task_repo: TaskRepository):
+    def __init__(self, task_repo: TaskRepository, publisher: EventPublisher | None = None):
         self.task_repo = task_repo
+        self.publisher = publisher
 
     def execute(self, task_id: int) -> bool:
         task = self.task_repo.get_by_id(task_id)
@@ -176,5 +244,7 @@ class DeactivateTask:
             return False
 
         task.is_active = False
-        self.task_repo.save(task)
+        saved_task = self.task_repo.save(task)
+        if self.publisher is not None:
+            self.publisher.publish(ChangeEvent(type=ChangeEventType.TASK_DEACTIVATED, task=saved_task))
         return True
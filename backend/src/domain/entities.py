@@ -4,7 +4,7 @@ from datetime import datetime, date
 from .value_objects import RecurrencePattern, Urgency
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     id: int | None
     name: str
@@ -18,7 +18,7 @@ class Task:
     description: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class HouseholdMember:
     id: int | None
     name: str
@@ -26,7 +26,7 @@ class HouseholdMember:
     password_hash: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskCompletion:
     id: int | None
     task_id: int
@@ -34,7 +34,7 @@ class TaskCompletion:
     completed_by_id: int | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Note:
     id: int | None
     content: str
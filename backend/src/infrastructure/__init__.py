@@ -4,9 +4,20 @@ from .repositories import (
     SQLiteMemberRepository,
     SQLiteCompletionRepository,
     SQLiteNoteRepository,
+    SQLiteChangeVersionRepository,
 )
 from .auth import AuthService
 from .startup import create_default_admin_if_needed
+from .events import EventHub, get_event_hub
+from .change_log import ChangeLogEntry, ChangeLogTailer, get_change_log_tailer
+from .query_stats import QueryStats, RequestQueries, get_query_stats, track_queries, current_request_queries
+from .resilience import CircuitOpenError
+from .completion_journal import (
+    JournaledTaskRepository,
+    SQLiteCompletionJournal,
+    get_completion_journal,
+    task_repository,
+)
 
 __all__ = [
     "Database",
@@ -16,6 +27,22 @@ __all__ = [
     "SQLiteMemberRepository",
     "SQLiteCompletionRepository",
     "SQLiteNoteRepository",
+    "SQLiteChangeVersionRepository",
     "AuthService",
     "create_default_admin_if_needed",
+    "EventHub",
+    "get_event_hub",
+    "ChangeLogEntry",
+    "ChangeLogTailer",
+    "get_change_log_tailer",
+    "QueryStats",
+    "RequestQueries",
+    "get_query_stats",
+    "track_queries",
+    "current_request_queries",
+    "CircuitOpenError",
+    "JournaledTaskRepository",
+    "SQLiteCompletionJournal",
+    "get_completion_journal",
+    "task_repository",
 ]
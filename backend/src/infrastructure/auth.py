@@ -1,32 +1,60 @@
 import os
 from datetime import datetime, timedelta, timezone
-
-from passlib.context import CryptContext
-from jose import jwt, JWTError
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from functools import lru_cache
 
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "dev-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 180  # 6 months
+# Tokens for the event stream travel in a URL, so they expire within a minute
+EVENTS_TOKEN_EXPIRE_SECONDS = 60
+EVENTS_TOKEN_SCOPE = "events"
+
+
+# passlib and jose are imported on first use: together they add ~50 ms to a
+# cold start, passlib is only needed to log in, and the startup warm-up loads jose
+@lru_cache(maxsize=1)
+def password_context():
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+@lru_cache(maxsize=1)
+def jwt_module():
+    from jose import jwt
+
+    return jwt
 
 
 class AuthService:
     def hash_password(self, password: str) -> str:
-        return pwd_context.hash(password)
+        return password_context().hash(password)
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+        return password_context().verify(plain_password, hashed_password)
 
     def create_access_token(self, user_id: int) -> str:
         expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         to_encode = {"sub": str(user_id), "exp": expire}
-        return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+        return jwt_module().encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+    def create_events_token(self, user_id: int) -> str:
+        """A short-lived token that only opens the event stream."""
+        expire = datetime.now(timezone.utc) + timedelta(seconds=EVENTS_TOKEN_EXPIRE_SECONDS)
+        to_encode = {"sub": str(user_id), "exp": expire, "scope": EVENTS_TOKEN_SCOPE}
+        return jwt_module().encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+    def decode_token(self, token: str, scope: str | None = None) -> int | None:
+        """The user id in `token`, or None if it is invalid, expired or not for `scope`.
 
-    def decode_token(self, token: str) -> int | None:
+        Access tokens have no scope; scoped tokens are refused where one is expected.
+        """
+        jwt = jwt_module()
         try:
             payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            if payload.get("scope") != scope:
+                return None
             user_id = payload.get("sub")
             return int(user_id) if user_id else None
-        except JWTError:
+        except jwt.JWTError:
             return None
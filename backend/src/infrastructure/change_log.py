@@ -0,0 +1,155 @@
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from .database import Database, get_database
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL_SECONDS = float(os.getenv("CHANGE_LOG_POLL_SECONDS", "1.0"))
+BATCH_SIZE = 500
+# Tailers poll every few seconds, so entries older than this have been seen by all of them
+RETENTION = "-1 hour"
+PRUNE_INTERVAL_SECONDS = 600.0
+
+
+@dataclass(frozen=True)
+class ChangeLogEntry:
+    id: int
+    table_name: str
+    row_id: int
+    operation: str  # insert, update or delete
+
+
+ChangeCallback = Callable[[list[ChangeLogEntry]], None]
+
+
+class ChangeLogTailer:
+    """Follows the change_log table and tells this worker about every write.
+
+    Writes from any worker (or any process sharing the database) land in
+    change_log through triggers, in the same transaction as the write. Each
+    worker runs one tailer that polls for entries after the last one it saw and
+    passes them to the registered callbacks, typically to invalidate caches.
+    On local SQLite a `PRAGMA data_version` check skips the query entirely when
+    nothing was committed since the previous poll.
+
+    The background thread also prunes entries older than RETENTION, every
+    PRUNE_INTERVAL_SECONDS. It starts with `start()` or the first subscriber,
+    and only polls while there are subscribers.
+    """
+
+    def __init__(self, db: Database, interval: float = POLL_INTERVAL_SECONDS):
+        self.db = db
+        self.interval = interval
+        self.last_seen_id: int | None = None
+        self._data_version: int | None = None
+        self._callbacks: list[ChangeCallback] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="change-log-tailer", daemon=True)
+                self._thread.start()
+
+    def subscribe(self, callback: ChangeCallback) -> None:
+        with self._lock:
+            self._callbacks.append(callback)
+        self.start()
+
+    def unsubscribe(self, callback: ChangeCallback) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def stop(self) -> None:
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            self._stop.set()
+            thread.join(timeout=5)
+
+    def _run(self) -> None:
+        with self.db.get_connection() as conn:
+            pruned_at = None
+            while True:
+                try:
+                    if pruned_at is None or time.monotonic() - pruned_at >= PRUNE_INTERVAL_SECONDS:
+                        pruned_at = time.monotonic()
+                        self.prune(conn)
+                    with self._lock:
+                        subscribed = bool(self._callbacks)
+                    if subscribed:
+                        self.poll(conn)
+                except Exception:
+                    logger.exception("Polling change_log failed")
+                if self._stop.wait(self.interval):
+                    return
+
+    def poll(self, conn) -> list[ChangeLogEntry]:
+        """Dispatch and return the entries written since the previous poll."""
+        if self.last_seen_id is None:
+            # Start from the current end of the log; earlier changes are already visible
+            row = conn.execute("SELECT COALESCE(MAX(id), 0) AS max_id FROM change_log").fetchone()
+            self.last_seen_id = row["max_id"]
+
+        if not self.db.use_turso:
+            data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version == self._data_version:
+                return []
+            self._data_version = data_version
+
+        rows = conn.execute(
+            """SELECT id, table_name, row_id, operation FROM change_log
+               WHERE id > ? ORDER BY id LIMIT ?""",
+            (self.last_seen_id, BATCH_SIZE),
+        ).fetchall()
+        if len(rows) == BATCH_SIZE:
+            # More entries are waiting; don't let the data_version check skip them
+            self._data_version = None
+        if not rows:
+            return []
+
+        entries = [
+            ChangeLogEntry(
+                id=row["id"],
+                table_name=row["table_name"],
+                row_id=row["row_id"],
+                operation=row["operation"],
+            )
+            for row in rows
+        ]
+        self.last_seen_id = entries[-1].id
+        self._dispatch(entries)
+        return entries
+
+    def prune(self, conn) -> None:
+        conn.execute(f"DELETE FROM change_log WHERE changed_at < datetime('now', '{RETENTION}')")
+        conn.commit()
+
+    def _dispatch(self, entries: list[ChangeLogEntry]) -> None:
+        with self._lock:
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            try:
+                callback(entries)
+            except Exception:
+                logger.exception("Change log callback %r failed", callback)
+
+
+_tailer_instance: ChangeLogTailer | None = None
+
+
+def get_change_log_tailer() -> ChangeLogTailer:
+    global _tailer_instance
+    if _tailer_instance is None:
+        _tailer_instance = ChangeLogTailer(get_database())
+    return _tailer_instance
@@ -0,0 +1,384 @@
+"""Write-behind journal for task completions.
+
+In Turso mode, completing a task costs two HTTPS round trips. With
+COMPLETION_JOURNAL_PATH set, CompleteTask instead appends the completion,
+with the task's new state, to a journal in a local SQLite file and returns
+at once. A background flusher ships the journal to the database in batches,
+oldest first. A batch that fails with a transient error is retried a few
+times with backoff; then the flusher pauses, for longer after each round
+that fails, and `failures` counts those rounds. Entries stay in the file
+until they are written, so a crash or restart only delays them; the flusher
+picks them up again on the next start.
+
+Replays are idempotent: completions already stored (same task and time) are
+skipped, and a task is only moved to a completion's state if it has no later
+completion. Workers may share one journal file; each claims a batch for
+CLAIM_LEASE_SECONDS before shipping it.
+
+Until its entry is flushed, a completion lives only in the journal.
+JournaledTaskRepository applies pending entries to task reads, so the task
+reads back completed at once, in every worker sharing the file; the flush
+then outdates cached reads like any other write. Completion history and
+delta sync see the completion once it is flushed. The flusher is woken by
+every new entry, so that is about one round trip later.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, replace
+from datetime import date, datetime
+
+from src.application import CompletionJournal
+from src.domain import Task, TaskCompletion
+from .database import Database, get_database
+from .repositories import SQLiteCompletionRepository, SQLiteTaskRepository
+from .resilience import CircuitOpenError, backoff_delay, is_transient
+
+logger = logging.getLogger(__name__)
+
+COMPLETION_JOURNAL_PATH = os.getenv("COMPLETION_JOURNAL_PATH", "")
+FLUSH_BATCH_SIZE = 100
+FLUSH_INTERVAL_SECONDS = 1.0  # also picks up entries left by other workers
+FLUSH_ATTEMPTS = 3  # per batch and round
+FLUSH_PAUSE_CAP_SECONDS = 60.0  # longest pause between failed rounds
+CLAIM_LEASE_SECONDS = 60.0  # a claimed batch not written by then is up for grabs again
+DRAIN_TIMEOUT_SECONDS = float(os.getenv("COMPLETION_JOURNAL_DRAIN_SECONDS", "10"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS journal (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id INTEGER NOT NULL,
+    completed_at TEXT NOT NULL,
+    completed_by_id INTEGER,
+    next_due TEXT,
+    is_active INTEGER NOT NULL,
+    claimed_at REAL,
+    error TEXT
+)
+"""
+
+
+@dataclass(frozen=True)
+class JournalEntry:
+    id: int
+    task_id: int
+    completed_at: datetime
+    completed_by_id: int | None
+    next_due: date | None
+    is_active: bool
+
+
+def _entry_from_row(row: sqlite3.Row) -> JournalEntry:
+    return JournalEntry(
+        id=row["id"],
+        task_id=row["task_id"],
+        completed_at=datetime.fromisoformat(row["completed_at"]),
+        completed_by_id=row["completed_by_id"],
+        next_due=date.fromisoformat(row["next_due"]) if row["next_due"] else None,
+        is_active=bool(row["is_active"]),
+    )
+
+
+class SQLiteCompletionJournal(CompletionJournal):
+    """Completions queued in a local SQLite file, written to `db` by a flusher thread.
+
+    The flusher starts with the first recorded entry, or with `start()`.
+    Entries that fail with a non-transient error are kept in the file with
+    their error and skipped. `failures` is the number of flush rounds in a
+    row that failed with transient errors.
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        path: str,
+        batch_size: int = FLUSH_BATCH_SIZE,
+        interval: float = FLUSH_INTERVAL_SECONDS,
+    ):
+        self.db = db
+        self.path = path
+        self.batch_size = batch_size
+        self.interval = interval
+        self.task_repo = SQLiteTaskRepository(db)
+        self.completion_repo = SQLiteCompletionRepository(db)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._deadline: float | None = None
+        self.failures = 0
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute(SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def record(self, completion: TaskCompletion, task: Task) -> TaskCompletion:
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    """INSERT INTO journal (task_id, completed_at, completed_by_id, next_due, is_active)
+                       VALUES (?, ?, ?, ?, ?)""",
+                    (
+                        completion.task_id,
+                        completion.completed_at.isoformat(),
+                        completion.completed_by_id,
+                        task.next_due.isoformat() if task.next_due else None,
+                        1 if task.is_active else 0,
+                    ),
+                )
+        finally:
+            conn.close()
+        self.start()
+        self._wake.set()
+        return completion
+
+    def pending(self) -> int:
+        """Entries not written yet, failed ones excluded."""
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM journal WHERE error IS NULL").fetchone()[0]
+        finally:
+            conn.close()
+
+    def pending_completions(self) -> dict[int, JournalEntry]:
+        """The latest unwritten completion of each task with one, by task id."""
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT * FROM journal WHERE error IS NULL ORDER BY id").fetchall()
+        finally:
+            conn.close()
+        latest: dict[int, JournalEntry] = {}
+        for entry in map(_entry_from_row, rows):
+            known = latest.get(entry.task_id)
+            if known is None or known.completed_at <= entry.completed_at:
+                latest[entry.task_id] = entry
+        return latest
+
+    def failed(self) -> list[tuple[int, str]]:
+        """(entry id, error) of the entries that could not be written."""
+        conn = self._connect()
+        try:
+            return [tuple(row) for row in conn.execute("SELECT id, error FROM journal WHERE error IS NOT NULL ORDER BY id")]
+        finally:
+            conn.close()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._deadline = None
+                self._thread = threading.Thread(target=self._run, name="completion-journal", daemon=True)
+                self._thread.start()
+
+    def drain(self, timeout: float = DRAIN_TIMEOUT_SECONDS) -> int:
+        """Write what can be written within `timeout`, then stop the flusher. Returns the entries left."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            self._deadline = time.monotonic() + timeout
+            self._stop.set()
+            self._wake.set()
+            thread.join(timeout + 1)
+        left = self.pending()
+        if left:
+            logger.warning("%d journaled completions not written yet; they are sent on the next start", left)
+        return left
+
+    def _run(self) -> None:
+        while True:
+            if self.failures:
+                pause = min(FLUSH_PAUSE_CAP_SECONDS, self.interval * 2 ** (self.failures - 1))
+                if self._stop.is_set():
+                    time.sleep(max(0.0, min(pause, self._deadline - time.monotonic())))
+                else:
+                    # New entries don't cut the pause short; drain does
+                    self._stop.wait(pause)
+            else:
+                self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                while self._flush_batch():
+                    pass
+            except Exception:
+                logger.exception("Flushing the completion journal failed")
+            if self._stop.is_set() and (not self.failures or self._past_deadline()):
+                return
+
+    def _past_deadline(self) -> bool:
+        return self._deadline is not None and time.monotonic() > self._deadline
+
+    def _flush_batch(self) -> bool:
+        """Claim, write and remove the oldest batch. False when there was none, it failed or time is up."""
+        entries = self._claim()
+        if not entries:
+            return False
+        ship = self._ship
+        attempt = 0
+        while True:
+            if self._past_deadline():
+                self._release(entries)
+                return False
+            try:
+                ship(entries)
+                break
+            except Exception as e:
+                if not is_transient(e):
+                    if ship == self._ship_one_by_one:
+                        raise
+                    ship = self._ship_one_by_one
+                    continue
+                attempt += 1
+                if attempt == FLUSH_ATTEMPTS or isinstance(e, CircuitOpenError):
+                    self.failures += 1
+                    logger.warning("Writing %d journaled completions failed, pausing: %s", len(entries), e)
+                    self._release(entries)
+                    return False
+                logger.info("Writing %d journaled completions failed, retrying: %s", len(entries), e)
+                time.sleep(backoff_delay(attempt - 1))
+                self._claim_again(entries)
+        self.failures = 0
+        self._remove(entries)
+        return True
+
+    def _ship(self, entries: list[JournalEntry]) -> None:
+        completed: dict[int, tuple[datetime, date | None, bool]] = {}
+        for entry in entries:  # oldest first, so each task ends at its latest completion
+            completed[entry.task_id] = (entry.completed_at, entry.next_due, entry.is_active)
+        with self.db.snapshot():
+            self.completion_repo.save_missing([
+                TaskCompletion(
+                    id=None,
+                    task_id=entry.task_id,
+                    completed_at=entry.completed_at,
+                    completed_by_id=entry.completed_by_id,
+                )
+                for entry in entries
+            ])
+            self.task_repo.apply_completions(completed)
+
+    def _ship_one_by_one(self, entries: list[JournalEntry]) -> None:
+        # Set aside the entries the database rejects, so they don't hold up the rest
+        for entry in entries:
+            try:
+                self._ship([entry])
+            except Exception as e:
+                if is_transient(e):
+                    raise
+                logger.error("Journaled completion %d of task %d can't be written: %s", entry.id, entry.task_id, e)
+                self._mark_failed(entry, str(e))
+
+    def _claim(self) -> list[JournalEntry]:
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                rows = conn.execute(
+                    """SELECT * FROM journal
+                       WHERE error IS NULL AND (claimed_at IS NULL OR claimed_at < ?)
+                       ORDER BY id LIMIT ?""",
+                    (time.time() - CLAIM_LEASE_SECONDS, self.batch_size),
+                ).fetchall()
+                conn.executemany("UPDATE journal SET claimed_at = ? WHERE id = ?", [(time.time(), row["id"]) for row in rows])
+        finally:
+            conn.close()
+        return [_entry_from_row(row) for row in rows]
+
+    def _update(self, sql: str, params: list[tuple]) -> None:
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(sql, params)
+        finally:
+            conn.close()
+
+    def _claim_again(self, entries: list[JournalEntry]) -> None:
+        self._update("UPDATE journal SET claimed_at = ? WHERE id = ?", [(time.time(), entry.id) for entry in entries])
+
+    def _release(self, entries: list[JournalEntry]) -> None:
+        self._update("UPDATE journal SET claimed_at = NULL WHERE id = ?", [(entry.id,) for entry in entries])
+
+    def _remove(self, entries: list[JournalEntry]) -> None:
+        self._update("DELETE FROM journal WHERE id = ? AND error IS NULL", [(entry.id,) for entry in entries])
+
+    def _mark_failed(self, entry: JournalEntry, error: str) -> None:
+        self._update("UPDATE journal SET error = ? WHERE id = ?", [(error, entry.id)])
+
+
+def _due_order(task: Task) -> tuple:
+    # ORDER BY next_due ASC NULLS LAST
+    return (task.next_due is None, task.next_due or date.min)
+
+
+class JournaledTaskRepository(SQLiteTaskRepository):
+    """Task reads with the journal's unwritten completions applied.
+
+    `get_by_id` goes through the stale read cache like the list reads, so
+    with Turso slow or down, completing a task can still look it up.
+    """
+
+    def __init__(self, db: Database, journal: SQLiteCompletionJournal, columns: Iterable[str] | None = None):
+        super().__init__(db, columns=columns)
+        self.journal = journal
+
+    def get_all(self, active_only: bool = True) -> list[Task]:
+        return self._with_pending(super().get_all(active_only), active_only)
+
+    def get_by_id(self, task_id: int) -> Task | None:
+        load = super().get_by_id
+        task = self.db.cached_read(("tasks", self._select, task_id), ("tasks",), lambda: load(task_id))
+        if task is None:
+            return None
+        [task] = self._with_pending([task], active_only=False)
+        return task
+
+    def get_by_due_date_range(self, start: date, end: date) -> list[Task]:
+        tasks = self._with_pending(super().get_by_due_date_range(start, end), active_only=True)
+        return [task for task in tasks if task.next_due is not None and start <= task.next_due <= end]
+
+    def _with_pending(self, tasks: list[Task], active_only: bool) -> list[Task]:
+        pending = self.journal.pending_completions()
+        if not pending:
+            return tasks
+        result = []
+        for task in tasks:
+            entry = pending.get(task.id)
+            # Same rule as apply_completions: never move a task back
+            if entry is not None and (task.last_completed is None or task.last_completed <= entry.completed_at):
+                task = replace(
+                    task, last_completed=entry.completed_at, next_due=entry.next_due, is_active=entry.is_active
+                )
+            if task.is_active or not active_only:
+                result.append(task)
+        result.sort(key=_due_order)
+        return result
+
+
+_journal_instance: SQLiteCompletionJournal | None = None
+
+
+def get_completion_journal() -> SQLiteCompletionJournal | None:
+    """The journal at COMPLETION_JOURNAL_PATH, or None when write-behind is off."""
+    global _journal_instance
+    if _journal_instance is None and COMPLETION_JOURNAL_PATH:
+        _journal_instance = SQLiteCompletionJournal(get_database(), COMPLETION_JOURNAL_PATH)
+    return _journal_instance
+
+
+def task_repository(db: Database, columns: Iterable[str] | None = None) -> SQLiteTaskRepository:
+    """The task repository for request handlers; journaled when write-behind is on."""
+    journal = get_completion_journal()
+    if journal is None:
+        return SQLiteTaskRepository(db, columns=columns)
+    return JournaledTaskRepository(db, journal, columns=columns)
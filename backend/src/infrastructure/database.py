@@ -1,14 +1,39 @@
+import base64
+import http.client
+import json
 import logging
+import math
 import os
+import socket
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
 from contextlib import contextmanager
-from urllib.request import urlopen, Request
-import json
-
-from dotenv import load_dotenv
+from contextvars import ContextVar
+from datetime import date, datetime
+from functools import lru_cache
+from urllib.error import HTTPError
+from urllib.parse import urlsplit
+
+from .query_stats import get_query_stats
+from .read_cache import StaleReadCache
+from .resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    LatencyWindow,
+    backoff_delay,
+    breaker_for,
+    is_read_statement,
+    is_transient,
+    on_event_loop,
+)
 
 # Only load .env if not in test environment
 if not os.getenv("PYTEST_CURRENT_TEST"):
+    from dotenv import load_dotenv
+
     load_dotenv()
 
 logger = logging.getLogger(__name__)
@@ -17,6 +42,99 @@ logger = logging.getLogger(__name__)
 TURSO_URL = os.getenv("TURSO_DATABASE_URL")
 TURSO_TOKEN = os.getenv("TURSO_AUTH_TOKEN")
 
+# Statements at least this long are stored on the Turso stream and sent by id
+STORE_SQL_MIN_LENGTH = 120
+STORED_SQL_CACHE_SIZE = 64
+# Turso drops idle streams after about ten seconds; start a new one well before
+STREAM_IDLE_SECONDS = 5.0
+# Servers close idle keep-alive connections; writes reconnect after this long
+# rather than risk a reset they can't safely retry
+HTTP_IDLE_SECONDS = 5.0
+# Idle Turso connections kept open (with their streams) for reuse
+TURSO_POOL_SIZE = int(os.getenv("TURSO_POOL_SIZE", "4"))
+# Seconds to establish a connection, and to wait for each response
+TURSO_CONNECT_TIMEOUT = float(os.getenv("TURSO_CONNECT_TIMEOUT", "5"))
+TURSO_READ_TIMEOUT = float(os.getenv("TURSO_READ_TIMEOUT", "30"))
+# Extra attempts for a read that failed on the network or with a retryable status
+TURSO_READ_RETRIES = int(os.getenv("TURSO_READ_RETRIES", "2"))
+# Send a duplicate of a read still unanswered after the p95 read latency
+TURSO_HEDGE_READS = os.getenv("TURSO_HEDGE_READS", "0") == "1"
+HEDGE_MIN_DELAY = float(os.getenv("TURSO_HEDGE_MIN_MS", "50")) / 1000
+# Consecutive transient failures that open the circuit breaker, and for how long
+TURSO_BREAKER_FAILURES = int(os.getenv("TURSO_BREAKER_FAILURES", "5"))
+TURSO_BREAKER_RESET_SECONDS = float(os.getenv("TURSO_BREAKER_RESET_SECONDS", "10"))
+# Serve the last good result of a hot read that takes longer than this; 0 disables
+TURSO_READ_BUDGET = float(os.getenv("TURSO_READ_BUDGET_MS", "1000")) / 1000
+
+# Round-trip times of recent reads, for the hedging delay
+_read_latencies = LatencyWindow()
+
+
+def _encode_blob(value: bytes) -> dict:
+    return {"type": "blob", "base64": base64.b64encode(value).decode("ascii").rstrip("=")}
+
+
+def _encode_float(value: float) -> dict:
+    # JSON has no NaN or infinity; json.dumps would write invalid tokens
+    if not math.isfinite(value):
+        raise ValueError(f"Turso parameters must be finite floats, got {value}")
+    return {"type": "float", "value": value}
+
+
+# Python type -> Hrana value. bool is checked by exact type before int, and
+# dates are stored as ISO text, the same strings the repositories write.
+ARG_ENCODERS = {
+    type(None): lambda value: {"type": "null"},
+    bool: lambda value: {"type": "integer", "value": "1" if value else "0"},
+    int: lambda value: {"type": "integer", "value": str(value)},
+    float: _encode_float,
+    str: lambda value: {"type": "text", "value": value},
+    bytes: _encode_blob,
+    bytearray: _encode_blob,
+    memoryview: lambda value: _encode_blob(value.tobytes()),
+    datetime: lambda value: {"type": "text", "value": value.isoformat()},
+    date: lambda value: {"type": "text", "value": value.isoformat()},
+}
+
+
+def _encoder_for(arg_type: type):
+    # Subclasses (IntEnum, str enums, ...) use the encoder of their nearest base
+    for base in arg_type.__mro__:
+        if base in ARG_ENCODERS:
+            return ARG_ENCODERS[base]
+    raise TypeError(f"Unsupported Turso parameter type: {arg_type.__name__}")
+
+
+@lru_cache(maxsize=512)
+def encoders_for(signature: tuple[type, ...]) -> tuple:
+    return tuple(_encoder_for(arg_type) for arg_type in signature)
+
+
+def encode_args(params) -> list[dict]:
+    """Encode statement parameters as typed Hrana values.
+
+    The encoders are resolved once per signature (the tuple of parameter
+    types), so repeated statements only pay for the conversions themselves.
+    """
+    encoders = encoders_for(tuple(map(type, params)))
+    return [encode(value) for encode, value in zip(encoders, params)]
+
+
+def decode_blob(cell: dict) -> bytes:
+    data = cell.get("base64") or ""
+    return base64.b64decode(data + "=" * (-len(data) % 4))
+
+
+class TursoError(sqlite3.DatabaseError):
+    """A statement failed on Turso.
+
+    Subclasses the sqlite3 error so callers handle both backends alike.
+    """
+
+    def __init__(self, message: str, code: str | None = None):
+        super().__init__(message)
+        self.code = code
+
 
 class TursoConnection:
     """HTTP-based connection to Turso database."""
@@ -32,76 +150,420 @@ class TursoConnection:
             url = url.split("/v2/pipeline")[0]
         self.base_url = url
         self.auth_token = auth_token
+        # Open Hrana stream: the baton is handed back by every response, and
+        # the server may direct follow-up requests to another URL
+        self._baton: str | None = None
+        self._stream_url: str | None = None
+        self._last_used = 0.0
+        # Statements registered on the stream with store_sql, least recently used first
+        self._stored_sql: OrderedDict[str, int] = OrderedDict()
+        self._next_sql_id = 1
+        self._pending_close_sql: list[int] = []
+        # Keep-alive HTTP connection, reused across requests
+        self._http: http.client.HTTPConnection | None = None
+        self._http_origin: tuple[str, str] | None = None
+        self._http_used = 0.0
+        # Set by a winning hedge that cut the primary request short
+        self._hedge_aborted = False
+        # Inside an explicit BEGIN on the stream; such reads can't be retried elsewhere
+        self._in_transaction = False
+        self.breaker: CircuitBreaker = breaker_for(url, TURSO_BREAKER_FAILURES, TURSO_BREAKER_RESET_SECONDS)
+
+    def _reset_stream(self) -> None:
+        """Forget the stream; stored statements die with it on the server."""
+        self._baton = None
+        self._stream_url = None
+        self._stored_sql.clear()
+        self._pending_close_sql.clear()
+        self._in_transaction = False
+
+    def _build_requests(self, statements: list[dict]) -> tuple[list[dict], list[int]]:
+        """Pipeline requests for the statements, and the positions of their results.
+
+        Long statements are stored on the stream on first use and then sent as
+        a sql_id. When the LRU is full the oldest statement is closed to free
+        its id on the server.
+        """
+        requests = [{"type": "close_sql", "sql_id": sql_id} for sql_id in self._pending_close_sql]
+        self._pending_close_sql.clear()
+        execute_positions = []
+        for stmt in statements:
+            sql = stmt["sql"]
+            if len(sql) >= STORE_SQL_MIN_LENGTH:
+                sql_id = self._stored_sql.get(sql)
+                if sql_id is None:
+                    if len(self._stored_sql) >= STORED_SQL_CACHE_SIZE:
+                        _, evicted_id = self._stored_sql.popitem(last=False)
+                        requests.append({"type": "close_sql", "sql_id": evicted_id})
+                    sql_id = self._next_sql_id
+                    self._next_sql_id += 1
+                    self._stored_sql[sql] = sql_id
+                    requests.append({"type": "store_sql", "sql_id": sql_id, "sql": sql})
+                else:
+                    self._stored_sql.move_to_end(sql)
+                stmt = {k: v for k, v in stmt.items() if k != "sql"}
+                stmt["sql_id"] = sql_id
+            execute_positions.append(len(requests))
+            requests.append({"type": "execute", "stmt": stmt})
+        return requests, execute_positions
+
+    def _http_connection(self, url: str) -> tuple[http.client.HTTPConnection, str, bool]:
+        """Keep-alive HTTP connection for the URL's origin, the request path, and whether it is new."""
+        parts = urlsplit(url)
+        origin = (parts.scheme, parts.netloc)
+        if self._http is not None and self._http_origin != origin:
+            self._close_http()
+        created = self._http is None
+        if created:
+            connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+            self._http = connection_class(parts.netloc, timeout=TURSO_CONNECT_TIMEOUT)
+            self._http_origin = origin
+        return self._http, parts.path or "/", created
+
+    def _close_http(self) -> None:
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+            self._http_origin = None
+
+    def _abort_http(self) -> None:
+        """Cut off a request in flight from another thread, making it fail promptly."""
+        self._hedge_aborted = True
+        http_conn = self._http
+        sock = http_conn.sock if http_conn is not None else None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _post(self, url: str, payload: dict, idempotent: bool = True) -> dict:
+        """POST one pipeline payload, timing connect, send, wait and parse.
+
+        A non-idempotent payload (one with writes) is only sent again when it
+        provably never reached the server.
+        """
+        stats = get_query_stats()
+        body = json.dumps(payload).encode()
+        headers = {
+            "Authorization": f"Bearer {self.auth_token}",
+            "Content-Type": "application/json",
+        }
+
+        if not idempotent and self._http is not None and time.monotonic() - self._http_used > HTTP_IDLE_SECONDS:
+            self._close_http()
+        for attempt in range(2):
+            conn, path, created = self._http_connection(url)
+            sending = True
+            try:
+                if conn.sock is None:
+                    started = time.perf_counter()
+                    conn.connect()
+                    conn.sock.settimeout(TURSO_READ_TIMEOUT)
+                    stats.record_phase("connect", time.perf_counter() - started)
+
+                started = time.perf_counter()
+                conn.request("POST", path, body=body, headers=headers)
+                sent = time.perf_counter()
+                sending = False
+                stats.record_phase("send", sent - started)
+
+                response = conn.getresponse()
+                data = response.read()
+                received = time.perf_counter()
+                stats.record_phase("wait", received - sent)
+            except TimeoutError:
+                # A late response would arrive on the connection out of turn
+                self._close_http()
+                raise
+            except (ConnectionError, http.client.HTTPException):
+                self._close_http()
+                # A reused keep-alive connection may have been closed by the
+                # server while idle, before it read the request; retry once.
+                # Once sent, writes may have run already, so only reads retry
+                if created or attempt or self._hedge_aborted or not (idempotent or sending):
+                    raise
+                continue
+            break
+        self._http_used = time.monotonic()
+
+        if response.status >= 400:
+            raise HTTPError(url, response.status, response.reason, response.headers, None)
+
+        result = json.loads(data)
+        stats.record_phase("parse", time.perf_counter() - received)
+        return result
 
     def _request(self, statements: list[dict]) -> list[dict]:
-        """Execute statements via Turso HTTP API."""
-        url = f"{self.base_url}/v2/pipeline"
-        payload = {"requests": [{"type": "execute", "stmt": s} for s in statements]}
-        payload["requests"].append({"type": "close"})
-
-        req = Request(
-            url,
-            data=json.dumps(payload).encode(),
-            headers={
+        """Execute statements via Turso HTTP API.
+
+        The stream stays open between calls so that statements stored on it
+        can be reused. An idle stream is assumed expired and a new one is
+        started; if the server rejects the baton anyway, the call is retried
+        once on a new stream.
+        """
+        if (
+            self._baton is not None
+            and not self._in_transaction
+            and time.monotonic() - self._last_used > STREAM_IDLE_SECONDS
+        ):
+            self._reset_stream()
+
+        had_stream = self._baton is not None
+        idempotent = all(is_read_statement(stmt["sql"]) for stmt in statements)
+        requests, execute_positions = self._build_requests(statements)
+        payload = {"baton": self._baton, "requests": requests}
+        try:
+            result = self._post(f"{self._stream_url or self.base_url}/v2/pipeline", payload, idempotent)
+        except HTTPError as e:
+            in_transaction = self._in_transaction
+            self._reset_stream()
+            # An open transaction dies with its stream; don't go on without it
+            if not had_stream or in_transaction or e.code not in (400, 404):
+                raise
+            logger.info("Turso stream expired, retrying on a new stream")
+            requests, execute_positions = self._build_requests(statements)
+            result = self._post(f"{self.base_url}/v2/pipeline", {"baton": None, "requests": requests}, idempotent)
+        except Exception:
+            # Unknown whether the server saw the stored statements; start over
+            self._reset_stream()
+            raise
+
+        self._baton = result.get("baton")
+        self._stream_url = result.get("base_url")
+        self._last_used = time.monotonic()
+        if self._baton is None:
+            self._reset_stream()
+
+        results = result.get("results", [])
+        return [results[i] for i in execute_positions if i < len(results)]
+
+    def _standalone_request(self, stmt: dict) -> list[dict]:
+        """Run one statement on its own HTTP connection and a throwaway stream."""
+        parts = urlsplit(f"{self.base_url}/v2/pipeline")
+        connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        conn = connection_class(parts.netloc, timeout=TURSO_CONNECT_TIMEOUT)
+        payload = {"baton": None, "requests": [{"type": "execute", "stmt": stmt}, {"type": "close"}]}
+        try:
+            conn.connect()
+            conn.sock.settimeout(TURSO_READ_TIMEOUT)
+            conn.request("POST", parts.path, body=json.dumps(payload).encode(), headers={
                 "Authorization": f"Bearer {self.auth_token}",
                 "Content-Type": "application/json",
-            },
-        )
-
-        with urlopen(req) as response:
-            result = json.loads(response.read())
-
-        return result.get("results", [])
+            })
+            response = conn.getresponse()
+            data = response.read()
+        finally:
+            conn.close()
+        if response.status >= 400:
+            raise HTTPError(parts.geturl(), response.status, response.reason, response.headers, None)
+        return json.loads(data).get("results", [])[:1]
+
+    def _hedged_request(self, stmt: dict) -> list[dict]:
+        """Run a read, racing a duplicate against it once it takes longer than usual.
+
+        The duplicate goes out on a separate connection after the p95 read
+        latency. If it answers first, the original request is cut off, which
+        also discards this connection's stream.
+        """
+        p95 = _read_latencies.percentile(95)
+        if p95 is None:
+            return self._request([stmt])
+
+        hedge = _Hedge(self, stmt, max(p95, HEDGE_MIN_DELAY))
+        hedge.start()
+        try:
+            results = self._request([stmt])
+        except Exception:
+            if hedge.finish():
+                return hedge.results
+            raise
+        finally:
+            hedge.finish()
+            self._hedge_aborted = False
+        return results
 
     def execute(self, sql: str, params: tuple = ()):
-        """Execute a single SQL statement."""
+        """Execute a single SQL statement.
+
+        Reads outside an explicit transaction are retried with backoff on
+        transient failures and, with TURSO_HEDGE_READS, hedged. Every call
+        goes through the circuit breaker shared by connections to this URL.
+        Called on an event loop thread, reads fail without retrying rather
+        than sleep there; callers belong in the threadpool anyway.
+        """
         stmt = {"sql": sql}
         if params:
-            stmt["args"] = [
-                {"type": "null", "value": None} if p is None
-                else {"type": "text" if isinstance(p, str) else "integer", "value": str(p)}
-                for p in params
-            ]
-
-        results = self._request([stmt])
-        return TursoCursor(results[0] if results else {})
+            stmt["args"] = encode_args(params)
+
+        read = is_read_statement(sql) and not self._in_transaction
+        attempts = 1 + TURSO_READ_RETRIES if read and not on_event_loop() else 1
+        stats = get_query_stats()
+        for attempt in range(attempts):
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError:
+                stats.record_event("circuit_open")
+                raise
+            started = time.perf_counter()
+            try:
+                results = self._hedged_request(stmt) if read and TURSO_HEDGE_READS else self._request([stmt])
+            except Exception as e:
+                if not is_transient(e):
+                    # Turso answered (with a client error) or we failed locally
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                if attempt + 1 == attempts:
+                    raise
+                stats.record_event("retry")
+                logger.info("Retrying Turso read after %s", type(e).__name__)
+                time.sleep(backoff_delay(attempt))
+                continue
+            self.breaker.record_success()
+            if read:
+                _read_latencies.observe(time.perf_counter() - started)
+            break
+
+        result = results[0] if results else {}
+        if result.get("type") == "error":
+            error = result.get("error", {})
+            raise TursoError(error.get("message", "Turso statement failed"), error.get("code"))
+        self._track_transaction(sql)
+        return TursoCursor(result)
+
+    def _track_transaction(self, sql: str) -> None:
+        words = sql.split(None, 2)
+        keyword = words[0].upper() if words else ""
+        if keyword == "BEGIN":
+            self._in_transaction = True
+        elif keyword in ("COMMIT", "END") or (keyword == "ROLLBACK" and "TO" not in sql.upper().split()):
+            self._in_transaction = False
 
     def commit(self):
-        pass
+        # Statements autocommit; only an explicit BEGIN (Database.snapshot) is left open
+        if self._in_transaction:
+            self.execute("COMMIT")
 
     def rollback(self):
-        pass
+        if self._in_transaction:
+            try:
+                self.execute("ROLLBACK")
+            except Exception:
+                # Drop the stream, and the transaction with it, rather than reuse it
+                logger.debug("Rolling back on Turso failed", exc_info=True)
+                self._reset_stream()
 
     def close(self):
-        pass
+        if self._baton is not None:
+            baton, url = self._baton, self._stream_url or self.base_url
+            self._reset_stream()
+            try:
+                self._post(f"{url}/v2/pipeline", {"baton": baton, "requests": [{"type": "close"}]})
+            except Exception:
+                # The server drops idle streams on its own
+                logger.debug("Closing Turso stream failed", exc_info=True)
+        self._close_http()
+
+
+class _Hedge:
+    """A duplicate of a read, sent after a delay unless the original answers first."""
+
+    def __init__(self, conn: TursoConnection, stmt: dict, delay: float):
+        self._conn = conn
+        self._stmt = stmt
+        self._lock = threading.Lock()
+        self._settled = False
+        self.results: list[dict] | None = None
+        self._timer = threading.Timer(delay, self._run)
+        self._timer.daemon = True
+
+    def start(self) -> None:
+        self._timer.start()
+
+    def _run(self) -> None:
+        stats = get_query_stats()
+        stats.record_event("hedge")
+        try:
+            results = self._conn._standalone_request(self._stmt)
+        except Exception:
+            logger.debug("Hedged Turso read failed", exc_info=True)
+            return
+        with self._lock:
+            if self._settled:
+                return
+            self._settled = True
+            self.results = results
+            # Under the lock, so it can't hit a later request once finish() returned
+            self._conn._abort_http()
+        stats.record_event("hedge_won")
+
+    def finish(self) -> bool:
+        """Call off the hedge; True if it had already answered."""
+        self._timer.cancel()
+        with self._lock:
+            self._settled = True
+            return self.results is not None
+
+
+# Hrana value type -> Python conversion; text (and anything unknown) stays as
+# is, blobs are base64-decoded to bytes
+CELL_CONVERTERS = {"integer": int, "float": float}
+NULL_CELL = {"type": "null"}
+
+
+def convert_column(cells: tuple) -> list:
+    """Convert one column of Hrana cells to Python values.
+
+    The value types present in the column are checked once. The common cases,
+    one type throughout with or without nulls, then convert in a single
+    comprehension; only genuinely mixed columns go cell by cell.
+    """
+    types = {cell.get("type") for cell in cells}
+    types.discard("null")
+    if not types:
+        return [None] * len(cells)
+    if len(types) == 1:
+        cell_type = types.pop()
+        if cell_type == "blob":
+            return [None if cell.get("type") == "null" else decode_blob(cell) for cell in cells]
+        convert = CELL_CONVERTERS.get(cell_type)
+        if convert is None:
+            return [cell.get("value") for cell in cells]
+        return [None if (value := cell.get("value")) is None else convert(value) for cell in cells]
+    return [TursoCursor._parse_cell(cell) for cell in cells]
 
 
 class TursoCursor:
-    """Cursor-like wrapper for Turso results."""
+    """Cursor-like wrapper for Turso results.
+
+    Cells are converted column by column the first time rows are read, and
+    rows are only built when accessed.
+    """
 
     def __init__(self, result: dict):
         self.result = result
-        self._rows = self._parse_rows()
-        self.lastrowid = result.get("response", {}).get("result", {}).get("last_insert_rowid")
+        self._rows: TursoResult | None = None
+        # Hrana sends the rowid as a string, like integer cells
+        lastrowid = result.get("response", {}).get("result", {}).get("last_insert_rowid")
+        self.lastrowid = int(lastrowid) if lastrowid is not None else None
 
-    def _parse_rows(self) -> list:
-        """Parse Turso response into row dicts."""
+    def _parse_rows(self) -> "TursoResult":
+        """Parse the Turso response into a lazily materialized row sequence."""
         response = self.result.get("response", {})
         result = response.get("result", {})
         cols = result.get("cols", [])
         rows = result.get("rows", [])
 
-        parsed = []
-        for row in rows:
-            row_dict = {}
-            for i, col in enumerate(cols):
-                col_name = col.get("name", f"col_{i}")
-                cell = row[i] if i < len(row) else None
-                row_dict[col_name] = self._parse_cell(cell)
-            parsed.append(TursoRow(row_dict))
-        return parsed
-
-    def _parse_cell(self, cell) -> any:
+        index = {col.get("name", f"col_{i}"): i for i, col in enumerate(cols)}
+        width = len(cols)
+        if any(len(row) != width for row in rows):
+            rows = [tuple(row[:width]) + (NULL_CELL,) * (width - len(row)) for row in rows]
+        columns = [convert_column(cells) for cells in zip(*rows)] if rows else []
+        return TursoResult(columns, index, len(rows))
+
+    @staticmethod
+    def _parse_cell(cell) -> any:
         """Parse a Turso cell value, converting to appropriate Python type."""
         if not isinstance(cell, dict):
             return cell
@@ -109,54 +571,121 @@ class TursoCursor:
         cell_type = cell.get("type")
         value = cell.get("value")
 
+        if cell_type == "blob":
+            return decode_blob(cell)
         if cell_type == "null" or value is None:
             return None
         if cell_type == "integer":
             return int(value)
         if cell_type == "float":
             return float(value)
-        # text, blob, etc. stay as strings
+        # text stays as a string
         return value
 
-    def fetchall(self) -> list:
+    def _get_rows(self) -> "TursoResult":
+        if self._rows is None:
+            self._rows = self._parse_rows()
         return self._rows
 
+    def fetchall(self) -> "TursoResult":
+        return self._get_rows()
+
     def fetchone(self):
-        return self._rows[0] if self._rows else None
+        rows = self._get_rows()
+        return rows[0] if rows else None
+
+
+class TursoResult(Sequence):
+    """Read-only sequence of TursoRows over column-wise converted values."""
+
+    __slots__ = ("_columns", "_index", "_length")
+
+    def __init__(self, columns: list[list], index: dict[str, int], length: int):
+        self._columns = columns
+        self._index = index
+        self._length = length
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._length))]
+        if i < 0:
+            i += self._length
+        if not 0 <= i < self._length:
+            raise IndexError("row index out of range")
+        return TursoRow(tuple(column[i] for column in self._columns), self._index)
+
+    def __iter__(self):
+        index = self._index
+        if not self._columns:
+            return (TursoRow((), index) for _ in range(self._length))
+        return (TursoRow(values, index) for values in zip(*self._columns))
 
 
 class TursoRow:
-    """Row that supports both index and key access."""
+    """Row that supports both index and key access, like sqlite3.Row.
 
-    def __init__(self, data: dict):
-        self._data = data
-        self._keys = list(data.keys())
+    Values are kept in a tuple; the column-name -> position map is built once
+    per result set and shared by all of its rows.
+    """
+
+    __slots__ = ("_values", "_index")
+
+    def __init__(self, values: tuple, index: dict[str, int]):
+        self._values = values
+        self._index = index
 
     def __getitem__(self, key):
-        if isinstance(key, int):
-            return self._data[self._keys[key]]
-        return self._data[key]
+        if isinstance(key, str):
+            return self._values[self._index[key]]
+        return self._values[key]
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self._values)
 
     def keys(self):
-        return self._keys
+        return list(self._index)
 
 
 class Database:
-    def __init__(self, db_path: str = "aivin.db", use_turso: bool | None = None):
+    def __init__(
+        self,
+        db_path: str = "aivin.db",
+        use_turso: bool | None = None,
+        turso_url: str | None = None,
+        turso_token: str | None = None,
+    ):
         self.db_path = db_path
+        self.turso_url = turso_url or TURSO_URL
+        self.turso_token = turso_token or TURSO_TOKEN
         # Allow explicit override, otherwise auto-detect from env
         if use_turso is not None:
             self.use_turso = use_turso
         else:
-            self.use_turso = bool(TURSO_URL and TURSO_TOKEN)
+            self.use_turso = bool(self.turso_url and self.turso_token)
         if self.use_turso:
-            logger.info("Database: Using Turso at %s", TURSO_URL)
+            logger.info("Database: Using Turso at %s", self.turso_url)
         else:
             logger.info("Database: Using local SQLite at %s", db_path)
+        # Connection pinned by snapshot() for the current request/context
+        self._pinned: ContextVar = ContextVar(f"pinned_connection_{id(self)}", default=None)
+        # Idle Turso connections; reusing them keeps their streams and stored SQL
+        self._turso_pool: list[TursoConnection] = []
+        self._pool_lock = threading.Lock()
+        # Local SQLite is neither slow nor unreachable; only Turso reads are cached
+        self.read_cache = StaleReadCache(TURSO_READ_BUDGET if self.use_turso else 0)
 
     def _create_connection(self):
         if self.use_turso:
-            return TursoConnection(TURSO_URL, TURSO_TOKEN)
+            with self._pool_lock:
+                if self._turso_pool:
+                    return self._turso_pool.pop()
+            return TursoConnection(self.turso_url, self.turso_token)
         else:
             conn = sqlite3.connect(self.db_path)
             conn.row_factory = sqlite3.Row
@@ -164,6 +693,11 @@ class Database:
 
     @contextmanager
     def get_connection(self):
+        pinned = self._pinned.get()
+        if pinned is not None:
+            yield pinned
+            return
+
         conn = self._create_connection()
         try:
             yield conn
@@ -172,17 +706,86 @@ class Database:
             conn.rollback()
             raise
         finally:
+            self._release_connection(conn)
+
+    def _release_connection(self, conn) -> None:
+        if self.use_turso:
+            with self._pool_lock:
+                if len(self._turso_pool) < TURSO_POOL_SIZE:
+                    self._turso_pool.append(conn)
+                    return
+        conn.close()
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.read_cache.close()
+        with self._pool_lock:
+            pool, self._turso_pool = self._turso_pool, []
+        for conn in pool:
             conn.close()
 
+    @contextmanager
+    def snapshot(self):
+        """Run every query in the block on one connection and one transaction.
+
+        Reads inside the block see a single consistent snapshot of the data and
+        share the connection setup cost. Nested calls reuse the outer snapshot.
+        On Turso the transaction is held on the connection's Hrana stream.
+        `cached_read` skips the stale read cache inside the block, so every
+        read sees the snapshot rather than whatever the cache last loaded.
+        """
+        if self._pinned.get() is not None:
+            yield
+            return
+
+        with self.get_connection() as conn:
+            conn.execute("BEGIN")
+            token = self._pinned.set(conn)
+            try:
+                yield
+            finally:
+                self._pinned.reset(token)
+
+    def cached_read(self, key, tables: tuple[str, ...], load):
+        """`load()`, or its last good result when Turso is slow or failing (see StaleReadCache).
+
+        `key` identifies the read, usually its SQL and parameters; `tables` are
+        the ones it reads. Inside a `snapshot()` the read always runs on the
+        snapshot's connection: a cached result could predate or postdate it.
+        """
+        if not self.read_cache.enabled or self._pinned.get() is not None:
+            return load()
+        return self.read_cache.read(key, tables, load)
+
     def execute(self, query: str, params: tuple = ()) -> list:
         with self.get_connection() as conn:
-            cursor = conn.execute(query, params)
-            return cursor.fetchall()
+            started = time.perf_counter()
+            failed = True
+            try:
+                cursor = conn.execute(query, params)
+                rows = cursor.fetchall()
+                failed = False
+                return rows
+            finally:
+                get_query_stats().record_query(query, time.perf_counter() - started, failed)
+                self._after_statement(query)
 
     def execute_returning_id(self, query: str, params: tuple = ()) -> int:
         with self.get_connection() as conn:
-            cursor = conn.execute(query, params)
-            return cursor.lastrowid
+            started = time.perf_counter()
+            failed = True
+            try:
+                cursor = conn.execute(query, params)
+                failed = False
+                return cursor.lastrowid
+            finally:
+                get_query_stats().record_query(query, time.perf_counter() - started, failed)
+                self._after_statement(query)
+
+    def _after_statement(self, query: str) -> None:
+        # Our own writes outdate cached reads at once; other workers' arrive via the change log
+        if self.read_cache.enabled and not is_read_statement(query):
+            self.read_cache.invalidate()
 
 
 _db_instance: Database | None = None
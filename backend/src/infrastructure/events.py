@@ -0,0 +1,87 @@
+import asyncio
+import logging
+import threading
+
+from src.application import EventPublisher, ChangeEvent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 100
+
+
+class Subscription:
+    """One live listener with its own bounded queue on its event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, queue_size: int):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.evicted = False
+
+    async def get(self) -> ChangeEvent | None:
+        """Wait for the next event. Returns None once the subscriber was evicted."""
+        if self.evicted and self.queue.empty():
+            return None
+        return await self.queue.get()
+
+
+class EventHub(EventPublisher):
+    """In-process broadcast of change events to live subscribers.
+
+    Use cases publish from worker threads; every subscriber receives events on
+    its own event loop. A subscriber whose queue is full is evicted rather than
+    allowed to hold up the others or grow without bound, and has to reconnect.
+    """
+
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: set[Subscription] = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> Subscription:
+        """Register a subscriber. Must be called from the subscriber's event loop."""
+        subscription = Subscription(asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event: ChangeEvent) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(self._deliver, subscription, event)
+            except RuntimeError:
+                # The subscriber's loop is closed
+                self.unsubscribe(subscription)
+
+    def _deliver(self, subscription: Subscription, event: ChangeEvent) -> None:
+        if subscription.evicted:
+            return
+        try:
+            subscription.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning("Evicting slow event subscriber (%d events queued)", subscription.queue.qsize())
+            self.unsubscribe(subscription)
+            subscription.evicted = True
+            # Drop the backlog and wake the consumer with the end-of-stream marker
+            while not subscription.queue.empty():
+                subscription.queue.get_nowait()
+            subscription.queue.put_nowait(None)
+
+
+_hub_instance: EventHub | None = None
+
+
+def get_event_hub() -> EventHub:
+    global _hub_instance
+    if _hub_instance is None:
+        _hub_instance = EventHub()
+    return _hub_instance
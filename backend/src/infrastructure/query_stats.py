@@ -0,0 +1,184 @@
+import logging
+import os
+import re
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+# Statements slower than this are logged with their normalized text
+SLOW_QUERY_SECONDS = float(os.getenv("SLOW_QUERY_MS", "200")) / 1000
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Phases of a Turso round trip
+TURSO_PHASES = ("connect", "send", "wait", "parse")
+
+# Statements tracked one by one; any beyond these are counted together as OTHER_STATEMENT
+MAX_STATEMENTS = 256
+OTHER_STATEMENT = "other"
+
+WHITESPACE = re.compile(r"\s+")
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+PLACEHOLDER_LIST = re.compile(r"\?(?: ?, ?\?)+")
+REPEATED_CASE = re.compile(r"(WHEN \? THEN \?)(?: \1)+", re.IGNORECASE)
+REPEATED_ROW = re.compile(r"(\([^()]*\))(?: ?, ?\1)+")
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(sql: str) -> str:
+    """The statement's shape, so its variants group together.
+
+    Whitespace is collapsed, literals become `?`, and placeholder lists,
+    CASE arms and VALUES rows of any length become one entry followed by `...`.
+    """
+    sql = WHITESPACE.sub(" ", sql).strip()
+    sql = STRING_LITERAL.sub("?", sql)
+    sql = NUMBER_LITERAL.sub("?", sql)
+    sql = PLACEHOLDER_LIST.sub("?, ...", sql)
+    sql = REPEATED_CASE.sub(r"\1 ...", sql)
+    return REPEATED_ROW.sub(r"\1, ...", sql)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram. Not thread-safe on its own."""
+
+    def __init__(self, buckets: tuple[float, ...] = BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def merge(self, other: "Histogram") -> None:
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.sum += other.sum
+
+    def copy(self) -> "Histogram":
+        clone = Histogram(self.buckets)
+        clone.counts = list(self.counts)
+        clone.count = self.count
+        clone.sum = self.sum
+        return clone
+
+
+@dataclass
+class StatementStats:
+    count: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    histogram: Histogram = field(default_factory=Histogram)
+
+
+@dataclass
+class RequestQueries:
+    """Queries run while handling one request."""
+    count: int = 0
+    total_seconds: float = 0.0
+    # Age of the oldest cached result served because the database was slow or failing
+    stale_seconds: float | None = None
+
+
+_request_queries: ContextVar[RequestQueries | None] = ContextVar("request_queries", default=None)
+
+
+@contextmanager
+def track_queries():
+    """Count the queries run inside the block, including in worker threads it spawns."""
+    queries = RequestQueries()
+    token = _request_queries.set(queries)
+    try:
+        yield queries
+    finally:
+        _request_queries.reset(token)
+
+
+def current_request_queries() -> RequestQueries | None:
+    return _request_queries.get()
+
+
+class QueryStats:
+    """Process-wide timing per normalized statement and per Turso phase."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._statements: dict[str, StatementStats] = {}
+        self._phases: dict[str, Histogram] = {phase: Histogram() for phase in TURSO_PHASES}
+        # Turso retries, hedges and circuit breaker rejections, by name
+        self._events: dict[str, int] = {}
+
+    def record_query(self, sql: str, seconds: float, failed: bool = False) -> None:
+        statement = normalize_sql(sql)
+        with self._lock:
+            stats = self._statements.get(statement)
+            if stats is None:
+                if len(self._statements) >= MAX_STATEMENTS:
+                    statement = OTHER_STATEMENT
+                stats = self._statements.get(statement)
+            if stats is None:
+                stats = self._statements[statement] = StatementStats()
+            stats.count += 1
+            stats.errors += failed
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.histogram.observe(seconds)
+
+        queries = _request_queries.get()
+        if queries is not None:
+            queries.count += 1
+            queries.total_seconds += seconds
+
+        if seconds >= SLOW_QUERY_SECONDS:
+            logger.warning("Slow query (%.1f ms): %s", seconds * 1000, statement)
+
+    def record_phase(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            self._phases[phase].observe(seconds)
+
+    def record_event(self, event: str) -> None:
+        with self._lock:
+            self._events[event] = self._events.get(event, 0) + 1
+
+    def events(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._events)
+
+    def statements(self) -> dict[str, StatementStats]:
+        """Copy of the per-statement stats."""
+        with self._lock:
+            return {
+                sql: StatementStats(s.count, s.errors, s.total_seconds, s.max_seconds, s.histogram.copy())
+                for sql, s in self._statements.items()
+            }
+
+    def phases(self) -> dict[str, Histogram]:
+        """Copy of the Turso round-trip phase histograms."""
+        with self._lock:
+            return {phase: histogram.copy() for phase, histogram in self._phases.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._statements.clear()
+            self._phases = {phase: Histogram() for phase in TURSO_PHASES}
+            self._events.clear()
+
+
+_stats_instance = QueryStats()
+
+
+def get_query_stats() -> QueryStats:
+    return _stats_instance
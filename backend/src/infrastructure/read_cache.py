@@ -0,0 +1,199 @@
+"""Stale-while-revalidate cache for hot Turso reads.
+
+Repositories send their hot reads through `Database.cached_read`. Every read
+still goes to the database, and its result is kept as the last good one for
+its key. When the read fails with a transient error (including an open
+circuit breaker), or is still running after the latency budget, the last
+good result is served instead and the request is marked stale. A read that
+was only slow carries on in the background and refreshes the entry when it
+completes; concurrent reads of one key share it.
+
+Writes mark entries outdated: this worker's own writes directly, other
+workers' through the change log tailer. An outdated entry is still served
+when the database fails, but not merely because it is slow.
+"""
+import contextvars
+import copy
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from functools import partial
+from typing import Any
+
+from .query_stats import current_request_queries
+from .resilience import is_transient
+
+READ_CACHE_SIZE = 128  # keys; date-range reads add one per day
+# As many as the threadpool running sync endpoints (anyio's default), so
+# refreshes never hold back reads the endpoints could otherwise run
+REFRESH_WORKERS = 40
+
+
+@dataclass
+class CachedRead:
+    value: Any
+    tables: frozenset[str]
+    fetched_at: float
+    outdated: bool = False
+
+
+def _copy(value):
+    # Callers mutate the domain objects they get (auto-advance, updates); their
+    # fields are immutable, so a shallow copy keeps the cached ones intact
+    if isinstance(value, list):
+        return [copy.copy(item) for item in value]
+    return copy.copy(value)
+
+
+class StaleReadCache:
+    """Last good results of reads, by key. A budget of 0 disables the cache."""
+
+    def __init__(self, budget: float, max_entries: int = READ_CACHE_SIZE):
+        self.budget = budget
+        self.max_entries = max_entries
+        self.stale_served = 0
+        self.fresh_served = 0
+        self._entries: OrderedDict[Hashable, CachedRead] = OrderedDict()
+        # key -> (running read, invalidation count when it was started, its token)
+        self._refreshes: dict[Hashable, tuple[Future, int, object]] = {}
+        self._executor: ThreadPoolExecutor | None = None
+        self._invalidations = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.budget > 0
+
+    def read(self, key: Hashable, tables: Iterable[str], load: Callable[[], Any]):
+        """`load()`'s result, or the last good one for `key` when it fails or is too slow.
+
+        `load` runs in a copy of the caller's context: on a refresh thread
+        when there is an up-to-date entry to fall back on, otherwise in the
+        calling thread, since the caller has to wait for it anyway.
+        `tables` are the tables the result depends on.
+        """
+        if not self.enabled:
+            return load()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        budget = self.budget if entry is not None and not entry.outdated else None
+        refresh, run_here = self._refresh(key, frozenset(tables), load, background=budget is not None)
+        if run_here is not None:
+            run_here()
+        try:
+            value = refresh.result(timeout=budget)
+        except FutureTimeoutError:
+            return self._serve_stale(entry)
+        except Exception as e:
+            if entry is None or not is_transient(e):
+                raise
+            return self._serve_stale(entry)
+
+        with self._lock:
+            self.fresh_served += 1
+        return _copy(value)
+
+    def _refresh(
+        self,
+        key: Hashable,
+        tables: frozenset[str],
+        load: Callable[[], Any],
+        background: bool,
+    ) -> tuple[Future, Callable[[], None] | None]:
+        """The read of `key` to wait for, and a function the caller must run to start it, if any."""
+        with self._lock:
+            running = self._refreshes.get(key)
+            # Share a running read unless a write happened after it started
+            if running is not None and running[1] == self._invalidations:
+                return running[0], None
+            token = object()
+            context = contextvars.copy_context()
+            run_here = None
+            if background:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(REFRESH_WORKERS, thread_name_prefix="read-refresh")
+                refresh = self._executor.submit(self._load, key, tables, token, context, load)
+            else:
+                refresh = Future()
+                run_here = partial(self._load_into, refresh, key, tables, token, context, load)
+            self._refreshes[key] = (refresh, self._invalidations, token)
+            return refresh, run_here
+
+    def _load_into(self, refresh: Future, *args) -> None:
+        refresh.set_running_or_notify_cancel()
+        try:
+            refresh.set_result(self._load(*args))
+        except Exception as e:
+            refresh.set_exception(e)
+
+    def _load(
+        self,
+        key: Hashable,
+        tables: frozenset[str],
+        token: object,
+        context: contextvars.Context,
+        load: Callable[[], Any],
+    ):
+        # Stores the result itself, so it is cached before the waiting readers get it
+        started = time.monotonic()
+        with self._lock:
+            invalidations = self._invalidations
+        try:
+            value = context.run(load)
+        finally:
+            with self._lock:
+                running = self._refreshes.get(key)
+                if running is not None and running[2] is token:
+                    del self._refreshes[key]
+
+        with self._lock:
+            current = self._entries.get(key)
+            if current is None or current.fetched_at <= started:
+                # A write since the read started may not be in its result
+                outdated = self._invalidations != invalidations
+                self._entries[key] = CachedRead(value, tables, started, outdated)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def _serve_stale(self, entry: CachedRead):
+        age = time.monotonic() - entry.fetched_at
+        with self._lock:
+            self.stale_served += 1
+        queries = current_request_queries()
+        if queries is not None:
+            queries.stale_seconds = max(queries.stale_seconds or 0.0, age)
+        return _copy(entry.value)
+
+    def invalidate(self, tables: Iterable[str] | None = None) -> None:
+        """Mark the entries depending on `tables` (default: all) outdated."""
+        tables = None if tables is None else set(tables)
+        with self._lock:
+            self._invalidations += 1
+            for entry in self._entries.values():
+                if tables is None or entry.tables & tables:
+                    entry.outdated = True
+
+    def on_changes(self, entries) -> None:
+        """Change log tailer callback."""
+        self.invalidate({entry.table_name for entry in entries})
+
+    def counts(self) -> tuple[int, int]:
+        """(stale results served, fresh results served), for /metrics."""
+        with self._lock:
+            return self.stale_served, self.fresh_served
+
+    def close(self) -> None:
+        """Stop the refresh threads, abandoning refreshes still queued."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -1,5 +1,9 @@
 import json
+from collections.abc import Callable, Iterable
+from contextlib import nullcontext
 from datetime import date, datetime
+from functools import lru_cache
+from typing import Any
 
 from src.domain import (
     Task,
@@ -11,78 +15,178 @@ from src.domain import (
     Urgency,
     TimeOfDay,
 )
-from src.application import TaskRepository, MemberRepository, CompletionRepository, NoteRepository
+from src.application import (
+    TaskRepository,
+    MemberRepository,
+    CompletionRepository,
+    NoteRepository,
+    ChangeVersionRepository,
+)
 from .database import Database
 
 
-class SQLiteTaskRepository(TaskRepository):
-    def __init__(self, db: Database):
-        self.db = db
-
-    def _row_to_task(self, row) -> Task:
-        recurrence_days = None
-        if row["recurrence_days"]:
-            recurrence_days = tuple(json.loads(row["recurrence_days"]))
-
-        time_of_day = None
-        if row["time_of_day"]:
-            time_of_day = TimeOfDay(row["time_of_day"])
-
-        recurrence = RecurrencePattern(
-            type=RecurrenceType(row["recurrence_type"]),
-            days=recurrence_days,
-            interval=row["recurrence_interval"] or 1,
-            time_of_day=time_of_day,
+# Columns every projection keeps: urgency and due-date auto-advance depend on them
+CORE_TASK_COLUMNS = (
+    "id",
+    "recurrence_type",
+    "recurrence_days",
+    "recurrence_interval",
+    "urgency_label",
+    "next_due",
+    "is_active",
+    "autocomplete",
+)
+TASK_COLUMNS = CORE_TASK_COLUMNS + ("name", "time_of_day", "last_completed", "assigned_to_id", "description")
+# Rows per multi-row INSERT; keeps the bound parameters under SQLite's historic 999 limit
+COMPLETIONS_PER_INSERT = 300
+# Ids bound per `IN (...)` list, for the same reason
+IDS_PER_STATEMENT = 300
+# Tables whose writes bump the change version (see migrations 009 and 010)
+VERSIONED_TABLES = ("tasks", "household_members", "task_completions", "notes")
+
+
+@lru_cache(maxsize=256)
+def recurrence_pattern(
+    recurrence_type: str,
+    recurrence_days: str | None,
+    recurrence_interval: int | None,
+    time_of_day: str | None,
+) -> RecurrencePattern:
+    """Build a RecurrencePattern from its raw columns, shared between identical rows.
+
+    Patterns are frozen, so every task with the same schedule can hold the same
+    instance, and the days JSON is parsed once per distinct value.
+    """
+    return RecurrencePattern(
+        type=RecurrenceType(recurrence_type),
+        days=tuple(json.loads(recurrence_days)) if recurrence_days else None,
+        interval=recurrence_interval or 1,
+        time_of_day=TimeOfDay(time_of_day) if time_of_day else None,
+    )
+
+
+parse_date = lru_cache(maxsize=1024)(date.fromisoformat)
+
+
+@lru_cache(maxsize=32)
+def task_mapper(columns: tuple[str, ...]) -> Callable[[Any], Task]:
+    """Compile a row -> Task function for one column layout.
+
+    Column positions are resolved once per layout, so mapping a row is plain
+    positional access with no per-row key lookups. Columns missing from the
+    layout (a narrowed projection) map to the Task defaults.
+    """
+    index = {name: i for i, name in enumerate(columns)}
+    missing = [name for name in CORE_TASK_COLUMNS if name not in index]
+    if missing:
+        raise ValueError(f"Task rows need columns: {', '.join(missing)}")
+
+    i_id = index["id"]
+    i_type = index["recurrence_type"]
+    i_days = index["recurrence_days"]
+    i_interval = index["recurrence_interval"]
+    i_urgency = index["urgency_label"]
+    i_next_due = index["next_due"]
+    i_active = index["is_active"]
+    i_autocomplete = index["autocomplete"]
+    i_name = index.get("name")
+    i_time = index.get("time_of_day")
+    i_last = index.get("last_completed")
+    i_assigned = index.get("assigned_to_id")
+    i_description = index.get("description")
+
+    def row_to_task(row) -> Task:
+        urgency_label = row[i_urgency]
+        next_due = row[i_next_due]
+        last_completed = row[i_last] if i_last is not None else None
+        return Task(
+            id=row[i_id],
+            name=row[i_name] if i_name is not None else "",
+            recurrence=recurrence_pattern(
+                row[i_type],
+                row[i_days],
+                row[i_interval],
+                row[i_time] if i_time is not None else None,
+            ),
+            urgency_label=Urgency(urgency_label) if urgency_label else None,
+            last_completed=datetime.fromisoformat(last_completed) if last_completed else None,
+            next_due=parse_date(next_due) if next_due else None,
+            is_active=bool(row[i_active]),
+            assigned_to_id=row[i_assigned] if i_assigned is not None else None,
+            autocomplete=bool(row[i_autocomplete]),
+            description=row[i_description] if i_description is not None else None,
         )
 
-        urgency_label = None
-        if row["urgency_label"]:
-            urgency_label = Urgency(row["urgency_label"])
+    return row_to_task
 
-        last_completed = None
-        if row["last_completed"]:
-            last_completed = datetime.fromisoformat(row["last_completed"])
 
-        next_due = None
-        if row["next_due"]:
-            next_due = date.fromisoformat(row["next_due"])
+class SQLiteTaskRepository(TaskRepository):
+    """Task storage.
 
-        return Task(
-            id=row["id"],
-            name=row["name"],
-            recurrence=recurrence,
-            urgency_label=urgency_label,
-            last_completed=last_completed,
-            next_due=next_due,
-            is_active=bool(row["is_active"]),
-            assigned_to_id=row["assigned_to_id"],
-            autocomplete=bool(row["autocomplete"]) if row["autocomplete"] is not None else False,
-            description=row["description"] if "description" in row.keys() else None,
-        )
+    With `columns`, reads select only those columns (plus CORE_TASK_COLUMNS);
+    the rest keep their Task defaults. Partially loaded tasks can't be written
+    back, so `save` refuses updates on a projected repository.
+    """
+
+    def __init__(self, db: Database, columns: Iterable[str] | None = None):
+        self.db = db
+        self.columns = None
+        self._select = "*"
+        if columns is not None:
+            unknown = set(columns) - set(TASK_COLUMNS)
+            if unknown:
+                raise ValueError(f"Unknown task columns: {', '.join(sorted(unknown))}")
+            self.columns = tuple(c for c in TASK_COLUMNS if c in CORE_TASK_COLUMNS or c in columns)
+            self._select = ", ".join(self.columns)
+
+    def _rows_to_tasks(self, rows) -> list[Task]:
+        if not rows:
+            return []
+        row_to_task = task_mapper(tuple(rows[0].keys()))
+        return [row_to_task(row) for row in rows]
 
     def get_all(self, active_only: bool = True) -> list[Task]:
-        query = "SELECT * FROM tasks"
+        query = f"SELECT {self._select} FROM tasks"
         if active_only:
             query += " WHERE is_active = 1"
         query += " ORDER BY next_due ASC NULLS LAST"
 
-        rows = self.db.execute(query)
-        return [self._row_to_task(row) for row in rows]
+        return self.db.cached_read(query, ("tasks",), lambda: self._rows_to_tasks(self.db.execute(query)))
 
     def get_by_id(self, task_id: int) -> Task | None:
-        rows = self.db.execute("SELECT * FROM tasks WHERE id = ?", (task_id,))
+        rows = self.db.execute(f"SELECT {self._select} FROM tasks WHERE id = ?", (task_id,))
         if not rows:
             return None
-        return self._row_to_task(rows[0])
+        return self._rows_to_tasks(rows)[0]
+
+    def get_names(self, task_ids: Iterable[int]) -> dict[int, str]:
+        """Names of the given tasks, active or not, by id."""
+        task_ids = sorted(set(task_ids))
+        names = {}
+        for start in range(0, len(task_ids), IDS_PER_STATEMENT):
+            chunk = task_ids[start:start + IDS_PER_STATEMENT]
+            rows = self.db.execute(
+                f"SELECT id, name FROM tasks WHERE id IN ({', '.join('?' for _ in chunk)})",
+                tuple(chunk),
+            )
+            names.update((row["id"], row["name"]) for row in rows)
+        return names
 
     def get_by_due_date_range(self, start: date, end: date) -> list[Task]:
-        rows = self.db.execute(
-            """SELECT * FROM tasks
+        query = f"""SELECT {self._select} FROM tasks
                WHERE is_active = 1 AND next_due >= ? AND next_due <= ?
-               ORDER BY next_due ASC""",
-            (start.isoformat(), end.isoformat()),
+               ORDER BY next_due ASC"""
+        params = (start.isoformat(), end.isoformat())
+        return self.db.cached_read(
+            (query, params), ("tasks",), lambda: self._rows_to_tasks(self.db.execute(query, params))
         )
-        return [self._row_to_task(row) for row in rows]
+
+    def get_changed_since(self, version: int) -> list[Task]:
+        rows = self.db.execute(
+            f"SELECT {self._select} FROM tasks WHERE updated_version > ? ORDER BY next_due ASC NULLS LAST",
+            (version,),
+        )
+        return self._rows_to_tasks(rows)
 
     def save(self, task: Task) -> Task:
         recurrence_days = None
@@ -129,6 +233,8 @@ class SQLiteTaskRepository(TaskRepository):
             )
             task.id = task_id
         else:
+            if self.columns is not None:
+                raise ValueError("Cannot save a task read through a column projection")
             self.db.execute(
                 """UPDATE tasks SET
                    name = ?, recurrence_type = ?, recurrence_days = ?,
@@ -154,6 +260,42 @@ class SQLiteTaskRepository(TaskRepository):
             )
         return task
 
+    def update_next_due_dates(self, next_due_by_id: dict[int, date | None]) -> None:
+        items = list(next_due_by_id.items())
+        # Several statements go in one transaction; one needs none
+        with self.db.snapshot() if len(items) > IDS_PER_STATEMENT else nullcontext():
+            # Three parameters per task, so a full chunk binds 900
+            for start in range(0, len(items), IDS_PER_STATEMENT):
+                chunk = items[start:start + IDS_PER_STATEMENT]
+                cases = " ".join("WHEN ? THEN ?" for _ in chunk)
+                placeholders = ", ".join("?" for _ in chunk)
+                params = []
+                for task_id, next_due in chunk:
+                    params += [task_id, next_due.isoformat() if next_due else None]
+                self.db.execute(
+                    f"UPDATE tasks SET next_due = CASE id {cases} END WHERE id IN ({placeholders})",
+                    (*params, *(task_id for task_id, _ in chunk)),
+                )
+
+    def apply_completions(self, completed: dict[int, tuple[datetime, date | None, bool]]) -> None:
+        """Set last_completed, next_due and is_active by task id, from (completed_at, next_due, is_active).
+
+        A task that already has a later completion is left alone, so completions
+        replayed late or out of order can't move it back.
+        """
+        for task_id, (completed_at, next_due, is_active) in completed.items():
+            self.db.execute(
+                """UPDATE tasks SET last_completed = ?, next_due = ?, is_active = ?
+                   WHERE id = ? AND (last_completed IS NULL OR last_completed <= ?)""",
+                (
+                    completed_at.isoformat(),
+                    next_due.isoformat() if next_due else None,
+                    1 if is_active else 0,
+                    task_id,
+                    completed_at.isoformat(),
+                ),
+            )
+
     def delete(self, task_id: int) -> bool:
         self.db.execute("UPDATE tasks SET is_active = 0 WHERE id = ?", (task_id,))
         return True
@@ -188,10 +330,18 @@ class SQLiteMemberRepository(MemberRepository):
         )
 
     def get_all(self) -> list[HouseholdMember]:
-        rows = self.db.execute("SELECT * FROM household_members ORDER BY name")
-        return [self._row_to_member(row) for row in rows]
+        query = "SELECT * FROM household_members ORDER BY name"
+        return self.db.cached_read(
+            query, ("household_members",), lambda: [self._row_to_member(row) for row in self.db.execute(query)]
+        )
 
     def get_by_id(self, member_id: int) -> HouseholdMember | None:
+        # Every authenticated request looks up its member
+        return self.db.cached_read(
+            ("household_members", member_id), ("household_members",), lambda: self._get_by_id(member_id)
+        )
+
+    def _get_by_id(self, member_id: int) -> HouseholdMember | None:
         rows = self.db.execute(
             "SELECT * FROM household_members WHERE id = ?", (member_id,)
         )
@@ -248,9 +398,11 @@ class SQLiteCompletionRepository(CompletionRepository):
 
     def get_all(self, limit: int | None = None) -> list[TaskCompletion]:
         query = "SELECT * FROM task_completions ORDER BY completed_at DESC"
+        params = ()
         if limit:
-            query += f" LIMIT {limit}"
-        rows = self.db.execute(query)
+            query += " LIMIT ?"
+            params = (limit,)
+        rows = self.db.execute(query, params)
         return [self._row_to_completion(row) for row in rows]
 
     def get_by_task(self, task_id: int) -> list[TaskCompletion]:
@@ -298,6 +450,43 @@ class SQLiteCompletionRepository(CompletionRepository):
             completion.id = completion_id
         return completion
 
+    def save_many(self, completions: list[TaskCompletion]) -> list[TaskCompletion]:
+        for start in range(0, len(completions), COMPLETIONS_PER_INSERT):
+            chunk = completions[start:start + COMPLETIONS_PER_INSERT]
+            params = []
+            for completion in chunk:
+                params += [completion.task_id, completion.completed_at.isoformat(), completion.completed_by_id]
+            last_id = self.db.execute_returning_id(
+                "INSERT INTO task_completions (task_id, completed_at, completed_by_id) VALUES "
+                + ", ".join("(?, ?, ?)" for _ in chunk),
+                tuple(params),
+            )
+            # One INSERT statement gets consecutive rowids, ending at the last one
+            first_id = last_id - len(chunk) + 1
+            for offset, completion in enumerate(chunk):
+                completion.id = first_id + offset
+        return completions
+
+    def save_missing(self, completions: list[TaskCompletion]) -> list[TaskCompletion]:
+        """Insert the completions not stored yet, by task and completion time; returns those.
+
+        Makes replaying a batch that may already have been written harmless.
+        """
+        if not completions:
+            return []
+        task_ids = sorted({completion.task_id for completion in completions})
+        rows = self.db.execute(
+            f"SELECT task_id, completed_at FROM task_completions WHERE task_id IN ({', '.join('?' for _ in task_ids)})"
+            " AND completed_at >= ?",
+            (*task_ids, min(completion.completed_at for completion in completions).isoformat()),
+        )
+        stored = {(row["task_id"], row["completed_at"]) for row in rows}
+        missing = [
+            completion for completion in completions
+            if (completion.task_id, completion.completed_at.isoformat()) not in stored
+        ]
+        return self.save_many(missing)
+
 
 class SQLiteNoteRepository(NoteRepository):
     def __init__(self, db: Database):
@@ -311,6 +500,9 @@ class SQLiteNoteRepository(NoteRepository):
         )
 
     def get(self) -> Note | None:
+        return self.db.cached_read("notes", ("notes",), self._get)
+
+    def _get(self) -> Note | None:
         rows = self.db.execute("SELECT * FROM notes LIMIT 1")
         if not rows:
             return None
@@ -329,3 +521,24 @@ class SQLiteNoteRepository(NoteRepository):
                 (note.content, note.updated_at.isoformat(), note.id),
             )
         return note
+
+
+class SQLiteChangeVersionRepository(ChangeVersionRepository):
+    def __init__(self, db: Database):
+        self.db = db
+
+    def get_version(self) -> int:
+        # Safe to serve stale: an old version only makes delta sync send changes again
+        return self.db.cached_read("sync_state", VERSIONED_TABLES, self._get_version)
+
+    def get_current_version(self) -> int:
+        """The version as the database has it now, never a stale cached one.
+
+        For conditional GETs, where an old version would answer 304 for data
+        that has changed since.
+        """
+        return self._get_version()
+
+    def _get_version(self) -> int:
+        rows = self.db.execute("SELECT version FROM sync_state WHERE id = 1")
+        return rows[0]["version"] if rows else 0
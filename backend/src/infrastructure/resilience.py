@@ -0,0 +1,140 @@
+"""Failure handling for Turso calls: retry policy, latency window, circuit breaker."""
+import asyncio
+import http.client
+import logging
+import random
+import re
+import threading
+import time
+from collections import deque
+from urllib.error import HTTPError
+
+logger = logging.getLogger(__name__)
+
+RETRY_BACKOFF_BASE = 0.05  # seconds; doubles per attempt
+RETRY_BACKOFF_CAP = 1.0
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+READ_KEYWORDS = frozenset({"SELECT", "EXPLAIN", "VALUES"})
+WRITE_WORDS = re.compile(r"\b(INSERT|UPDATE|DELETE|REPLACE)\b", re.IGNORECASE)
+
+
+def is_read_statement(sql: str) -> bool:
+    """Whether `sql` only reads, so running it twice is harmless."""
+    words = sql.lstrip().split(None, 1)
+    if not words:
+        return False
+    keyword = words[0].upper()
+    if keyword == "WITH":
+        return not WRITE_WORDS.search(sql)
+    return keyword in READ_KEYWORDS
+
+
+def is_transient(error: BaseException) -> bool:
+    """Network trouble, timeouts and overload statuses; not statement errors."""
+    if isinstance(error, HTTPError):
+        return error.code in RETRYABLE_STATUSES
+    return isinstance(error, (ConnectionError, TimeoutError, http.client.HTTPException))
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff before retry number `attempt` (0-based)."""
+    return random.uniform(0, min(RETRY_BACKOFF_CAP, RETRY_BACKOFF_BASE * 2 ** attempt))
+
+
+def on_event_loop() -> bool:
+    """Whether the calling thread is running an asyncio event loop.
+
+    Blocking there, even for a retry's backoff, stalls every other request.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class LatencyWindow:
+    """Recent round-trip latencies, for percentile estimates."""
+
+    def __init__(self, size: int = 256):
+        self._samples: deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float, min_samples: int = 20) -> float | None:
+        """The q-th percentile, or None until there are enough samples."""
+        with self._lock:
+            if len(self._samples) < min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(int(q / 100 * len(ordered)), len(ordered) - 1)]
+
+
+class CircuitOpenError(ConnectionError):
+    """Turso is failing; calls are refused until the breaker's reset timeout passes."""
+
+
+class CircuitBreaker:
+    """Fail fast after repeated transient failures.
+
+    Closed: calls go through and consecutive failures are counted. After
+    `failures` of them the breaker opens and refuses calls for
+    `reset_seconds`. Then one trial call is let through (half-open): success
+    closes the breaker, failure opens it again.
+    """
+
+    def __init__(self, failures: int, reset_seconds: float):
+        self.failures = failures
+        self.reset_seconds = reset_seconds
+        self._consecutive = 0
+        self._opened_at: float | None = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go through now."""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at < self.reset_seconds or self._trial_running:
+                raise CircuitOpenError("Turso circuit breaker is open")
+            self._trial_running = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("Turso circuit breaker closed")
+            self._consecutive = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._consecutive += 1
+            if self._trial_running or (self._opened_at is None and self._consecutive >= self.failures):
+                if self._opened_at is None:
+                    logger.warning("Turso circuit breaker opened after %d failures", self._consecutive)
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker_for(url: str, failures: int, reset_seconds: float) -> CircuitBreaker:
+    """The breaker shared by every connection to `url`, created with these settings."""
+    with _breakers_lock:
+        breaker = _breakers.get(url)
+        if breaker is None:
+            breaker = _breakers[url] = CircuitBreaker(failures, reset_seconds)
+        return breaker
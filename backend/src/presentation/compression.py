@@ -0,0 +1,99 @@
+"""Opt-in response compression for routes with large bodies.
+
+Routers opt in with `APIRouter(route_class=CompressedRoute)`. Bodies above
+MIN_COMPRESS_SIZE are compressed with brotli when the client accepts it and
+the optional `brotli` package is installed, otherwise with gzip.
+"""
+import gzip
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from .timing import timed
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+MIN_COMPRESS_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4  # fast enough to run per request, still well ahead of gzip
+
+
+def encoding_qualities(accept_encoding: str) -> dict[str, float]:
+    """Parse Accept-Encoding into each listed coding's quality; 0 means refused."""
+    qualities = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        qualities[name] = q
+    return qualities
+
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    """Parse Accept-Encoding into the set of codings the client accepts."""
+    return {name for name, q in encoding_qualities(accept_encoding).items() if q > 0}
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    qualities = encoding_qualities(accept_encoding)
+    wildcard = qualities.get("*", 0.0) > 0
+
+    def acceptable(name: str) -> bool:
+        # A coding refused with q=0 stays refused when * accepts the rest (RFC 9110 12.5.3)
+        q = qualities.get(name)
+        return wildcard if q is None else q > 0
+
+    if brotli is not None and acceptable("br"):
+        return "br"
+    if acceptable("gzip"):
+        return "gzip"
+    return None
+
+
+def compress_response(request: Request, response: Response) -> Response:
+    body = getattr(response, "body", None)
+    if (
+        body is None  # streaming responses
+        or len(body) < MIN_COMPRESS_SIZE
+        or response.status_code != 200
+        or "content-encoding" in response.headers
+    ):
+        return response
+
+    if "accept-encoding" not in response.headers.get("vary", "").lower():
+        response.headers.append("Vary", "Accept-Encoding")
+    encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+    if encoding is None:
+        return response
+
+    with timed("compress"):
+        if encoding == "br":
+            response.body = brotli.compress(body, quality=BROTLI_QUALITY)
+        else:
+            response.body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+    response.headers["Content-Encoding"] = encoding
+    response.headers["Content-Length"] = str(len(response.body))
+    # The ETag already names the encoding (see conditional_get)
+    return response
+
+
+class CompressedRoute(APIRoute):
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def compressed_handler(request: Request) -> Response:
+            response = await handler(request)
+            return compress_response(request, response)
+
+        return compressed_handler
@@ -1,10 +1,29 @@
-from fastapi import Depends, HTTPException, status
+import hashlib
+import re
+from datetime import date
+
+from fastapi import Depends, HTTPException, Query, Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from src.domain import HouseholdMember
-from src.infrastructure import get_database, SQLiteMemberRepository, AuthService
+from src.infrastructure import (
+    get_database,
+    SQLiteMemberRepository,
+    SQLiteChangeVersionRepository,
+    AuthService,
+    EventHub,
+    get_event_hub,
+)
+from src.infrastructure.auth import EVENTS_TOKEN_SCOPE
+from src.infrastructure.resilience import is_transient
+from .compression import CompressedRoute, choose_encoding
+from .serialization import TASK_FIELDS, COMPLETION_FIELDS
+from .timing import timed
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
+
+ETAG_ENCODING_SUFFIX = re.compile(r'-(gzip|br)"$')
 
 
 def get_auth_service() -> AuthService:
@@ -16,14 +35,16 @@ def get_member_repo() -> SQLiteMemberRepository:
     return SQLiteMemberRepository(db)
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    auth_service: AuthService = Depends(get_auth_service),
-    member_repo: SQLiteMemberRepository = Depends(get_member_repo),
-) -> HouseholdMember:
-    token = credentials.credentials
-    user_id = auth_service.decode_token(token)
+def get_event_publisher() -> EventHub:
+    return get_event_hub()
+
+
+def get_version_repo() -> SQLiteChangeVersionRepository:
+    db = get_database()
+    return SQLiteChangeVersionRepository(db)
+
 
+def _member_for(user_id: int | None, member_repo: SQLiteMemberRepository) -> HouseholdMember:
     if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -37,5 +58,121 @@ async def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
-
     return user
+
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    auth_service: AuthService = Depends(get_auth_service),
+    member_repo: SQLiteMemberRepository = Depends(get_member_repo),
+) -> HouseholdMember:
+    # A plain def, so FastAPI runs it in the threadpool: the member lookup may
+    # wait on Turso, or on a read the stale read cache is loading
+    with timed("auth"):
+        return _member_for(auth_service.decode_token(credentials.credentials), member_repo)
+
+
+def get_events_user(
+    token: str | None = Query(None, description="Events token from POST /api/events/token"),
+    credentials: HTTPAuthorizationCredentials | None = Depends(optional_security),
+    auth_service: AuthService = Depends(get_auth_service),
+    member_repo: SQLiteMemberRepository = Depends(get_member_repo),
+) -> HouseholdMember:
+    """The current user for the event stream, from a Bearer header or an events token.
+
+    Browsers' EventSource can't send headers, so it passes a short-lived
+    events token in the query string instead.
+    """
+    with timed("auth"):
+        if token is not None:
+            user_id = auth_service.decode_token(token, scope=EVENTS_TOKEN_SCOPE)
+        elif credentials is not None:
+            user_id = auth_service.decode_token(credentials.credentials)
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Not authenticated",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return _member_for(user_id, member_repo)
+
+
+def conditional_get(
+    request: Request,
+    response: Response,
+    current_user: HouseholdMember = Depends(get_current_user),
+    version_repo: SQLiteChangeVersionRepository = Depends(get_version_repo),
+) -> str | None:
+    """Answer 304 Not Modified when the client already has the current response.
+
+    The ETag is derived from the household change version (bumped on every
+    write), today's date (urgency and auto-advance depend on it), the path,
+    the query string and the Accept header, so it can be checked without
+    running the real query. On compressed routes it also names the encoding
+    the response is sent with, so the 304 carries the tag of the 200.
+    Authentication runs first so unauthenticated clients never get a 304.
+    """
+    try:
+        version = version_repo.get_current_version()
+    except Exception as e:
+        if not is_transient(e):
+            raise
+        # No telling whether the client's copy is current; the route answers,
+        # from stale reads if need be, and without an ETag
+        return None
+
+    query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+    key = (
+        f"{request.url.path}?{query}|{request.headers.get('accept', '')}"
+        f"|{version}|{date.today().isoformat()}"
+    )
+    tag = hashlib.sha1(key.encode()).hexdigest()[:20]
+    headers = {"Cache-Control": "private, no-cache"}
+    encoding = None
+    if isinstance(request.scope.get("route"), CompressedRoute):
+        encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+        headers["Vary"] = "Accept-Encoding"
+    etag = f'"{tag}-{encoding}"' if encoding else f'"{tag}"'
+    headers["ETag"] = etag
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # A tag for another encoding of the same data still matches
+        client_tags = {
+            ETAG_ENCODING_SUFFIX.sub('"', client_tag.strip()) for client_tag in if_none_match.split(",")
+        }
+        if f'"{tag}"' in client_tags or "*" in client_tags:
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return etag
+
+
+def parse_fields(fields: str | None, allowed: tuple[str, ...]) -> tuple[str, ...] | None:
+    """Parse a comma-separated `fields` parameter into allowed names, in payload order.
+
+    None means every field. `id` is always included.
+    """
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+        )
+    requested.add("id")
+    return tuple(name for name in allowed if name in requested)
+
+
+def task_fields(
+    fields: str | None = Query(None, description="Comma-separated task fields to return"),
+) -> tuple[str, ...] | None:
+    return parse_fields(fields, TASK_FIELDS)
+
+
+def completion_fields(
+    fields: str | None = Query(None, description="Comma-separated completion fields to return"),
+) -> tuple[str, ...] | None:
+    return parse_fields(fields, COMPLETION_FIELDS)
@@ -1,12 +1,29 @@
+import time
+
+# Importing the app is most of a cold start; the startup report counts from here
+IMPORT_STARTED = time.perf_counter()
+
 import logging
 import os
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
-from src.infrastructure import create_default_admin_if_needed
-from .routes import tasks_router, members_router, history_router, auth_router, admin_router, notes_router
+from src.infrastructure import (
+    CircuitOpenError,
+    create_default_admin_if_needed,
+    get_change_log_tailer,
+    get_completion_journal,
+    get_database,
+)
+from src.infrastructure.database import TURSO_BREAKER_RESET_SECONDS
+from .metrics import MetricsMiddleware
+from .middleware import RequestTimingMiddleware
+from .profiling import ProfilingMiddleware
+from .warmup import start_warm_up, startup_report
+from .routes import tasks_router, members_router, history_router, auth_router, admin_router, notes_router, dashboard_router, events_router, metrics_router
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -27,11 +44,25 @@ def get_cors_origins() -> list[str]:
 async def lifespan(app: FastAPI):
     """Application lifespan handler for startup and shutdown events."""
     # Startup
-    logger.info("Starting Aivin application...")
+    logger.info("Starting Aivin application (imported in %.0f ms)...", startup_report.import_seconds * 1000)
     create_default_admin_if_needed()
+    start_warm_up(app)
+    get_change_log_tailer().start()  # prunes change_log, with or without subscribers
+    read_cache = get_database().read_cache
+    if read_cache.enabled:
+        get_change_log_tailer().subscribe(read_cache.on_changes)
+    journal = get_completion_journal()
+    if journal is not None:
+        journal.start()  # sends completions left over from the previous run
     yield
     # Shutdown
     logger.info("Shutting down Aivin application...")
+    if journal is not None:
+        journal.drain()
+    if read_cache.enabled:
+        get_change_log_tailer().unsubscribe(read_cache.on_changes)
+    get_change_log_tailer().stop()
+    get_database().close()
 
 
 app = FastAPI(
@@ -41,13 +72,28 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+
+@app.exception_handler(CircuitOpenError)
+async def database_unavailable(request: Request, exc: CircuitOpenError):
+    """Turso is down and the circuit breaker is failing calls fast."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database temporarily unavailable"},
+        headers={"Retry-After": str(int(TURSO_BREAKER_RESET_SECONDS))},
+    )
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=get_cors_origins(),
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Change-Version", "ETag", "Server-Timing", "X-Data-Stale"],
 )
+app.add_middleware(RequestTimingMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(ProfilingMiddleware)
 
 app.include_router(auth_router)
 app.include_router(admin_router)
@@ -55,6 +101,9 @@ app.include_router(tasks_router)
 app.include_router(members_router)
 app.include_router(history_router)
 app.include_router(notes_router)
+app.include_router(dashboard_router)
+app.include_router(events_router)
+app.include_router(metrics_router)
 
 
 @app.get("/")
@@ -66,3 +115,6 @@ def root():
 @app.get("/healthz")
 def health():
     return {"status": "healthy"}
+
+
+startup_report.imported(IMPORT_STARTED)
@@ -0,0 +1,219 @@
+"""In-process metrics, rendered in the Prometheus text exposition format.
+
+Request metrics are only touched from the event loop thread (by the
+middleware and the /metrics endpoint), so they need no locking. Database
+metrics come from the infrastructure QueryStats, which is shared with worker
+threads and does its own locking.
+"""
+import time
+from typing import Callable
+
+import anyio.to_thread
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.infrastructure import get_completion_journal, get_database, get_query_stats
+from src.infrastructure.database import encoders_for
+from src.infrastructure.query_stats import Histogram, normalize_sql
+from src.infrastructure.repositories import parse_date, recurrence_pattern, task_mapper
+from .warmup import startup_report
+
+PREFIX = "aivin"
+UNMATCHED_ROUTE = "<unmatched>"
+
+# name -> function returning (hits, misses)
+CacheInfo = Callable[[], tuple[int, int]]
+_caches: dict[str, CacheInfo] = {}
+
+
+def register_cache(name: str, info: CacheInfo) -> None:
+    """Expose a cache's hit and miss counts on /metrics."""
+    _caches[name] = info
+
+
+def register_lru_cache(name: str, cached_function) -> None:
+    def info() -> tuple[int, int]:
+        stats = cached_function.cache_info()
+        return stats.hits, stats.misses
+
+    register_cache(name, info)
+
+
+register_lru_cache("task_mapper", task_mapper)
+register_lru_cache("recurrence_pattern", recurrence_pattern)
+register_lru_cache("parse_date", parse_date)
+register_lru_cache("normalize_sql", normalize_sql)
+register_lru_cache("turso_arg_encoders", encoders_for)
+# Hits are stale results served while Turso was slow or failing
+register_cache("turso_stale_reads", lambda: get_database().read_cache.counts())
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.in_flight = 0
+        # (method, route template, status) -> latency histogram
+        self.durations: dict[tuple[str, str, str], Histogram] = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float) -> None:
+        key = (method, route, str(status))
+        histogram = self.durations.get(key)
+        if histogram is None:
+            histogram = self.durations[key] = Histogram()
+        histogram.observe(seconds)
+
+
+request_metrics = RequestMetrics()
+
+
+class MetricsMiddleware:
+    """Record latency per route template and status, and the requests in flight.
+
+    Routes are labelled by their template (`/api/tasks/{task_id}`), never the
+    raw path, so the number of series stays bounded.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        self.metrics.in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.metrics.in_flight -= 1
+            route = scope.get("route")
+            template = getattr(route, "path", None) or UNMATCHED_ROUTE
+            seconds = time.perf_counter() - started
+            self.metrics.observe(scope["method"], template, status, seconds)
+            startup_report.observe_request(seconds)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _header(lines: list[str], name: str, kind: str, help_text: str) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _histogram(lines: list[str], name: str, histogram: Histogram, **labels: str) -> None:
+    cumulative = 0
+    for bound, count in zip(histogram.buckets, histogram.counts):
+        cumulative += count
+        lines.append(f"{name}_bucket{_labels(**labels, le=repr(bound))} {cumulative}")
+    lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {histogram.count}")
+    lines.append(f"{name}_sum{_labels(**labels)} {histogram.sum}")
+    lines.append(f"{name}_count{_labels(**labels)} {histogram.count}")
+
+
+def journal_state() -> tuple[int, int] | None:
+    """(completions waiting in the write-behind journal, flush rounds failed in a row),
+    or None without a journal. Blocks on SQLite."""
+    journal = get_completion_journal()
+    return (journal.pending(), journal.failures) if journal is not None else None
+
+
+def render_metrics(metrics: RequestMetrics = request_metrics, journal: tuple[int, int] | None = None) -> str:
+    """All metrics in Prometheus text format. Call from the event loop.
+
+    Statements are labelled by their normalized text; QueryStats caps how
+    many there are and counts the rest as "other". `journal` comes from
+    `journal_state`, which must run off the event loop.
+    """
+    lines: list[str] = []
+
+    name = f"{PREFIX}_http_requests_in_flight"
+    _header(lines, name, "gauge", "HTTP requests currently being handled.")
+    lines.append(f"{name} {metrics.in_flight}")
+
+    name = f"{PREFIX}_startup_seconds"
+    _header(lines, name, "gauge", "Cold-start timings: import, warm-up steps and the first request.")
+    for phase, seconds in startup_report.phases().items():
+        lines.append(f"{name}{_labels(phase=phase)} {seconds}")
+
+    name = f"{PREFIX}_http_request_duration_seconds"
+    _header(lines, name, "histogram", "HTTP request latency by route template and status.")
+    for (method, route, status), histogram in sorted(metrics.durations.items()):
+        _histogram(lines, name, histogram, method=method, route=route, status=status)
+
+    stats = get_query_stats()
+    statements = stats.statements()
+    all_queries = Histogram()
+    for statement in statements.values():
+        all_queries.merge(statement.histogram)
+
+    name = f"{PREFIX}_db_query_duration_seconds"
+    _header(lines, name, "histogram", "Database statement latency.")
+    _histogram(lines, name, all_queries)
+
+    for suffix, attribute, help_text in (
+        ("queries_total", "count", "Statements executed, by normalized statement."),
+        ("errors_total", "errors", "Statements that raised, by normalized statement."),
+        ("seconds_total", "total_seconds", "Time spent in each normalized statement."),
+    ):
+        name = f"{PREFIX}_db_statement_{suffix}"
+        _header(lines, name, "counter", help_text)
+        for sql, statement in sorted(statements.items()):
+            lines.append(f"{name}{_labels(statement=sql)} {getattr(statement, attribute)}")
+
+    name = f"{PREFIX}_turso_phase_duration_seconds"
+    _header(lines, name, "histogram", "Turso round-trip time by phase.")
+    for phase, histogram in stats.phases().items():
+        _histogram(lines, name, histogram, phase=phase)
+
+    name = f"{PREFIX}_turso_events_total"
+    _header(lines, name, "counter", "Turso read retries, hedged reads and circuit breaker rejections.")
+    for event, count in sorted(stats.events().items()):
+        lines.append(f"{name}{_labels(event=event)} {count}")
+
+    caches = {cache: info() for cache, info in sorted(_caches.items())}
+    for suffix, index, help_text in (("hits_total", 0, "Cache hits."), ("misses_total", 1, "Cache misses.")):
+        name = f"{PREFIX}_cache_{suffix}"
+        _header(lines, name, "counter", help_text)
+        for cache, counts in caches.items():
+            lines.append(f"{name}{_labels(cache=cache)} {counts[index]}")
+
+    if journal is not None:
+        for suffix, value, help_text in zip(
+            ("pending", "flush_failures"),
+            journal,
+            (
+                "Journaled completions not written to the database yet.",
+                "Journal flush rounds in a row that failed; the flusher pauses longer after each.",
+            ),
+        ):
+            name = f"{PREFIX}_completion_journal_{suffix}"
+            _header(lines, name, "gauge", help_text)
+            lines.append(f"{name} {value}")
+
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    for suffix, value, help_text in (
+        ("threads_busy", limiter.borrowed_tokens, "Worker threads running sync endpoints and dependencies."),
+        ("threads_limit", limiter.total_tokens, "Size of the worker thread pool."),
+        ("tasks_waiting", limiter.statistics().tasks_waiting, "Calls waiting for a free worker thread."),
+    ):
+        name = f"{PREFIX}_threadpool_{suffix}"
+        _header(lines, name, "gauge", help_text)
+        lines.append(f"{name} {value}")
+
+    return "\n".join(lines) + "\n"
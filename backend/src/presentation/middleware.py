@@ -0,0 +1,58 @@
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.infrastructure import track_queries
+from .timing import track_timing, check_query_budget
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTimingMiddleware:
+    """Time each HTTP request and count its database queries.
+
+    Adds a Server-Timing header to every response and checks the route's
+    query budget when the response starts. Responses built from stale cached
+    reads get X-Data-Stale (the age in seconds) and lose their ETag, so
+    clients don't revalidate against them. Plain ASGI rather than
+    BaseHTTPMiddleware, so streaming responses pass through untouched. The
+    counters live in contextvars that sync endpoints running in the
+    threadpool share with this middleware.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        with track_queries() as queries, track_timing(queries) as timing:
+
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    check_query_budget(scope.get("route"), scope["method"], queries.count)
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", timing.server_timing())
+                    if queries.stale_seconds is not None:
+                        headers["X-Data-Stale"] = str(int(queries.stale_seconds))
+                        headers["Cache-Control"] = "no-store"
+                        if "etag" in headers:
+                            del headers["etag"]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                logger.debug(
+                    "%s %s: %d queries, %.1f ms in database, %.1f ms total",
+                    scope["method"],
+                    scope["path"],
+                    queries.count,
+                    queries.total_seconds * 1000,
+                    (time.perf_counter() - started) * 1000,
+                )
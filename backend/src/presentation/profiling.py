@@ -0,0 +1,107 @@
+"""On-demand profiling of single requests.
+
+A request sent with `X-Profile: <ADMIN_API_KEY>` runs under cProfile. The
+response carries an `X-Profile-Id` header, and the profile is written to
+PROFILE_DIR, where the admin API serves it for download as pstats data or
+as a text report. Requests without the header pass straight through.
+
+Since Python 3.12 cProfile sees every thread, so the profile covers the
+endpoint running in the threadpool as well as the event loop. It also
+picks up whatever else the process runs meanwhile, which on a quiet
+instance is little. Only one request is profiled at a time; others asking
+meanwhile get `X-Profile-Id: busy` and run normally.
+"""
+import cProfile
+import io
+import os
+import pstats
+import re
+import secrets
+import tempfile
+import threading
+from pathlib import Path
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "aivin-profiles")))
+MAX_STORED_PROFILES = 50
+PROFILE_ID = re.compile(r"^[0-9a-f]{16}$")
+
+_profiling = threading.Lock()
+
+
+def is_profile_id(profile_id: str) -> bool:
+    return bool(PROFILE_ID.match(profile_id))
+
+
+def profile_path(profile_id: str) -> Path:
+    return PROFILE_DIR / f"{profile_id}.pstats"
+
+
+def save_profile(profile_id: str, profiler: cProfile.Profile) -> None:
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(profile_path(profile_id))
+    stored = sorted(PROFILE_DIR.glob("*.pstats"), key=lambda path: path.stat().st_mtime)
+    for old in stored[:-MAX_STORED_PROFILES]:
+        old.unlink(missing_ok=True)
+
+
+def profile_report(profile_id: str, limit: int = 60) -> str:
+    """Text report of a stored profile, heaviest cumulative time first."""
+    out = io.StringIO()
+    stats = pstats.Stats(str(profile_path(profile_id)), stream=out)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+    return out.getvalue()
+
+
+def _profiling_requested(scope: Scope) -> bool:
+    expected = os.getenv("ADMIN_API_KEY")
+    if not expected:
+        return False
+    for name, value in scope["headers"]:
+        if name == PROFILE_HEADER:
+            return secrets.compare_digest(value, expected.encode())
+    return False
+
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not _profiling_requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        if not _profiling.acquire(blocking=False):
+            await self.app(scope, receive, self._with_header(send, "busy"))
+            return
+
+        try:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Some other tool (a debugger, coverage) holds the profiling hook
+                await self.app(scope, receive, self._with_header(send, "busy"))
+                return
+
+            profile_id = secrets.token_hex(8)
+            try:
+                await self.app(scope, receive, self._with_header(send, profile_id))
+            finally:
+                profiler.disable()
+            save_profile(profile_id, profiler)
+        finally:
+            _profiling.release()
+
+    @staticmethod
+    def _with_header(send: Send, value: str) -> Send:
+        async def send_with_header(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Profile-Id", value)
+            await send(message)
+
+        return send_with_header
@@ -4,5 +4,8 @@ from .history import router as history_router
 from .auth import router as auth_router
 from .admin import router as admin_router
 from .notes import router as notes_router
+from .dashboard import router as dashboard_router
+from .events import router as events_router
+from .metrics import router as metrics_router
 
-__all__ = ["tasks_router", "members_router", "history_router", "auth_router", "admin_router", "notes_router"]
+__all__ = ["tasks_router", "members_router", "history_router", "auth_router", "admin_router", "notes_router", "dashboard_router", "events_router", "metrics_router"]
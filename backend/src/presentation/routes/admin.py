@@ -1,10 +1,12 @@
 import os
 
 from fastapi import APIRouter, HTTPException, Header, Depends, status
+from fastapi.responses import FileResponse, PlainTextResponse
 
 from src.application import RegisterUser
 from src.infrastructure import get_database, SQLiteMemberRepository, AuthService
 from ..schemas import CreateUserRequest, UserResponse
+from ..profiling import is_profile_id, profile_path, profile_report
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
@@ -53,3 +55,27 @@ def create_user(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     return UserResponse(id=member.id, name=member.name, email=member.email)
+
+
+@router.get("/profiles/{profile_id}")
+def download_profile(
+    profile_id: str,
+    format: str = "pstats",
+    _: bool = Depends(verify_admin_api_key),
+):
+    """Download a request profile recorded with the X-Profile header (admin only).
+
+    `format=pstats` returns the raw data for pstats or snakeviz; `format=text`
+    a report sorted by cumulative time.
+    """
+    if not is_profile_id(profile_id) or not profile_path(profile_id).exists():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    if format == "text":
+        return PlainTextResponse(profile_report(profile_id))
+    if format != "pstats":
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="format must be pstats or text")
+    return FileResponse(
+        profile_path(profile_id),
+        media_type="application/octet-stream",
+        filename=f"{profile_id}.pstats",
+    )
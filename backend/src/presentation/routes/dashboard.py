@@ -0,0 +1,62 @@
+from fastapi import APIRouter, Depends, Response
+
+from src.domain import HouseholdMember
+from src.application import GetDashboard
+from src.infrastructure import (
+    get_database,
+    SQLiteTaskRepository,
+    SQLiteMemberRepository,
+    SQLiteNoteRepository,
+    task_repository,
+)
+from ..schemas import DashboardResponse
+from ..dependencies import get_current_user, conditional_get
+from ..compression import CompressedRoute
+from ..timing import query_budget
+from ..serialization import task_list_payload, member_payload, note_payload, json_response
+
+router = APIRouter(prefix="/api/dashboard", tags=["dashboard"], route_class=CompressedRoute)
+
+
+def get_task_repo():
+    db = get_database()
+    return task_repository(db)
+
+
+def get_member_repo():
+    db = get_database()
+    return SQLiteMemberRepository(db)
+
+
+def get_note_repo():
+    db = get_database()
+    return SQLiteNoteRepository(db)
+
+
+@router.get("", response_model=DashboardResponse)
+@query_budget(6)
+def get_dashboard(
+    response: Response,
+    days: int = 7,
+    current_user: HouseholdMember = Depends(get_current_user),
+    _: str = Depends(conditional_get),
+    task_repo: SQLiteTaskRepository = Depends(get_task_repo),
+    member_repo: SQLiteMemberRepository = Depends(get_member_repo),
+    note_repo: SQLiteNoteRepository = Depends(get_note_repo),
+):
+    """Tasks, urgent and upcoming task ids, members and the note in one response."""
+    use_case = GetDashboard(task_repo, member_repo, note_repo)
+    with get_database().snapshot():
+        dashboard = use_case.execute(upcoming_days=days)
+
+    member_names = {m.id: m.name for m in dashboard.members}
+    return json_response(
+        {
+            "tasks": task_list_payload(dashboard.tasks, member_names),
+            "urgent_task_ids": [t.task.id for t in dashboard.urgent],
+            "upcoming_task_ids": [t.task.id for t in dashboard.upcoming],
+            "members": [member_payload(m) for m in dashboard.members],
+            "note": note_payload(dashboard.note) if dashboard.note else None,
+        },
+        response,
+    )
@@ -0,0 +1,102 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from src.domain import HouseholdMember, calculate_urgency
+from src.application import ChangeEvent, TaskWithUrgency
+from src.infrastructure import get_database, SQLiteMemberRepository, EventHub, AuthService
+from src.infrastructure.auth import EVENTS_TOKEN_EXPIRE_SECONDS
+from ..schemas import EventsTokenResponse, NoteResponse
+from ..dependencies import get_auth_service, get_current_user, get_events_user, get_event_publisher
+from .tasks import task_with_urgency_to_response, get_member_names
+
+router = APIRouter(prefix="/api/events", tags=["events"])
+
+KEEPALIVE_SECONDS = 15
+
+
+def get_member_repo():
+    db = get_database()
+    return SQLiteMemberRepository(db)
+
+
+def format_event(event: ChangeEvent, member_names: dict[int, str]) -> str:
+    """Render a change event as one Server-Sent Events message."""
+    if event.task is not None:
+        twu = TaskWithUrgency(task=event.task, calculated_urgency=calculate_urgency(event.task))
+        payload = task_with_urgency_to_response(twu, member_names=member_names)
+    else:
+        note = event.note
+        payload = NoteResponse(id=note.id, content=note.content, updated_at=note.updated_at)
+    return f"event: {event.type.value}\ndata: {payload.model_dump_json()}\n\n"
+
+
+async def event_stream(request: Request, hub: EventHub, subscription, member_repo, member_names: dict[int, str]):
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), timeout=KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": keep-alive\n\n"
+                continue
+
+            if event is None:
+                # Evicted for falling behind: events were dropped, so the client must refetch
+                yield "event: resync\ndata: {}\n\n"
+                break
+
+            assigned_to_id = event.task.assigned_to_id if event.task else None
+            if assigned_to_id and assigned_to_id not in member_names:
+                member_names = await run_in_threadpool(get_member_names, member_repo)
+            yield format_event(event, member_names)
+    finally:
+        hub.unsubscribe(subscription)
+
+
+@router.post("/token", response_model=EventsTokenResponse)
+def create_events_token(
+    current_user: HouseholdMember = Depends(get_current_user),
+    auth_service: AuthService = Depends(get_auth_service),
+):
+    """A token for opening the event stream as `GET /api/events?token=...`.
+
+    For EventSource, which can't send an Authorization header. The token
+    only opens the stream and expires within a minute, so fetch a new one
+    each time the stream has to be reopened.
+    """
+    return EventsTokenResponse(
+        token=auth_service.create_events_token(current_user.id),
+        expires_in=EVENTS_TOKEN_EXPIRE_SECONDS,
+    )
+
+
+@router.get("")
+async def stream_events(
+    request: Request,
+    current_user: HouseholdMember = Depends(get_events_user),
+    member_repo: SQLiteMemberRepository = Depends(get_member_repo),
+    hub: EventHub = Depends(get_event_publisher),
+):
+    """Live feed of task and note changes as Server-Sent Events.
+
+    Events carry the full updated task or note, so clients can apply them
+    without refetching. A `resync` event means events were missed.
+    Authenticate with a Bearer header or, from EventSource, with `token`.
+    """
+    # Subscribe before loading member names so no event published meanwhile is lost
+    subscription = hub.subscribe()
+    try:
+        member_names = await run_in_threadpool(get_member_names, member_repo)
+    except Exception:
+        hub.unsubscribe(subscription)
+        raise
+    return StreamingResponse(
+        event_stream(request, hub, subscription, member_repo, member_names),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
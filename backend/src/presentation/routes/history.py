@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
 
 from src.domain import HouseholdMember
 from src.application import GetCompletionHistory
@@ -8,10 +8,17 @@ from src.infrastructure import (
     SQLiteTaskRepository,
     SQLiteMemberRepository,
 )
+from src.infrastructure.repositories import IDS_PER_STATEMENT
 from ..schemas import TaskCompletionResponse
-from ..dependencies import get_current_user
+from ..dependencies import get_current_user, conditional_get, completion_fields
+from ..compression import CompressedRoute
+from ..timing import query_budget
+from ..serialization import completion_payload, list_response, select_fields, MSGPACK_RESPONSES
 
-router = APIRouter(prefix="/api/history", tags=["history"])
+router = APIRouter(prefix="/api/history", tags=["history"], route_class=CompressedRoute)
+
+# A page names at most this many distinct tasks, so their names take one query
+MAX_HISTORY_PAGE = IDS_PER_STATEMENT
 
 
 def get_completion_repo():
@@ -29,10 +36,15 @@ def get_member_repo():
     return SQLiteMemberRepository(db)
 
 
-@router.get("", response_model=list[TaskCompletionResponse])
+@router.get("", response_model=list[TaskCompletionResponse], responses=MSGPACK_RESPONSES)
+@query_budget(5)
 def list_history(
-    limit: int | None = 100,
+    request: Request,
+    response: Response,
+    limit: int = Query(100, ge=1, le=MAX_HISTORY_PAGE, description="Most recent completions to return"),
     current_user: HouseholdMember = Depends(get_current_user),
+    _: str = Depends(conditional_get),
+    fields: tuple[str, ...] | None = Depends(completion_fields),
     completion_repo: SQLiteCompletionRepository = Depends(get_completion_repo),
     task_repo: SQLiteTaskRepository = Depends(get_task_repo),
     member_repo: SQLiteMemberRepository = Depends(get_member_repo),
@@ -40,21 +52,17 @@ def list_history(
     use_case = GetCompletionHistory(completion_repo)
     completions = use_case.execute(limit=limit)
 
-    # Enrich with task and member names
-    result = []
-    for completion in completions:
-        task = task_repo.get_by_id(completion.task_id)
-        member = member_repo.get_by_id(completion.completed_by_id)
-
-        result.append(
-            TaskCompletionResponse(
-                id=completion.id,
-                task_id=completion.task_id,
-                task_name=task.name if task else None,
-                completed_at=completion.completed_at,
-                completed_by_id=completion.completed_by_id,
-                completed_by_name=member.name if member else None,
-            )
-        )
-
-    return result
+    # Enrich with task and member names, loaded once rather than per completion
+    # and only when those fields are requested
+    task_names = {}
+    member_names = {}
+    if completions and (fields is None or "task_name" in fields):
+        task_names = task_repo.get_names(c.task_id for c in completions)
+    if completions and (fields is None or "completed_by_name" in fields):
+        member_names = {member.id: member.name for member in member_repo.get_all()}
+
+    return list_response(
+        select_fields([completion_payload(c, task_names, member_names) for c in completions], fields),
+        request,
+        response,
+    )
@@ -5,7 +5,7 @@ from src.domain import HouseholdMember
 from src.application import CreateMember, GetAllMembers, DeleteMember
 from src.infrastructure import get_database, SQLiteMemberRepository, SQLiteCompletionRepository, SQLiteTaskRepository
 from ..schemas import MemberCreateRequest, MemberResponse
-from ..dependencies import get_current_user
+from ..dependencies import get_current_user, conditional_get
 
 router = APIRouter(prefix="/api/members", tags=["members"])
 
@@ -18,6 +18,7 @@ def get_member_repo():
 @router.get("", response_model=list[MemberResponse])
 def list_members(
     current_user: HouseholdMember = Depends(get_current_user),
+    _: str = Depends(conditional_get),
     member_repo: SQLiteMemberRepository = Depends(get_member_repo),
 ):
     use_case = GetAllMembers(member_repo)
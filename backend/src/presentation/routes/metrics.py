@@ -0,0 +1,33 @@
+import os
+import secrets
+
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+
+from ..metrics import journal_state, render_metrics
+
+router = APIRouter(tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def verify_metrics_token(authorization: str | None) -> None:
+    """When METRICS_TOKEN is set, scrapers must send it as a bearer token."""
+    expected = os.getenv("METRICS_TOKEN")
+    if not expected:
+        return
+    if not authorization or not secrets.compare_digest(authorization, f"Bearer {expected}"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics(authorization: str | None = Header(None)):
+    # async so it runs on the event loop, the only thread that updates request metrics
+    verify_metrics_token(authorization)
+    journal = await run_in_threadpool(journal_state)
+    return PlainTextResponse(render_metrics(journal=journal), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -2,9 +2,9 @@ from fastapi import APIRouter, Depends, HTTPException
 
 from src.domain import HouseholdMember
 from src.application import GetNote, UpdateNote
-from src.infrastructure import get_database, SQLiteNoteRepository
+from src.infrastructure import get_database, SQLiteNoteRepository, EventHub
 from ..schemas import NoteUpdateRequest, NoteResponse
-from ..dependencies import get_current_user
+from ..dependencies import get_current_user, conditional_get, get_event_publisher
 
 router = APIRouter(prefix="/api/notes", tags=["notes"])
 
@@ -17,6 +17,7 @@ def get_note_repo():
 @router.get("", response_model=NoteResponse)
 def get_note(
     current_user: HouseholdMember = Depends(get_current_user),
+    _: str = Depends(conditional_get),
     note_repo: SQLiteNoteRepository = Depends(get_note_repo),
 ):
     use_case = GetNote(note_repo)
@@ -35,8 +36,9 @@ def update_note(
     request: NoteUpdateRequest,
     current_user: HouseholdMember = Depends(get_current_user),
     note_repo: SQLiteNoteRepository = Depends(get_note_repo),
+    publisher: EventHub = Depends(get_event_publisher),
 ):
-    use_case = UpdateNote(note_repo)
+    use_case = UpdateNote(note_repo, publisher)
     note = use_case.execute(content=request.content)
     return NoteResponse(
         id=note.id,
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 
 from src.domain import RecurrencePattern, HouseholdMember
 from src.application import (
@@ -6,6 +6,7 @@ from src.application import (
     UpdateTask,
     CompleteTask,
     GetAllTasks,
+    GetTaskChanges,
     GetUrgentTasks,
     GetUpcomingTasks,
     DeactivateTask,
@@ -16,22 +17,54 @@ from src.infrastructure import (
     SQLiteTaskRepository,
     SQLiteCompletionRepository,
     SQLiteMemberRepository,
+    SQLiteChangeVersionRepository,
+    SQLiteCompletionJournal,
+    EventHub,
+    get_completion_journal,
+    task_repository,
 )
 from ..schemas import (
     TaskCreateRequest,
     TaskUpdateRequest,
     TaskResponse,
+    TaskChangesResponse,
     CompleteTaskRequest,
     RecurrencePatternSchema,
 )
-from ..dependencies import get_current_user
+from ..dependencies import get_current_user, conditional_get, get_event_publisher, task_fields
+from ..compression import CompressedRoute
+from ..timing import query_budget
+from ..serialization import task_list_payload, list_response, MSGPACK_RESPONSES
 
-router = APIRouter(prefix="/api/tasks", tags=["tasks"])
+router = APIRouter(prefix="/api/tasks", tags=["tasks"], route_class=CompressedRoute)
+
+# Task columns needed per response field beyond the ones always read
+TASK_FIELD_COLUMNS = {
+    "name": ("name",),
+    "recurrence": ("time_of_day",),
+    "last_completed": ("last_completed",),
+    "assigned_to_id": ("assigned_to_id",),
+    "assigned_to_name": ("assigned_to_id",),
+    "description": ("description",),
+}
 
 
 def get_task_repo():
     db = get_database()
-    return SQLiteTaskRepository(db)
+    return task_repository(db)
+
+
+def get_task_read_repo(fields: tuple[str, ...] | None = Depends(task_fields)):
+    """Task repository that reads only the columns the requested fields need."""
+    db = get_database()
+    if fields is None:
+        return task_repository(db)
+    columns = {column for field in fields for column in TASK_FIELD_COLUMNS.get(field, ())}
+    return task_repository(db, columns=columns)
+
+
+def wants_member_names(fields: tuple[str, ...] | None) -> bool:
+    return fields is None or "assigned_to_name" in fields
 
 
 def get_completion_repo():
@@ -44,13 +77,26 @@ def get_member_repo():
     return SQLiteMemberRepository(db)
 
 
+def get_version_repo():
+    db = get_database()
+    return SQLiteChangeVersionRepository(db)
+
+
+def get_member_names(member_repo: SQLiteMemberRepository) -> dict[int, str]:
+    """Load all member names at once so task lists don't look up assignees one by one."""
+    return {member.id: member.name for member in member_repo.get_all()}
+
+
 def task_with_urgency_to_response(
     twu: TaskWithUrgency,
     member_repo: SQLiteMemberRepository | None = None,
+    member_names: dict[int, str] | None = None,
 ) -> TaskResponse:
     task = twu.task
     assigned_to_name = None
-    if task.assigned_to_id and member_repo:
+    if task.assigned_to_id and member_names is not None:
+        assigned_to_name = member_names.get(task.assigned_to_id)
+    elif task.assigned_to_id and member_repo:
         member = member_repo.get_by_id(task.assigned_to_id)
         if member:
             assigned_to_name = member.name
@@ -76,49 +122,96 @@ def task_with_urgency_to_response(
     )
 
 
-@router.get("", response_model=list[TaskResponse])
+@router.get("", response_model=list[TaskResponse] | TaskChangesResponse, responses=MSGPACK_RESPONSES)
+@query_budget(6)
 def list_tasks(
+    request: Request,
+    response: Response,
     active_only: bool = True,
+    since: int | None = None,
     current_user: HouseholdMember = Depends(get_current_user),
-    task_repo: SQLiteTaskRepository = Depends(get_task_repo),
+    _: str = Depends(conditional_get),
+    fields: tuple[str, ...] | None = Depends(task_fields),
+    task_repo: SQLiteTaskRepository = Depends(get_task_read_repo),
     member_repo: SQLiteMemberRepository = Depends(get_member_repo),
+    version_repo: SQLiteChangeVersionRepository = Depends(get_version_repo),
 ):
-    from src.domain import auto_advance_due_date
-
-    use_case = GetAllTasks(task_repo)
-    tasks = use_case.execute(active_only=active_only)
-
-    # Auto-advance overdue autocomplete tasks
-    for twu in tasks:
-        new_due = auto_advance_due_date(twu.task)
-        if new_due:
-            twu.task.next_due = new_due
-            task_repo.save(twu.task)
-
-    return [task_with_urgency_to_response(t, member_repo) for t in tasks]
+    """List tasks, or with `since` only the tasks changed after that change version.
 
+    The full list carries the current change version in the X-Change-Version
+    header; pass it back as `since` to receive only later changes. `fields`
+    narrows each task to the given comma-separated fields.
+    """
+    from src.domain import auto_advance_due_date
 
-@router.get("/urgent", response_model=list[TaskResponse])
+    with get_database().snapshot():
+        if since is not None:
+            changes = GetTaskChanges(task_repo, version_repo).execute(since=since, active_only=active_only)
+            member_names = get_member_names(member_repo) if changes.tasks and wants_member_names(fields) else {}
+            return list_response(
+                {
+                    "version": changes.version,
+                    "tasks": task_list_payload(changes.tasks, member_names, fields),
+                    "deleted_ids": changes.deleted_ids,
+                },
+                request,
+                response,
+            )
+
+        # Read the version before the tasks, as GetTaskChanges does, so a write
+        # that lands during the scan is sent again rather than skipped
+        version = version_repo.get_version()
+        use_case = GetAllTasks(task_repo)
+        tasks = use_case.execute(active_only=active_only)
+
+        # Auto-advance overdue autocomplete tasks
+        advanced = {}
+        for twu in tasks:
+            new_due = auto_advance_due_date(twu.task)
+            if new_due:
+                twu.task.next_due = new_due
+                advanced[twu.task.id] = new_due
+        task_repo.update_next_due_dates(advanced)
+
+        response.headers["X-Change-Version"] = str(version)
+        member_names = get_member_names(member_repo) if wants_member_names(fields) else {}
+
+    return list_response(task_list_payload(tasks, member_names, fields), request, response)
+
+
+@router.get("/urgent", response_model=list[TaskResponse], responses=MSGPACK_RESPONSES)
+@query_budget(4)
 def list_urgent_tasks(
+    request: Request,
+    response: Response,
     current_user: HouseholdMember = Depends(get_current_user),
-    task_repo: SQLiteTaskRepository = Depends(get_task_repo),
+    _: str = Depends(conditional_get),
+    fields: tuple[str, ...] | None = Depends(task_fields),
+    task_repo: SQLiteTaskRepository = Depends(get_task_read_repo),
     member_repo: SQLiteMemberRepository = Depends(get_member_repo),
 ):
     use_case = GetUrgentTasks(task_repo)
     tasks = use_case.execute()
-    return [task_with_urgency_to_response(t, member_repo) for t in tasks]
+    member_names = get_member_names(member_repo) if wants_member_names(fields) else {}
+    return list_response(task_list_payload(tasks, member_names, fields), request, response)
 
 
-@router.get("/upcoming", response_model=list[TaskResponse])
+@router.get("/upcoming", response_model=list[TaskResponse], responses=MSGPACK_RESPONSES)
+@query_budget(4)
 def list_upcoming_tasks(
+    request: Request,
+    response: Response,
     days: int = 7,
     current_user: HouseholdMember = Depends(get_current_user),
-    task_repo: SQLiteTaskRepository = Depends(get_task_repo),
+    _: str = Depends(conditional_get),
+    fields: tuple[str, ...] | None = Depends(task_fields),
+    task_repo: SQLiteTaskRepository = Depends(get_task_read_repo),
     member_repo: SQLiteMemberRepository = Depends(get_member_repo),
 ):
     use_case = GetUpcomingTasks(task_repo)
     tasks = use_case.execute(days=days)
-    return [task_with_urgency_to_response(t, member_repo) for t in tasks]
+    member_names = get_member_names(member_repo) if wants_member_names(fields) else {}
+    return list_response(task_list_payload(tasks, member_names, fields), request, response)
 
 
 @router.post("", response_model=TaskResponse, status_code=201)
@@ -127,6 +220,7 @@ def create_task(
     current_user: HouseholdMember = Depends(get_current_user),
     task_repo: SQLiteTaskRepository = Depends(get_task_repo),
     member_repo: SQLiteMemberRepository = Depends(get_member_repo),
+    publisher: EventHub = Depends(get_event_publisher),
 ):
     recurrence = RecurrencePattern(
         type=request.recurrence.type,
@@ -135,7 +229,7 @@ def create_task(
         time_of_day=request.recurrence.time_of_day,
     )
 
-    use_case = CreateTask(task_repo)
+    use_case = CreateTask(task_repo, publisher)
     task = use_case.execute(
         name=request.name,
         recurrence=recurrence,
@@ -159,6 +253,7 @@ def update_task(
     current_user: HouseholdMember = Depends(get_current_user),
     task_repo: SQLiteTaskRepository = Depends(get_task_repo),
     member_repo: SQLiteMemberRepository = Depends(get_member_repo),
+    publisher: EventHub = Depends(get_event_publisher),
 ):
     recurrence = None
     if request.recurrence:
@@ -176,7 +271,7 @@ def update_task(
     autocomplete = ... if "autocomplete" not in request.model_fields_set else request.autocomplete
     description = ... if "description" not in request.model_fields_set else request.description
 
-    use_case = UpdateTask(task_repo)
+    use_case = UpdateTask(task_repo, publisher)
     task = use_case.execute(
         task_id=task_id,
         name=request.name,
@@ -206,8 +301,10 @@ def complete_task(
     task_repo: SQLiteTaskRepository = Depends(get_task_repo),
     completion_repo: SQLiteCompletionRepository = Depends(get_completion_repo),
     member_repo: SQLiteMemberRepository = Depends(get_member_repo),
+    publisher: EventHub = Depends(get_event_publisher),
+    journal: SQLiteCompletionJournal | None = Depends(get_completion_journal),
 ):
-    use_case = CompleteTask(task_repo, completion_repo)
+    use_case = CompleteTask(task_repo, completion_repo, publisher, journal)
     member_id = request.member_id if request else None
     result = use_case.execute(task_id=task_id, member_id=member_id)
 
@@ -226,8 +323,9 @@ def delete_task(
     task_id: int,
     current_user: HouseholdMember = Depends(get_current_user),
     task_repo: SQLiteTaskRepository = Depends(get_task_repo),
+    publisher: EventHub = Depends(get_event_publisher),
 ):
-    use_case = DeactivateTask(task_repo)
+    use_case = DeactivateTask(task_repo, publisher)
     success = use_case.execute(task_id=task_id)
     if not success:
         raise HTTPException(status_code=404, detail="Task not found")
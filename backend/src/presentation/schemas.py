@@ -50,6 +50,12 @@ class TaskResponse(BaseModel):
     description: str | None
 
 
+class TaskChangesResponse(BaseModel):
+    version: int
+    tasks: list[TaskResponse]
+    deleted_ids: list[int]
+
+
 class CompleteTaskRequest(BaseModel):
     member_id: int | None = None
 
@@ -96,6 +102,11 @@ class AuthResponse(BaseModel):
     token_type: str = "bearer"
 
 
+class EventsTokenResponse(BaseModel):
+    token: str
+    expires_in: int  # seconds
+
+
 # Admin schemas
 class CreateUserRequest(BaseModel):
     name: str
@@ -112,3 +123,12 @@ class NoteResponse(BaseModel):
     id: int
     content: str
     updated_at: datetime
+
+
+# Dashboard schemas
+class DashboardResponse(BaseModel):
+    tasks: list[TaskResponse]
+    urgent_task_ids: list[int]
+    upcoming_task_ids: list[int]
+    members: list[MemberResponse]
+    note: NoteResponse | None
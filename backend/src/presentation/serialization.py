@@ -0,0 +1,147 @@
+"""Fast rendering for list endpoints.
+
+List endpoints build plain dicts straight from the domain dataclasses and
+encode them with pydantic-core's Rust serializer. That skips constructing a
+TaskResponse per task and FastAPI validating the list against
+`response_model` a second time. Routes keep their `response_model` so the
+OpenAPI schema is unchanged; tests check both paths render the same JSON.
+
+With a `fields` selection only those keys are rendered, in the usual order.
+
+List endpoints also answer in MessagePack when the client sends
+`Accept: application/msgpack` and the optional `msgpack` package is installed.
+"""
+from fastapi import Request, Response
+from pydantic_core import to_json, to_jsonable_python
+
+from src.domain import HouseholdMember, Note, TaskCompletion
+from src.application import TaskWithUrgency
+from .timing import timed
+
+try:
+    import msgpack
+except ImportError:  # optional dependency
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# OpenAPI description of the extra content type on negotiated list endpoints
+MSGPACK_RESPONSES = {200: {"content": {MSGPACK_MEDIA_TYPE: {}}}}
+
+TASK_FIELDS = (
+    "id",
+    "name",
+    "recurrence",
+    "urgency_label",
+    "calculated_urgency",
+    "last_completed",
+    "next_due",
+    "is_active",
+    "assigned_to_id",
+    "assigned_to_name",
+    "autocomplete",
+    "description",
+)
+COMPLETION_FIELDS = ("id", "task_id", "task_name", "completed_at", "completed_by_id", "completed_by_name")
+
+
+def task_payload(twu: TaskWithUrgency, member_names: dict[int, str]) -> dict:
+    """Same fields, order and encoding as TaskResponse."""
+    task = twu.task
+    recurrence = task.recurrence
+    return {
+        "id": task.id,
+        "name": task.name,
+        "recurrence": {
+            "type": recurrence.type,
+            "days": list(recurrence.days) if recurrence.days else None,
+            "interval": recurrence.interval,
+            "time_of_day": recurrence.time_of_day,
+        },
+        "urgency_label": task.urgency_label,
+        "calculated_urgency": twu.calculated_urgency,
+        "last_completed": task.last_completed,
+        "next_due": task.next_due,
+        "is_active": task.is_active,
+        "assigned_to_id": task.assigned_to_id,
+        "assigned_to_name": member_names.get(task.assigned_to_id) if task.assigned_to_id else None,
+        "autocomplete": task.autocomplete,
+        "description": task.description,
+    }
+
+
+def select_fields(payloads: list[dict], fields: tuple[str, ...] | None) -> list[dict]:
+    if fields is None:
+        return payloads
+    return [{name: payload[name] for name in fields} for payload in payloads]
+
+
+def task_list_payload(
+    tasks: list[TaskWithUrgency],
+    member_names: dict[int, str],
+    fields: tuple[str, ...] | None = None,
+) -> list[dict]:
+    return select_fields([task_payload(twu, member_names) for twu in tasks], fields)
+
+
+def member_payload(member: HouseholdMember) -> dict:
+    return {"id": member.id, "name": member.name}
+
+
+def note_payload(note: Note) -> dict:
+    return {"id": note.id, "content": note.content, "updated_at": note.updated_at}
+
+
+def completion_payload(
+    completion: TaskCompletion,
+    task_names: dict[int, str],
+    member_names: dict[int, str],
+) -> dict:
+    """Same fields, order and encoding as TaskCompletionResponse."""
+    return {
+        "id": completion.id,
+        "task_id": completion.task_id,
+        "task_name": task_names.get(completion.task_id),
+        "completed_at": completion.completed_at,
+        "completed_by_id": completion.completed_by_id,
+        "completed_by_name": member_names.get(completion.completed_by_id),
+    }
+
+
+def carry_headers(result: Response, response: Response | None) -> Response:
+    """Copy the headers set on the injected `response` (ETag, X-Change-Version, ...) to `result`.
+
+    FastAPI ignores them when a Response is returned. Raw headers are copied,
+    so repeated ones (Set-Cookie, Vary) all survive.
+    """
+    if response is not None:
+        result.raw_headers.extend(
+            (name, value)
+            for name, value in response.raw_headers
+            if name not in (b"content-length", b"content-type")
+        )
+    return result
+
+
+def json_response(content, response: Response | None = None) -> Response:
+    """Encode content to JSON bytes without validation, keeping `response`'s headers."""
+    with timed("serialize"):
+        body = to_json(content)
+    return carry_headers(Response(content=body, media_type="application/json"), response)
+
+
+def wants_msgpack(request: Request) -> bool:
+    accept = request.headers.get("accept", "")
+    return msgpack is not None and (MSGPACK_MEDIA_TYPE in accept or "application/x-msgpack" in accept)
+
+
+def list_response(content, request: Request, response: Response | None = None) -> Response:
+    """JSON, or MessagePack when the client asks for it in Accept."""
+    if wants_msgpack(request):
+        with timed("serialize"):
+            body = msgpack.packb(to_jsonable_python(content))
+        result = carry_headers(Response(content=body, media_type=MSGPACK_MEDIA_TYPE), response)
+    else:
+        result = json_response(content, response)
+    result.headers.append("Vary", "Accept")
+    return result
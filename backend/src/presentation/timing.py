@@ -0,0 +1,105 @@
+"""Per-request timing breakdown for the Server-Timing header, and query budgets.
+
+RequestTimingMiddleware opens a RequestTiming for every HTTP request. Code on
+the request path wraps its phases in `timed("auth")`, `timed("serialize")`
+and so on; database time and the query count come from the infrastructure
+query tracking. Whatever is left of the total is reported as `app`: domain
+logic, validation and framework overhead.
+
+Routes declare how many queries they may run with `@query_budget(n)` (others
+get DEFAULT_QUERY_BUDGET). When budgets are enforced, a request that runs
+more queries fails with QueryBudgetExceeded instead of quietly regressing
+into an N+1. Enforcement is on under pytest and wherever
+QUERY_BUDGET_ENFORCE=1 is set (local development); QUERY_BUDGET_ENFORCE=0
+turns it off.
+"""
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from src.infrastructure import RequestQueries
+
+DEFAULT_QUERY_BUDGET = 6
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+@dataclass
+class RequestTiming:
+    queries: RequestQueries
+    started: float = field(default_factory=time.perf_counter)
+    # phase -> seconds, and the part of those seconds spent in the database
+    phases: dict[str, float] = field(default_factory=dict)
+    phase_db: dict[str, float] = field(default_factory=dict)
+
+    def server_timing(self) -> str:
+        total = time.perf_counter() - self.started
+        db = self.queries.total_seconds
+        entries = [f'db;dur={db * 1000:.1f};desc="{self.queries.count} queries"']
+        own_time = 0.0
+        for phase, seconds in self.phases.items():
+            entries.append(f"{phase};dur={seconds * 1000:.1f}")
+            own_time += seconds - self.phase_db.get(phase, 0.0)
+        app = max(total - db - own_time, 0.0)
+        entries.append(f"app;dur={app * 1000:.1f}")
+        entries.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(entries)
+
+
+_request_timing: ContextVar[RequestTiming | None] = ContextVar("request_timing", default=None)
+
+
+@contextmanager
+def track_timing(queries: RequestQueries):
+    timing = RequestTiming(queries)
+    token = _request_timing.set(timing)
+    try:
+        yield timing
+    finally:
+        _request_timing.reset(token)
+
+
+@contextmanager
+def timed(phase: str):
+    """Add the block's duration to a Server-Timing phase. No-op outside a request."""
+    timing = _request_timing.get()
+    if timing is None:
+        yield
+        return
+    started = time.perf_counter()
+    db_before = timing.queries.total_seconds
+    try:
+        yield
+    finally:
+        timing.phases[phase] = timing.phases.get(phase, 0.0) + time.perf_counter() - started
+        timing.phase_db[phase] = timing.phase_db.get(phase, 0.0) + timing.queries.total_seconds - db_before
+
+
+def query_budget(max_queries: int):
+    """Declare the most queries a route may run per request."""
+    def decorator(endpoint):
+        endpoint.query_budget = max_queries
+        return endpoint
+    return decorator
+
+
+def budgets_enforced() -> bool:
+    setting = os.getenv("QUERY_BUDGET_ENFORCE")
+    if setting is not None:
+        return setting == "1"
+    return bool(os.getenv("PYTEST_CURRENT_TEST"))
+
+
+def check_query_budget(route, method: str, count: int) -> None:
+    if route is None or not budgets_enforced():
+        return
+    budget = getattr(getattr(route, "endpoint", None), "query_budget", DEFAULT_QUERY_BUDGET)
+    if count > budget:
+        raise QueryBudgetExceeded(
+            f"{method} {route.path} ran {count} queries, its budget is {budget}. "
+            "Batch the lookups or raise the budget with @query_budget."
+        )
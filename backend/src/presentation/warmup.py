@@ -0,0 +1,105 @@
+"""Cold-start warm-up and the startup report.
+
+The host idles the app out, so the first request after a wake-up pays for
+starting the process. Modules most requests don't need are imported on first
+use, and lifespan starts `warm_up` in a background thread: it opens a
+database connection (on Turso a TLS handshake and a Hrana stream, kept in
+the pool), loads the JWT library and builds the OpenAPI schema. Uvicorn
+accepts requests without waiting for it; a request that comes first does the
+same work itself.
+
+The startup report holds how long importing the app took, each warm-up
+step, and when the first request was answered. It is logged and exported on
+/metrics. `python -m bench.startup` measures a cold process from outside.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from fastapi import FastAPI
+
+from src.infrastructure import AuthService, get_database
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StartupReport:
+    """Cold-start timings in seconds. `started` is a perf_counter reading."""
+    started: float = field(default_factory=time.perf_counter)
+    import_seconds: float | None = None
+    steps: dict[str, float] = field(default_factory=dict)  # warm-up step -> seconds
+    first_request_at: float | None = None  # since started
+    first_request_seconds: float | None = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def imported(self, started: float) -> None:
+        """Importing the app, begun at `started`, is done; later timings count from there too."""
+        self.started = started
+        self.import_seconds = time.perf_counter() - started
+
+    @contextmanager
+    def step(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps[name] = time.perf_counter() - started
+
+    def observe_request(self, seconds: float) -> None:
+        """Note the first request, given its duration. Cheap after the first call."""
+        if self.first_request_at is not None:
+            return
+        with self._lock:
+            if self.first_request_at is not None:
+                return
+            self.first_request_at = time.perf_counter() - self.started
+            self.first_request_seconds = seconds
+        logger.info(
+            "First request answered %.0f ms after start; it took %.0f ms",
+            self.first_request_at * 1000,
+            seconds * 1000,
+        )
+
+    def phases(self) -> dict[str, float]:
+        """Everything measured so far, by phase name."""
+        phases = {}
+        if self.import_seconds is not None:
+            phases["import"] = self.import_seconds
+        phases.update({f"warm_up_{name}": seconds for name, seconds in self.steps.items()})
+        if self.first_request_at is not None:
+            phases["first_request_at"] = self.first_request_at
+            phases["first_request"] = self.first_request_seconds
+        return phases
+
+
+startup_report = StartupReport()
+
+
+def warm_up(app: FastAPI, report: StartupReport = startup_report) -> None:
+    """Do the one-off work the first requests would otherwise wait for."""
+    steps = (
+        ("database", lambda: get_database().execute("SELECT 1")),
+        ("auth", lambda: AuthService().decode_token("warm-up")),
+        ("openapi", app.openapi),
+    )
+    started = time.perf_counter()
+    for name, run in steps:
+        try:
+            with report.step(name):
+                run()
+        except Exception:
+            logger.exception("Warm-up step %s failed", name)
+    logger.info(
+        "Warm-up done in %.0f ms (%s)",
+        (time.perf_counter() - started) * 1000,
+        ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in report.steps.items()),
+    )
+
+
+def start_warm_up(app: FastAPI) -> threading.Thread:
+    thread = threading.Thread(target=warm_up, args=(app,), name="warm-up", daemon=True)
+    thread.start()
+    return thread
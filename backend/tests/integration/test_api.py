@@ -10,8 +10,19 @@ from alembic.config import Config
 from alembic import command
 from fastapi.testclient import TestClient
 
-from src.infrastructure import Database, set_database
+from src.infrastructure import (
+    Database,
+    SQLiteCompletionJournal,
+    SQLiteMemberRepository,
+    SQLiteTaskRepository,
+    completion_journal,
+    get_database,
+    get_query_stats,
+    query_stats,
+    set_database,
+)
 from src.presentation.main import app
+from src.presentation.warmup import StartupReport, warm_up
 
 # Test admin API key
 TEST_ADMIN_API_KEY = "test-admin-api-key"
@@ -200,6 +211,292 @@ class TestTaskEndpoints:
         assert all(t["calculated_urgency"] == "high" for t in data)
 
 
+class TestTaskDeltaSync:
+    def test_full_list_returns_change_version(self, client, auth_headers):
+        response = client.get("/api/tasks", headers=auth_headers)
+        assert response.status_code == 200
+        assert int(response.headers["X-Change-Version"]) > 0
+
+    def test_since_returns_only_changed_tasks(self, client, auth_headers):
+        kept = client.post(
+            "/api/tasks", json={"name": "Unchanged", "recurrence": {"type": "daily"}}, headers=auth_headers
+        ).json()["id"]
+        edited = client.post(
+            "/api/tasks", json={"name": "Edited", "recurrence": {"type": "daily"}}, headers=auth_headers
+        ).json()["id"]
+        removed = client.post(
+            "/api/tasks", json={"name": "Removed", "recurrence": {"type": "daily"}}, headers=auth_headers
+        ).json()["id"]
+        version = int(client.get("/api/tasks", headers=auth_headers).headers["X-Change-Version"])
+
+        client.put(f"/api/tasks/{edited}", json={"name": "Edited again"}, headers=auth_headers)
+        client.delete(f"/api/tasks/{removed}", headers=auth_headers)
+
+        response = client.get(f"/api/tasks?since={version}", headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert [t["id"] for t in data["tasks"]] == [edited]
+        assert data["tasks"][0]["name"] == "Edited again"
+        assert data["deleted_ids"] == [removed]
+        assert data["version"] > version
+        assert kept not in data["deleted_ids"]
+
+    def test_since_current_version_is_empty(self, client, auth_headers):
+        client.post("/api/tasks", json={"name": "Task", "recurrence": {"type": "daily"}}, headers=auth_headers)
+        version = int(client.get("/api/tasks", headers=auth_headers).headers["X-Change-Version"])
+
+        data = client.get(f"/api/tasks?since={version}", headers=auth_headers).json()
+        assert data == {"version": version, "tasks": [], "deleted_ids": []}
+
+    def test_since_zero_returns_everything(self, client, auth_headers):
+        client.post("/api/tasks", json={"name": "Task", "recurrence": {"type": "daily"}}, headers=auth_headers)
+
+        data = client.get("/api/tasks?since=0", headers=auth_headers).json()
+        assert [t["name"] for t in data["tasks"]] == ["Task"]
+
+    def test_completion_and_note_writes_bump_version(self, client, auth_headers):
+        task_id = client.post(
+            "/api/tasks", json={"name": "Task", "recurrence": {"type": "daily"}}, headers=auth_headers
+        ).json()["id"]
+        version = int(client.get("/api/tasks", headers=auth_headers).headers["X-Change-Version"])
+
+        client.put("/api/notes", json={"content": "Note"}, headers=auth_headers)
+        after_note = int(client.get("/api/tasks", headers=auth_headers).headers["X-Change-Version"])
+        client.post(f"/api/tasks/{task_id}/complete", headers=auth_headers)
+        after_complete = int(client.get("/api/tasks", headers=auth_headers).headers["X-Change-Version"])
+
+        assert version < after_note < after_complete
+
+    def test_write_during_full_list_is_in_next_delta(self, client, auth_headers):
+        task_id = client.post(
+            "/api/tasks", json={"name": "Before", "recurrence": {"type": "daily"}}, headers=auth_headers
+        ).json()["id"]
+        get_all = SQLiteTaskRepository.get_all
+
+        def get_all_then_rename(repo, *args, **kwargs):
+            tasks = get_all(repo, *args, **kwargs)
+            get_database().execute("UPDATE tasks SET name = 'After' WHERE id = ?", (task_id,))
+            return tasks
+
+        with patch.object(SQLiteTaskRepository, "get_all", get_all_then_rename):
+            response = client.get("/api/tasks", headers=auth_headers)
+        assert [t["name"] for t in response.json()] == ["Before"]
+
+        version = int(response.headers["X-Change-Version"])
+        data = client.get(f"/api/tasks?since={version}", headers=auth_headers).json()
+        assert [t["name"] for t in data["tasks"]] == ["After"]
+
+    def test_member_rename_is_in_next_delta(self, client, auth_headers):
+        member = client.post("/api/members", json={"name": "John"}, headers=auth_headers).json()
+        task_id = client.post(
+            "/api/tasks",
+            json={"name": "Task", "recurrence": {"type": "daily"}, "assigned_to_id": member["id"]},
+            headers=auth_headers,
+        ).json()["id"]
+        version = int(client.get("/api/tasks", headers=auth_headers).headers["X-Change-Version"])
+
+        repo = SQLiteMemberRepository(get_database())
+        renamed = repo.get_by_id(member["id"])
+        renamed.name = "Johnny"
+        repo.save(renamed)
+
+        data = client.get(f"/api/tasks?since={version}", headers=auth_headers).json()
+        assert [(t["id"], t["assigned_to_name"]) for t in data["tasks"]] == [(task_id, "Johnny")]
+
+
+class TestConditionalGet:
+    @pytest.mark.parametrize("path", ["/api/tasks", "/api/members", "/api/notes", "/api/history", "/api/dashboard"])
+    def test_matching_etag_returns_not_modified(self, client, auth_headers, path):
+        first = client.get(path, headers=auth_headers)
+        assert first.status_code == 200
+        etag = first.headers["ETag"]
+
+        second = client.get(path, headers={**auth_headers, "If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["ETag"] == etag
+
+    def test_not_modified_skips_the_query(self, client, auth_headers):
+        etag = client.get("/api/tasks", headers=auth_headers).headers["ETag"]
+
+        with patch("src.infrastructure.SQLiteTaskRepository.get_all", side_effect=AssertionError("queried")):
+            response = client.get("/api/tasks", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == 304
+
+    def test_write_changes_etag(self, client, auth_headers):
+        etag = client.get("/api/tasks", headers=auth_headers).headers["ETag"]
+        client.post("/api/tasks", json={"name": "New", "recurrence": {"type": "daily"}}, headers=auth_headers)
+
+        response = client.get("/api/tasks", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert [t["name"] for t in response.json()] == ["New"]
+
+    def test_etag_check_reads_the_version_uncached(self, client, auth_headers):
+        etag = client.get("/api/tasks", headers=auth_headers).headers["ETag"]
+        version = int(client.get("/api/tasks", headers=auth_headers).headers["X-Change-Version"])
+        client.post("/api/tasks", json={"name": "New", "recurrence": {"type": "daily"}}, headers=auth_headers)
+
+        # As if the cached version hadn't heard of the write yet
+        with patch("src.infrastructure.SQLiteChangeVersionRepository.get_version", return_value=version):
+            response = client.get("/api/tasks", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == 200
+
+    def test_etag_depends_on_query(self, client, auth_headers):
+        active = client.get("/api/tasks", headers=auth_headers).headers["ETag"]
+        all_tasks = client.get("/api/tasks?active_only=false", headers=auth_headers).headers["ETag"]
+        assert active != all_tasks
+
+    def test_unauthenticated_request_is_rejected_before_etag_check(self, client, auth_headers):
+        etag = client.get("/api/members", headers=auth_headers).headers["ETag"]
+
+        response = client.get("/api/members", headers={"If-None-Match": etag})
+        assert response.status_code == 401
+
+
+class TestResponseEncoding:
+    @pytest.fixture
+    def many_tasks(self, client, auth_headers):
+        for i in range(20):
+            client.post(
+                "/api/tasks",
+                json={"name": f"Task {i}", "recurrence": {"type": "daily"}, "description": "Some details"},
+                headers=auth_headers,
+            )
+
+    def test_large_task_list_is_gzipped(self, client, auth_headers, many_tasks):
+        response = client.get("/api/tasks", headers={**auth_headers, "Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["Vary"]
+        assert len(response.json()) == 20
+
+    def test_brotli_preferred_when_accepted(self, client, auth_headers, many_tasks):
+        pytest.importorskip("brotli")
+        response = client.get("/api/tasks", headers={**auth_headers, "Accept-Encoding": "gzip, br"})
+        assert response.headers["Content-Encoding"] == "br"
+        assert len(response.json()) == 20
+
+    def test_small_responses_are_not_compressed(self, client, auth_headers):
+        response = client.get("/api/tasks", headers={**auth_headers, "Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in response.headers
+
+    def test_routes_without_opt_in_are_not_compressed(self, client, auth_headers, many_tasks):
+        for i in range(50):
+            client.post("/api/members", json={"name": f"Member {i}"}, headers=auth_headers)
+        response = client.get("/api/members", headers={**auth_headers, "Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in response.headers
+
+    def test_compressed_etag_revalidates(self, client, auth_headers, many_tasks):
+        headers = {**auth_headers, "Accept-Encoding": "gzip"}
+        etag = client.get("/api/tasks", headers=headers).headers["ETag"]
+        assert etag.endswith('-gzip"')
+
+        response = client.get("/api/tasks", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert "Accept-Encoding" in response.headers["Vary"]
+
+        identity = client.get("/api/tasks", headers={**auth_headers, "Accept-Encoding": "identity", "If-None-Match": etag})
+        assert identity.status_code == 304
+        assert identity.headers["ETag"] == etag.replace("-gzip", "")
+
+    @pytest.mark.parametrize("path", ["/api/tasks", "/api/tasks/urgent", "/api/history"])
+    def test_msgpack_negotiation(self, client, auth_headers, path):
+        msgpack = pytest.importorskip("msgpack")
+        task_id = client.post(
+            "/api/tasks",
+            json={"name": "Packed", "recurrence": {"type": "daily"}, "next_due": str(date.today())},
+            headers=auth_headers,
+        ).json()["id"]
+        client.post(f"/api/tasks/{task_id}/complete", headers=auth_headers)
+        client.put(f"/api/tasks/{task_id}", json={"next_due": str(date.today())}, headers=auth_headers)
+
+        as_json = client.get(path, headers=auth_headers)
+        as_msgpack = client.get(path, headers={**auth_headers, "Accept": "application/msgpack"})
+
+        assert as_msgpack.headers["Content-Type"] == "application/msgpack"
+        assert msgpack.unpackb(as_msgpack.content) == as_json.json()
+        assert as_msgpack.headers["ETag"] != as_json.headers["ETag"]
+
+
+class TestSparseFieldsets:
+    @pytest.fixture
+    def task_id(self, client, auth_headers):
+        response = client.post(
+            "/api/tasks",
+            json={
+                "name": "Dishes",
+                "recurrence": {"type": "daily"},
+                "next_due": str(date.today()),
+                "description": "Long description",
+            },
+            headers=auth_headers,
+        )
+        return response.json()["id"]
+
+    @pytest.mark.parametrize("path", ["/api/tasks", "/api/tasks/urgent", "/api/tasks/upcoming"])
+    def test_task_lists_return_only_requested_fields(self, client, auth_headers, task_id, path):
+        response = client.get(f"{path}?fields=name,calculated_urgency,next_due,assigned_to_name", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json() == [
+            {
+                "id": task_id,
+                "name": "Dishes",
+                "calculated_urgency": "high",
+                "next_due": str(date.today()),
+                "assigned_to_name": None,
+            }
+        ]
+
+    def test_delta_sync_honours_fields(self, client, auth_headers, task_id):
+        response = client.get("/api/tasks?since=0&fields=name", headers=auth_headers)
+        assert response.json()["tasks"] == [{"id": task_id, "name": "Dishes"}]
+
+    def test_unknown_field_is_rejected(self, client, auth_headers):
+        response = client.get("/api/tasks?fields=name,secret", headers=auth_headers)
+        assert response.status_code == 400
+        assert "secret" in response.json()["detail"]
+
+    def test_projection_does_not_read_description(self, test_db, task_id):
+        from src.infrastructure import SQLiteTaskRepository
+
+        repo = SQLiteTaskRepository(test_db, columns=("name",))
+        task = repo.get_by_id(task_id)
+        assert task.name == "Dishes"
+        assert task.description is None
+        with pytest.raises(ValueError):
+            repo.save(task)
+        assert SQLiteTaskRepository(test_db).get_by_id(task_id).description == "Long description"
+
+    def test_auto_advance_keeps_unselected_columns(self, client, auth_headers):
+        task_id = client.post(
+            "/api/tasks",
+            json={
+                "name": "Plants",
+                "recurrence": {"type": "daily"},
+                "next_due": "2020-01-01",
+                "autocomplete": True,
+                "description": "Water them",
+            },
+            headers=auth_headers,
+        ).json()["id"]
+
+        response = client.get("/api/tasks?fields=next_due", headers=auth_headers)
+        assert response.json() == [{"id": task_id, "next_due": str(date.today())}]
+
+        task = next(t for t in client.get("/api/tasks", headers=auth_headers).json() if t["id"] == task_id)
+        assert task["description"] == "Water them"
+        assert task["name"] == "Plants"
+
+    def test_history_fields(self, client, auth_headers, task_id):
+        client.post(f"/api/tasks/{task_id}/complete", headers=auth_headers)
+        response = client.get("/api/history?fields=task_name,completed_at", headers=auth_headers)
+        [entry] = response.json()
+        assert set(entry) == {"id", "task_name", "completed_at"}
+        assert entry["task_name"] == "Dishes"
+
+
 class TestMemberEndpoints:
     def test_create_member(self, client, auth_headers):
         response = client.post("/api/members", json={"name": "John"}, headers=auth_headers)
@@ -250,6 +547,264 @@ class TestHistoryEndpoints:
         assert data[0]["task_name"] == "History Task"
         assert data[0]["completed_by_name"] == "John"
 
+    def test_page_size_is_capped(self, client, auth_headers):
+        assert client.get("/api/history?limit=300", headers=auth_headers).status_code == 200
+        for limit in (0, 301):
+            assert client.get(f"/api/history?limit={limit}", headers=auth_headers).status_code == 422
+
+
+class TestDashboardEndpoint:
+    def test_get_dashboard(self, client, auth_headers):
+        from datetime import timedelta
+
+        member_id = client.post("/api/members", json={"name": "John"}, headers=auth_headers).json()["id"]
+        urgent_id = client.post(
+            "/api/tasks",
+            json={
+                "name": "Urgent Task",
+                "recurrence": {"type": "daily"},
+                "next_due": str(date.today()),
+                "assigned_to_id": member_id,
+            },
+            headers=auth_headers,
+        ).json()["id"]
+        later_id = client.post(
+            "/api/tasks",
+            json={
+                "name": "Later Task",
+                "recurrence": {"type": "monthly"},
+                "next_due": str(date.today() + timedelta(days=20)),
+            },
+            headers=auth_headers,
+        ).json()["id"]
+        client.put("/api/notes", json={"content": "Dashboard note"}, headers=auth_headers)
+
+        response = client.get("/api/dashboard", headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert [t["id"] for t in data["tasks"]] == [urgent_id, later_id]
+        assert data["tasks"][0]["assigned_to_name"] == "John"
+        assert data["urgent_task_ids"] == [urgent_id]
+        assert data["upcoming_task_ids"] == [urgent_id]
+        assert {m["name"] for m in data["members"]} == {"John", "Test User"}
+        assert data["note"]["content"] == "Dashboard note"
+
+    def test_dashboard_requires_authentication(self, client):
+        response = client.get("/api/dashboard")
+        assert response.status_code == 401
+
+
+class TestEventStream:
+    def test_events_require_authentication(self, client):
+        response = client.get("/api/events")
+        assert response.status_code == 401
+
+    def test_events_token_opens_the_stream(self, client, auth_headers, monkeypatch):
+        from src.presentation.routes import events
+
+        async def one_message(request, hub, subscription, *args):
+            hub.unsubscribe(subscription)
+            yield "retry: 3000\n\n"
+
+        monkeypatch.setattr(events, "event_stream", one_message)
+        token = client.post("/api/events/token", headers=auth_headers).json()["token"]
+
+        response = client.get(f"/api/events?token={token}")
+        assert response.status_code == 200
+        assert response.text == "retry: 3000\n\n"
+
+    def test_events_token_only_opens_the_stream(self, client, auth_headers):
+        access_token = auth_headers["Authorization"].removeprefix("Bearer ")
+        assert client.get(f"/api/events?token={access_token}").status_code == 401
+        assert client.get("/api/events?token=garbage").status_code == 401
+
+        token = client.post("/api/events/token", headers=auth_headers).json()["token"]
+        assert client.get("/api/members", headers={"Authorization": f"Bearer {token}"}).status_code == 401
+
+    def test_events_token_expires(self, client, auth_headers, monkeypatch):
+        from src.infrastructure import auth
+
+        monkeypatch.setattr(auth, "EVENTS_TOKEN_EXPIRE_SECONDS", -1)
+        token = client.post("/api/events/token", headers=auth_headers).json()["token"]
+        assert client.get(f"/api/events?token={token}").status_code == 401
+
+    async def test_stream_renders_published_task_event(self, test_db):
+        import asyncio
+        import json
+
+        from src.domain import Task, RecurrencePattern, RecurrenceType
+        from src.application import ChangeEvent, ChangeEventType
+        from src.infrastructure import EventHub, SQLiteMemberRepository
+        from src.presentation.routes.events import event_stream
+
+        class ConnectedRequest:
+            async def is_disconnected(self):
+                return False
+
+        hub = EventHub()
+        subscription = hub.subscribe()
+        stream = event_stream(ConnectedRequest(), hub, subscription, SQLiteMemberRepository(test_db), {7: "John"})
+        assert await anext(stream) == "retry: 3000\n\n"
+
+        task = Task(
+            id=3,
+            name="Dishes",
+            recurrence=RecurrencePattern(type=RecurrenceType.DAILY),
+            assigned_to_id=7,
+        )
+        hub.publish(ChangeEvent(type=ChangeEventType.TASK_COMPLETED, task=task))
+        message = await asyncio.wait_for(anext(stream), 1)
+
+        event_line, data_line, _, _ = message.split("\n")
+        assert event_line == "event: task.completed"
+        data = json.loads(data_line.removeprefix("data: "))
+        assert data["name"] == "Dishes"
+        assert data["assigned_to_name"] == "John"
+
+        await stream.aclose()
+        assert hub.subscriber_count == 0
+
+
+class TestMetricsEndpoint:
+    def test_exposes_prometheus_text(self, client, auth_headers):
+        task_id = client.post(
+            "/api/tasks", json={"name": "Metric", "recurrence": {"type": "daily"}}, headers=auth_headers
+        ).json()["id"]
+        client.get(f"/api/tasks/{task_id}/missing", headers=auth_headers)
+        client.get("/api/tasks", headers=auth_headers)
+
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        body = response.text
+
+        assert "# TYPE aivin_http_request_duration_seconds histogram" in body
+        assert 'aivin_http_request_duration_seconds_count{method="GET",route="/api/tasks",status="200"}' in body
+        assert f'route="/api/tasks/{task_id}/missing"' not in body
+        assert 'route="<unmatched>",status="404"' in body
+        assert "aivin_http_requests_in_flight 1" in body  # the /metrics request itself
+        assert 'aivin_db_statement_queries_total{statement="SELECT * FROM tasks WHERE is_active = ?' in body
+        assert 'aivin_turso_phase_duration_seconds_count{phase="wait"}' in body
+        assert 'aivin_cache_hits_total{cache="task_mapper"}' in body
+        assert "aivin_threadpool_threads_limit" in body
+
+    def test_statements_beyond_the_cap_are_labelled_other(self, client, monkeypatch):
+        monkeypatch.setattr(query_stats, "MAX_STATEMENTS", 0)
+        get_query_stats().record_query("SELECT * FROM statement_past_the_cap", 0.001)
+        body = client.get("/metrics").text
+        assert 'aivin_db_statement_queries_total{statement="other"}' in body
+        assert "statement_past_the_cap" not in body
+
+    def test_journal_backlog_is_exported(self, client, tmp_path, monkeypatch):
+        journal = SQLiteCompletionJournal(get_database(), str(tmp_path / "journal.db"))
+        monkeypatch.setattr(completion_journal, "_journal_instance", journal)
+        journal.failures = 2
+        body = client.get("/metrics").text
+        assert "aivin_completion_journal_pending 0" in body
+        assert "aivin_completion_journal_flush_failures 2" in body
+
+    def test_route_templates_label_path_parameters(self, client, auth_headers):
+        client.delete("/api/tasks/12345", headers=auth_headers)
+        body = client.get("/metrics").text
+        assert 'route="/api/tasks/{task_id}",status="404"' in body
+        assert "12345" not in body
+
+    def test_token_required_when_configured(self, client):
+        with patch.dict(os.environ, {"METRICS_TOKEN": "scrape-secret"}):
+            assert client.get("/metrics").status_code == 401
+            assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+            assert client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).status_code == 200
+
+
+class TestServerTiming:
+    def test_breakdown_header(self, client, auth_headers):
+        client.post("/api/tasks", json={"name": "Timed", "recurrence": {"type": "daily"}}, headers=auth_headers)
+        response = client.get("/api/tasks", headers=auth_headers)
+
+        timing = response.headers["Server-Timing"]
+        names = [entry.split(";")[0].strip() for entry in timing.split(",")]
+        assert names[0] == "db"
+        assert {"auth", "serialize", "app", "total"} <= set(names)
+        assert 'desc="5 queries"' in timing
+
+    def test_unauthenticated_requests_are_timed_too(self, client):
+        response = client.get("/api/tasks")
+        assert response.status_code in (401, 403)
+        assert "total;dur=" in response.headers["Server-Timing"]
+
+
+class TestQueryBudget:
+    def test_exceeding_the_budget_fails_loudly(self, client, auth_headers, monkeypatch):
+        from src.presentation.routes.history import list_history
+        from src.presentation.timing import QueryBudgetExceeded
+
+        monkeypatch.setattr(list_history, "query_budget", 2, raising=False)
+        client.post("/api/tasks", json={"name": "Budget", "recurrence": {"type": "daily"}}, headers=auth_headers)
+        task_id = client.get("/api/tasks", headers=auth_headers).json()[0]["id"]
+        client.post(f"/api/tasks/{task_id}/complete", headers=auth_headers)
+
+        with pytest.raises(QueryBudgetExceeded, match="GET /api/history ran 5 queries"):
+            client.get("/api/history", headers=auth_headers)
+
+    def test_not_enforced_when_disabled(self, client, auth_headers, monkeypatch):
+        from src.presentation.routes.history import list_history
+
+        monkeypatch.setattr(list_history, "query_budget", 0, raising=False)
+        monkeypatch.setenv("QUERY_BUDGET_ENFORCE", "0")
+        assert client.get("/api/history", headers=auth_headers).status_code == 200
+
+    def test_history_stays_constant_with_many_completions(self, client, auth_headers):
+        for i in range(5):
+            task_id = client.post(
+                "/api/tasks", json={"name": f"Task {i}", "recurrence": {"type": "daily"}}, headers=auth_headers
+            ).json()["id"]
+            client.post(f"/api/tasks/{task_id}/complete", headers=auth_headers)
+
+        response = client.get("/api/history", headers=auth_headers)
+        assert len(response.json()) == 5
+        assert 'desc="5 queries"' in response.headers["Server-Timing"]
+
+
+class TestRequestProfiling:
+    @pytest.fixture(autouse=True)
+    def profile_dir(self, tmp_path, monkeypatch):
+        from src.presentation import profiling
+
+        monkeypatch.setattr(profiling, "PROFILE_DIR", tmp_path)
+        monkeypatch.setenv("ADMIN_API_KEY", TEST_ADMIN_API_KEY)
+        return tmp_path
+
+    def test_profiles_request_and_serves_download(self, client, auth_headers):
+        response = client.get("/api/tasks", headers={**auth_headers, "X-Profile": TEST_ADMIN_API_KEY})
+        assert response.status_code == 200
+        profile_id = response.headers["X-Profile-Id"]
+        assert len(profile_id) == 16
+
+        admin = {"X-Admin-Api-Key": TEST_ADMIN_API_KEY}
+        report = client.get(f"/api/admin/profiles/{profile_id}?format=text", headers=admin)
+        assert report.status_code == 200
+        # The sync endpoint runs in a worker thread and still shows up
+        assert "list_tasks" in report.text
+
+        raw = client.get(f"/api/admin/profiles/{profile_id}", headers=admin)
+        assert raw.status_code == 200
+        assert raw.headers["Content-Type"] == "application/octet-stream"
+
+    def test_wrong_key_is_not_profiled(self, client, auth_headers, profile_dir):
+        response = client.get("/api/tasks", headers={**auth_headers, "X-Profile": "guess"})
+        assert response.status_code == 200
+        assert "X-Profile-Id" not in response.headers
+        assert list(profile_dir.iterdir()) == []
+
+    def test_download_requires_admin_key(self, client):
+        response = client.get("/api/admin/profiles/0123456789abcdef", headers={"X-Admin-Api-Key": "wrong"})
+        assert response.status_code == 401
+
+    @pytest.mark.parametrize("profile_id", ["0123456789abcdef", "..%2F..%2Fetc%2Fpasswd"])
+    def test_unknown_profile(self, client, profile_id):
+        response = client.get(f"/api/admin/profiles/{profile_id}", headers={"X-Admin-Api-Key": TEST_ADMIN_API_KEY})
+        assert response.status_code == 404
+
 
 class TestHealthEndpoint:
     def test_health_check(self, client):
@@ -258,6 +813,28 @@ class TestHealthEndpoint:
         assert response.json()["status"] == "healthy"
 
 
+class TestStartup:
+    def test_warm_up_builds_the_openapi_schema(self, test_db):
+        report = StartupReport()
+        app.openapi_schema = None
+        warm_up(app, report)
+        assert set(report.steps) == {"database", "auth", "openapi"}
+        assert app.openapi_schema is not None
+
+    def test_only_the_first_request_is_recorded(self):
+        report = StartupReport()
+        report.imported(report.started)
+        report.observe_request(0.25)
+        report.observe_request(0.5)
+        phases = report.phases()
+        assert phases["first_request"] == 0.25
+        assert set(phases) == {"import", "first_request_at", "first_request"}
+
+    def test_startup_phases_on_metrics(self, client):
+        client.get("/health")
+        assert 'aivin_startup_seconds{phase="import"}' in client.get("/metrics").text
+
+
 class TestAuthEndpoints:
     def test_login_with_valid_credentials(self, client):
         """Login should work with valid credentials."""
@@ -0,0 +1,166 @@
+"""Tests for the load-test harness."""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from bench import ENDPOINTS, HouseholdSpec, compare, create_database, dataset, micro, percentile, run_benchmark, startup
+from bench.dataset import DatasetSpec
+from src.domain import RecurrencePattern, RecurrenceType, Task
+from src.infrastructure import Database, SQLiteCompletionRepository, SQLiteTaskRepository
+from src.infrastructure.database import TursoCursor
+
+
+def report(p95_ms=10.0, throughput_rps=100.0, errors=0):
+    return {"meta": {}, "endpoints": {"/api/tasks": {
+        "requests": 100, "errors": errors, "throughput_rps": throughput_rps,
+        "mean_ms": 5.0, "p50_ms": 5.0, "p95_ms": p95_ms, "p99_ms": p95_ms,
+    }}}
+
+
+class TestPercentile:
+    def test_nearest_rank(self):
+        values = [float(v) for v in range(100, 0, -1)]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 95) == 95.0
+        assert percentile(values, 100) == 100.0
+        assert percentile([3.0], 99) == 3.0
+
+    def test_empty(self):
+        assert percentile([], 95) == 0.0
+
+
+class TestCompare:
+    def test_within_tolerance(self):
+        assert compare(report(p95_ms=11.0, throughput_rps=90.0), report()) == []
+
+    def test_flags_slower_p95_lower_throughput_and_new_errors(self):
+        regressions = compare(report(p95_ms=13.0, throughput_rps=70.0, errors=2), report())
+        assert len(regressions) == 3
+        assert all(line.startswith("/api/tasks:") for line in regressions)
+
+    def test_skips_endpoints_missing_from_baseline(self):
+        assert compare(report(p95_ms=100.0), {"meta": {}, "endpoints": {}}) == []
+
+
+class TestRunBenchmark:
+    @pytest.mark.parametrize("mode", ["inprocess", "http"])
+    def test_small_run_reports_every_endpoint(self, mode):
+        spec = HouseholdSpec(tasks=12, members=2, completions=20)
+        result = run_benchmark(spec, mode=mode, concurrency=2, requests=4)
+
+        assert result["meta"]["mode"] == mode
+        assert set(result["endpoints"]) == set(ENDPOINTS)
+        for stats in result["endpoints"].values():
+            assert stats["requests"] == 4
+            assert stats["errors"] == 0
+            assert 0 < stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
+
+    def test_turso_backend(self):
+        spec = HouseholdSpec(tasks=12, members=2, completions=20)
+        result = run_benchmark(spec, concurrency=2, requests=2, endpoints=("/api/tasks",), backend="turso")
+        assert result["meta"]["backend"] == "turso"
+        assert result["endpoints"]["/api/tasks"]["errors"] == 0
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            run_benchmark(HouseholdSpec(), mode="carrier-pigeon")
+
+
+class TestStartup:
+    IMPORTTIME = """import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     fastapi.types
+import time:       300 |        400 |   fastapi
+import time:        50 |         50 |   dotenv
+import time:        20 |        470 | src
+"""
+
+    def test_importtime_is_summed_per_package(self):
+        imports = startup.parse_importtime(self.IMPORTTIME)
+        assert [(m.name, m.depth) for m in imports] == [("fastapi.types", 2), ("fastapi", 1), ("dotenv", 1), ("src", 0)]
+        assert startup.by_package(imports) == {"fastapi": 0.4, "dotenv": 0.05, "src": 0.02}
+
+    def test_app_import_leaves_out_auth_and_migration_libraries(self):
+        loaded = startup.measure_imports()["loaded"]
+        assert "fastapi" in loaded
+        assert not {"jose", "passlib", "alembic"} & set(loaded)
+
+    def test_cold_start(self):
+        result = startup.measure_cold_start(spec=HouseholdSpec(tasks=12, members=2, completions=20))
+        assert 0 < result["ready_ms"]
+        assert 0 < result["first_request_ms"]
+        assert "import" in result["server_ms"]
+
+
+class TestMicrobenchmarks:
+    def test_every_case_runs_at_each_size(self):
+        results = micro.run(sizes=(1, 5), min_time=0.001)
+        assert len(results) == 2 * len(micro.build_cases(1))
+        for result in results:
+            assert result.items_per_second > 0
+            assert result.peak_kib >= 0
+
+    def test_synthetic_rows_map_back_to_the_tasks(self):
+        tasks = micro.make_tasks(20, date(2026, 3, 1), random.Random(1))
+        repo = SQLiteTaskRepository(Database(":memory:", use_turso=False))
+        expected = [(t.id, t.recurrence, t.next_due, t.urgency_label, t.autocomplete) for t in tasks]
+
+        for rows in (micro.sqlite_rows(tasks), TursoCursor(micro.hrana_result(tasks)).fetchall()):
+            mapped = repo._rows_to_tasks(rows)
+            assert [(t.id, t.recurrence, t.next_due, t.urgency_label, t.autocomplete) for t in mapped] == expected
+
+    def test_compare_flags_throughput_drops(self):
+        baseline = [{"name": "calculate_urgency", "size": 10, "items_per_second": 1000}]
+        assert micro.compare([{"name": "calculate_urgency", "size": 10, "items_per_second": 900}], baseline) == []
+        assert len(micro.compare([{"name": "calculate_urgency", "size": 10, "items_per_second": 700}], baseline)) == 1
+
+
+class TestDataset:
+    def weekly_task(self):
+        return Task(id=None, name="Vacuum", recurrence=RecurrencePattern(type=RecurrenceType.WEEKLY))
+
+    def test_history_follows_the_recurrence(self):
+        spec = DatasetSpec(skip_rate=0.0, late_rate=0.0)
+        history, next_due = dataset.completion_history(
+            self.weekly_task(), date(2026, 1, 5), date(2026, 3, 1), spec, random.Random(1)
+        )
+
+        assert [c.date() for c in history] == [date(2026, 1, 5) + timedelta(weeks=i) for i in range(8)]
+        assert all(8 <= c.hour < 22 for c in history)
+        assert next_due == date(2026, 3, 2)
+
+    def test_one_time_task_is_done_once(self):
+        task = Task(id=None, name="Paint", recurrence=RecurrencePattern(type=RecurrenceType.EENMALIG))
+        spec = DatasetSpec(skip_rate=0.0)
+        history, next_due = dataset.completion_history(task, date(2026, 1, 5), date(2026, 3, 1), spec, random.Random(1))
+        assert len(history) == 1
+        assert next_due is None
+
+    def test_skipped_last_occurrence_leaves_the_task_overdue(self):
+        spec = DatasetSpec(skip_rate=1.0)
+        history, next_due = dataset.completion_history(
+            self.weekly_task(), date(2026, 1, 5), date(2026, 3, 1), spec, random.Random(1)
+        )
+        assert history == []
+        assert next_due == date(2026, 2, 23)
+
+    def test_build_dataset(self, tmp_path):
+        db = create_database(str(tmp_path / "large.db"))
+        today = date(2026, 6, 1)
+        stats = dataset.build_dataset(db, DatasetSpec(tasks=60, members=3, years=1.0), today=today)
+
+        tasks = SQLiteTaskRepository(db).get_all(active_only=False)
+        completions = SQLiteCompletionRepository(db).get_all()
+        assert stats.tasks == len(tasks) == 60
+        assert stats.completions == len(completions) > 60
+        assert {c.completed_by_id for c in completions} <= {1, 2, 3}
+        assert {t.recurrence.type for t in tasks} == set(RecurrenceType)
+
+        last_completed = {}
+        for completion in completions:
+            current = last_completed.get(completion.task_id)
+            last_completed[completion.task_id] = max(current or completion.completed_at, completion.completed_at)
+        for task in tasks:
+            assert task.last_completed == last_completed.get(task.id)
+            assert task.is_active == (task.next_due is not None or task.last_completed is None)
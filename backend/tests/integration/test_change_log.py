@@ -0,0 +1,129 @@
+"""Integration tests for the change_log table and its tailer."""
+
+import os
+import tempfile
+import time
+
+import pytest
+from alembic.config import Config
+from alembic import command
+
+from src.domain import Task, HouseholdMember, RecurrencePattern, RecurrenceType
+from src.infrastructure import (
+    Database,
+    ChangeLogTailer,
+    SQLiteTaskRepository,
+    SQLiteMemberRepository,
+)
+
+
+@pytest.fixture
+def db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+
+    alembic_cfg = Config("alembic.ini")
+    alembic_cfg.set_main_option("sqlalchemy.url", f"sqlite:///{path}")
+    command.upgrade(alembic_cfg, "head")
+
+    yield Database(path, use_turso=False)
+
+    os.unlink(path)
+
+
+def new_task(name: str = "Task") -> Task:
+    return Task(id=None, name=name, recurrence=RecurrencePattern(type=RecurrenceType.DAILY))
+
+
+class TestChangeLogTailer:
+    def test_writes_are_logged_in_order(self, db):
+        tailer = ChangeLogTailer(db)
+        task_repo = SQLiteTaskRepository(db)
+        member_repo = SQLiteMemberRepository(db)
+
+        with db.get_connection() as conn:
+            assert tailer.poll(conn) == []
+
+            task = task_repo.save(new_task())
+            task.name = "Renamed"
+            task_repo.save(task)
+            member = member_repo.save(HouseholdMember(id=None, name="John"))
+            member_repo.delete(member.id)
+
+            entries = tailer.poll(conn)
+
+        assert [(e.table_name, e.row_id, e.operation) for e in entries] == [
+            ("tasks", task.id, "insert"),
+            ("tasks", task.id, "update"),
+            ("household_members", member.id, "insert"),
+            ("household_members", member.id, "delete"),
+        ]
+
+    def test_starts_from_end_of_log(self, db):
+        SQLiteTaskRepository(db).save(new_task())
+        tailer = ChangeLogTailer(db)
+
+        with db.get_connection() as conn:
+            assert tailer.poll(conn) == []
+
+    def test_unchanged_data_version_skips_query(self, db):
+        tailer = ChangeLogTailer(db)
+        with db.get_connection() as conn:
+            tailer.poll(conn)
+            SQLiteTaskRepository(db).save(new_task())
+            assert len(tailer.poll(conn)) == 1
+
+            tailer.last_seen_id = 0
+            # Nothing committed since the last poll, so the log isn't read again
+            assert tailer.poll(conn) == []
+
+    def test_subscribers_are_called_from_background_thread(self, db):
+        tailer = ChangeLogTailer(db, interval=0.01)
+        received = []
+        tailer.subscribe(received.extend)
+        try:
+            # Let the tailer record the end of the log before writing
+            deadline = time.monotonic() + 2
+            while tailer.last_seen_id is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+            task = SQLiteTaskRepository(db).save(new_task())
+            while not received and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            tailer.stop()
+
+        assert [(e.table_name, e.row_id) for e in received] == [("tasks", task.id)]
+
+    def test_failing_callback_does_not_block_others(self, db):
+        tailer = ChangeLogTailer(db)
+        received = []
+
+        def broken(entries):
+            raise RuntimeError("boom")
+
+        tailer._callbacks = [broken, received.extend]
+        with db.get_connection() as conn:
+            tailer.poll(conn)
+            SQLiteTaskRepository(db).save(new_task())
+            tailer.poll(conn)
+
+        assert len(received) == 1
+
+    def test_old_entries_are_pruned_without_subscribers(self, db):
+        db.execute(
+            """INSERT INTO change_log (table_name, row_id, operation, changed_at)
+               VALUES ('tasks', 1, 'insert', datetime('now', '-2 hours'))"""
+        )
+        SQLiteTaskRepository(db).save(new_task())
+
+        tailer = ChangeLogTailer(db, interval=0.01)
+        tailer.start()
+        try:
+            deadline = time.monotonic() + 2
+            while db.execute("SELECT COUNT(*) AS n FROM change_log")[0]["n"] > 1 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            tailer.stop()
+
+        assert db.execute("SELECT COUNT(*) AS n FROM change_log")[0]["n"] == 1
+        assert tailer.last_seen_id is None  # nobody to tell, so the log isn't polled
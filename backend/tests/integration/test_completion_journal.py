@@ -0,0 +1,238 @@
+"""Integration tests for the write-behind completion journal."""
+
+import time
+from datetime import date, datetime, timedelta
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from fastapi.testclient import TestClient
+
+from bench.hrana_server import FAILURE_DISCONNECT, HranaServer
+from src.application import CompleteTask
+from src.domain import HouseholdMember, RecurrencePattern, RecurrenceType, Task, TaskCompletion
+from src.infrastructure import (
+    AuthService,
+    Database,
+    JournaledTaskRepository,
+    SQLiteCompletionJournal,
+    SQLiteCompletionRepository,
+    SQLiteMemberRepository,
+    SQLiteTaskRepository,
+    set_database,
+)
+from src.infrastructure import completion_journal
+from src.infrastructure.database import TursoConnection
+from src.presentation.main import app
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "app.db")
+    config = Config("alembic.ini")
+    config.set_main_option("sqlalchemy.url", f"sqlite:///{path}")
+    command.upgrade(config, "head")
+    return path
+
+
+@pytest.fixture
+def db(db_path):
+    return Database(db_path, use_turso=False)
+
+
+@pytest.fixture
+def task(db):
+    return SQLiteTaskRepository(db).save(Task(
+        id=None,
+        name="Dishes",
+        recurrence=RecurrencePattern(type=RecurrenceType.DAILY),
+        next_due=date(2026, 3, 2),
+    ))
+
+
+def complete(task: Task, completed_at: datetime) -> tuple[TaskCompletion, Task]:
+    task.last_completed = completed_at
+    task.next_due = completed_at.date() + timedelta(days=1)
+    return TaskCompletion(id=None, task_id=task.id, completed_at=completed_at), task
+
+
+def stored_task(db, task_id):
+    return SQLiteTaskRepository(db).get_by_id(task_id)
+
+
+class TestCompletionJournal:
+    def test_entries_are_written_in_the_background(self, db, task, tmp_path):
+        journal = SQLiteCompletionJournal(db, str(tmp_path / "journal.db"))
+        at = datetime(2026, 3, 2, 8, 0)
+        journal.record(*complete(task, at))
+        journal.record(*complete(task, at + timedelta(hours=1)))
+
+        assert journal.drain() == 0
+        assert len(SQLiteCompletionRepository(db).get_by_task(task.id)) == 2
+        stored = stored_task(db, task.id)
+        assert stored.last_completed == at + timedelta(hours=1)
+        assert stored.next_due == date(2026, 3, 3)
+
+    def test_replay_is_idempotent_and_never_moves_a_task_back(self, db, task):
+        at = datetime(2026, 3, 2, 8, 0)
+        task_repo = SQLiteTaskRepository(db)
+        task_repo.apply_completions({task.id: (at, date(2026, 3, 3), True)})
+        task_repo.apply_completions({task.id: (at - timedelta(days=1), date(2026, 3, 2), True)})
+        assert stored_task(db, task.id).next_due == date(2026, 3, 3)
+
+        completion_repo = SQLiteCompletionRepository(db)
+        completion_repo.save_missing([TaskCompletion(id=None, task_id=task.id, completed_at=at)])
+        completion_repo.save_missing([TaskCompletion(id=None, task_id=task.id, completed_at=at)])
+        assert len(completion_repo.get_by_task(task.id)) == 1
+
+    def test_entries_survive_a_restart(self, db, task, tmp_path):
+        path = str(tmp_path / "journal.db")
+        journal = SQLiteCompletionJournal(db, path)
+        journal._run = lambda: None  # a flusher that never gets to write, as if the process died
+        journal.record(*complete(task, datetime(2026, 3, 2, 8, 0)))
+        assert journal.pending() == 1
+
+        restarted = SQLiteCompletionJournal(db, path)
+        restarted.start()
+        assert restarted.drain() == 0
+        assert stored_task(db, task.id).last_completed == datetime(2026, 3, 2, 8, 0)
+
+    def test_rejected_entries_are_set_aside(self, db, task, tmp_path):
+        journal = SQLiteCompletionJournal(db, str(tmp_path / "journal.db"))
+        completion, _ = complete(task, datetime(2026, 3, 2, 8, 0))
+        db.execute(
+            """CREATE TRIGGER reject_unknown_task BEFORE INSERT ON task_completions
+               WHEN NEW.task_id = 999 BEGIN SELECT RAISE(ABORT, 'rejected'); END"""
+        )
+        journal.record(TaskCompletion(id=None, task_id=999, completed_at=datetime(2026, 3, 2, 7, 0)), task)
+        journal.record(completion, task)
+
+        assert journal.drain() == 0
+        assert [error for _, error in journal.failed()] == ["rejected"]
+        assert len(SQLiteCompletionRepository(db).get_by_task(task.id)) == 1
+
+    def test_pending_completions_are_read_back(self, db, task, tmp_path):
+        journal = SQLiteCompletionJournal(db, str(tmp_path / "journal.db"))
+        journal._run = lambda: None
+        at = datetime(2026, 3, 2, 8, 0)
+        journal.record(*complete(task, at))
+        journal.record(*complete(stored_task(db, task.id), at - timedelta(hours=1)))  # replayed late
+
+        repo = JournaledTaskRepository(db, journal)
+        assert repo.get_by_id(task.id).last_completed == at
+        assert [t.next_due for t in repo.get_all()] == [date(2026, 3, 3)]
+        assert repo.get_by_due_date_range(date(2026, 3, 2), date(2026, 3, 2)) == []
+        assert stored_task(db, task.id).last_completed is None
+
+        one_off = repo.save(Task(id=None, name="Bins", recurrence=RecurrencePattern(type=RecurrenceType.EENMALIG)))
+        one_off.is_active = False
+        journal.record(TaskCompletion(id=None, task_id=one_off.id, completed_at=at), one_off)
+        assert [t.id for t in repo.get_all()] == [task.id]
+        assert len(repo.get_all(active_only=False)) == 2
+
+
+class TestOverTurso:
+    def test_transient_failures_are_retried_in_order(self, db_path, task, tmp_path, monkeypatch):
+        monkeypatch.setattr(completion_journal, "backoff_delay", lambda attempt: 0.01)
+        with HranaServer(db_path) as server:
+            turso = Database(use_turso=True, turso_url=server.url, turso_token=server.token)
+            journal = SQLiteCompletionJournal(turso, str(tmp_path / "journal.db"), batch_size=1)
+            server.fail_next(2, 503)
+            server.fail_next(1, FAILURE_DISCONNECT)
+            at = datetime(2026, 3, 2, 8, 0)
+            for hours in range(3):
+                journal.record(*complete(task, at + timedelta(hours=hours)))
+
+            assert journal.drain() == 0
+            turso.close()
+
+        local = Database(db_path, use_turso=False)
+        assert len(SQLiteCompletionRepository(local).get_by_task(task.id)) == 3
+        assert stored_task(local, task.id).last_completed == at + timedelta(hours=2)
+
+    def test_completing_while_turso_is_down(self, db_path, task, tmp_path):
+        with HranaServer(db_path) as server:
+            turso = Database(use_turso=True, turso_url=server.url, turso_token=server.token)
+            journal = SQLiteCompletionJournal(turso, str(tmp_path / "journal.db"))
+            repo = JournaledTaskRepository(turso, journal)
+            assert repo.get_by_id(task.id).last_completed is None
+            assert repo.get_all()[0].last_completed is None
+
+            breaker = TursoConnection(server.url, server.token).breaker
+            for _ in range(breaker.failures):
+                breaker.record_failure()
+            try:
+                completed, _ = CompleteTask(repo, SQLiteCompletionRepository(turso), journal=journal).execute(task.id)
+                # Served from the last good reads, with the journaled completion applied
+                assert repo.get_by_id(task.id).last_completed == completed.last_completed
+                assert repo.get_all()[0].next_due == completed.next_due
+            finally:
+                breaker.record_success()
+
+            assert journal.drain() == 0
+            assert journal.pending_completions() == {}
+            assert repo.get_by_id(task.id).last_completed == completed.last_completed
+            turso.close()
+
+    def test_failing_rounds_are_capped(self, db_path, task, tmp_path, monkeypatch):
+        monkeypatch.setattr(completion_journal, "backoff_delay", lambda attempt: 0.01)
+        with HranaServer(db_path) as server:
+            turso = Database(use_turso=True, turso_url=server.url, turso_token=server.token)
+            journal = SQLiteCompletionJournal(turso, str(tmp_path / "journal.db"))
+            journal._run = lambda: None
+            journal.record(*complete(task, datetime(2026, 3, 2, 8, 0)))
+
+            server.fail_next(completion_journal.FLUSH_ATTEMPTS, 503)
+            pipelines = server.pipelines
+            assert not journal._flush_batch()
+            assert server.pipelines == pipelines + completion_journal.FLUSH_ATTEMPTS
+            assert (journal.failures, journal.pending()) == (1, 1)
+
+            assert journal._flush_batch()
+            assert (journal.failures, journal.pending()) == (0, 0)
+            turso.close()
+
+    def test_drain_gives_up_at_its_deadline(self, db_path, task, tmp_path):
+        with HranaServer(db_path) as server:
+            turso = Database(use_turso=True, turso_url=server.url, turso_token=server.token)
+            journal = SQLiteCompletionJournal(turso, str(tmp_path / "journal.db"))
+            server.fail_next(1000, 503)
+            journal.record(*complete(task, datetime(2026, 3, 2, 8, 0)))
+
+            started = time.perf_counter()
+            assert journal.drain(timeout=0.3) == 1
+            assert time.perf_counter() - started < 2
+            turso.close()
+
+
+class TestCompleteEndpoint:
+    def test_completions_are_journaled(self, db, task, tmp_path, monkeypatch):
+        journal = SQLiteCompletionJournal(db, str(tmp_path / "journal.db"))
+        monkeypatch.setattr(completion_journal, "_journal_instance", journal)
+        member = SQLiteMemberRepository(db).save(HouseholdMember(id=None, name="A"))
+        headers = {"Authorization": f"Bearer {AuthService().create_access_token(member.id)}"}
+        set_database(db)
+        try:
+            response = TestClient(app).post(f"/api/tasks/{task.id}/complete", headers=headers)
+            assert response.status_code == 200
+            assert response.json()["next_due"] == (date.today() + timedelta(days=1)).isoformat()
+        finally:
+            set_database(None)
+
+        assert journal.drain() == 0
+        assert stored_task(db, task.id).next_due == date.today() + timedelta(days=1)
+
+    def test_completions_read_back_before_the_flush(self, db, task, tmp_path, monkeypatch):
+        journal = SQLiteCompletionJournal(db, str(tmp_path / "journal.db"))
+        journal._run = lambda: None
+        monkeypatch.setattr(completion_journal, "_journal_instance", journal)
+        member = SQLiteMemberRepository(db).save(HouseholdMember(id=None, name="A"))
+        headers = {"Authorization": f"Bearer {AuthService().create_access_token(member.id)}"}
+        set_database(db)
+        try:
+            client = TestClient(app)
+            completed = client.post(f"/api/tasks/{task.id}/complete", headers=headers).json()
+            [listed] = client.get("/api/tasks", headers=headers).json()
+            assert (listed["last_completed"], listed["next_due"]) == (completed["last_completed"], completed["next_due"])
+        finally:
+            set_database(None)
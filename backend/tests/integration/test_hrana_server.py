@@ -0,0 +1,407 @@
+"""Tests for the Turso code paths against the local Hrana stand-in."""
+
+import asyncio
+import http.client
+import sqlite3
+import time
+from datetime import date
+from urllib.error import HTTPError
+
+import httpx
+import pytest
+from alembic import command
+from alembic.config import Config
+from fastapi.testclient import TestClient
+
+from bench.hrana_server import FAILURE_DISCONNECT, HranaServer
+from src.domain import HouseholdMember, RecurrencePattern, RecurrenceType, Task
+from src.infrastructure import (
+    AuthService,
+    CircuitOpenError,
+    Database,
+    SQLiteMemberRepository,
+    SQLiteTaskRepository,
+    get_query_stats,
+    set_database,
+    track_queries,
+)
+from src.infrastructure import database
+from src.infrastructure.database import TursoConnection, TursoError
+from src.infrastructure.resilience import CircuitBreaker, LatencyWindow
+from src.presentation.main import app
+
+LONG_SQL = "SELECT name FROM items WHERE name IS NOT NULL AND name <> '' " + " ".join(
+    f"AND {i} = {i}" for i in range(20)
+)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "turso.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT, data BLOB)")
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def app_db_path(tmp_path):
+    path = str(tmp_path / "app.db")
+    config = Config("alembic.ini")
+    config.set_main_option("sqlalchemy.url", f"sqlite:///{path}")
+    command.upgrade(config, "head")
+    return path
+
+
+@pytest.fixture
+def server(db_path):
+    with HranaServer(db_path) as server:
+        yield server
+
+
+@pytest.fixture
+def conn(server):
+    conn = TursoConnection(server.url, server.token)
+    yield conn
+    conn.close()
+
+
+class TestPipeline:
+    def test_round_trip_values(self, conn):
+        cursor = conn.execute("INSERT INTO items (name, data) VALUES (?, ?)", ("a", b"\x00\xff"))
+        assert cursor.lastrowid == 1
+
+        row = conn.execute("SELECT id, name, data, 1.5 AS f, NULL AS n FROM items").fetchone()
+        assert (row["id"], row["name"], row["data"], row["f"], row["n"]) == (1, "a", b"\x00\xff", 1.5, None)
+
+    def test_stored_statements_are_reused(self, conn, server):
+        conn.execute("INSERT INTO items (name) VALUES (?)", ("a",))
+        assert conn.execute(LONG_SQL).fetchone()["name"] == "a"
+        assert conn.execute(LONG_SQL).fetchone()["name"] == "a"
+        assert len(conn._stored_sql) == 1
+        assert server.open_streams() == 1
+
+    def test_statement_errors_raise(self, conn):
+        with pytest.raises(TursoError, match="no such table"):
+            conn.execute("SELECT * FROM missing")
+        # The stream survives the error
+        assert conn.execute("SELECT COUNT(*) AS n FROM items").fetchone()["n"] == 0
+
+    def test_transactions_span_pipelines(self, conn):
+        conn.execute("BEGIN")
+        conn.execute("INSERT INTO items (name) VALUES (?)", ("a",))
+        conn.execute("ROLLBACK")
+        assert conn.execute("SELECT COUNT(*) AS n FROM items").fetchone()["n"] == 0
+
+    def test_expired_stream_is_replaced(self, conn, server):
+        conn.execute("INSERT INTO items (name) VALUES (?)", ("a",))
+        conn.execute(LONG_SQL)
+        server.stream_timeout = 0
+        time.sleep(0.01)
+
+        # The server drops the stream and its stored statement; the client retries on a new one
+        assert conn.execute(LONG_SQL).fetchone()["name"] == "a"
+        assert server.open_streams() == 1
+
+    def test_close_ends_the_stream(self, conn, server):
+        conn.execute("SELECT 1")
+        conn.close()
+        assert server.open_streams() == 0
+
+    def test_bad_token_is_rejected(self, server):
+        conn = TursoConnection(server.url, "wrong")
+        with pytest.raises(HTTPError) as error:
+            conn.execute("SELECT 1")
+        assert error.value.code == 401
+
+
+class TestInjection:
+    def test_latency(self, db_path):
+        with HranaServer(db_path, latency=0.05, jitter=0.02, seed=1) as server:
+            conn = TursoConnection(server.url, server.token)
+            started = time.perf_counter()
+            conn.execute("SELECT 1")
+            assert 0.05 <= time.perf_counter() - started < 1
+
+    def test_reads_are_retried(self, conn, server):
+        server.fail_next(1, 503)
+        assert conn.execute("SELECT 1 AS one").fetchone()["one"] == 1
+        server.fail_next(1, FAILURE_DISCONNECT)
+        assert conn.execute("SELECT 1 AS one").fetchone()["one"] == 1
+        assert server.pipelines == 4
+
+    def test_reads_on_an_event_loop_are_not_retried(self, conn, server):
+        async def read():
+            return conn.execute("SELECT 1 AS one")
+
+        server.fail_next(1, 503)
+        with pytest.raises(HTTPError):
+            asyncio.run(read())
+        assert server.pipelines == 1
+
+    def test_writes_are_not_retried(self, conn, server):
+        server.fail_next(1, 503)
+        with pytest.raises(HTTPError) as error:
+            conn.execute("INSERT INTO items (name) VALUES (?)", ("a",))
+        assert error.value.code == 503
+
+        # Not even on a reused keep-alive connection: the server may have run
+        # the write before the connection dropped
+        conn.execute("SELECT 1")
+        server.fail_next(1, FAILURE_DISCONNECT)
+        pipelines = server.pipelines
+        with pytest.raises((ConnectionError, http.client.HTTPException)):
+            conn.execute("INSERT INTO items (name) VALUES (?)", ("a",))
+        assert server.pipelines == pipelines + 1
+        assert conn.execute("SELECT COUNT(*) AS n FROM items").fetchone()["n"] == 0
+
+    def test_writes_reconnect_after_idling(self, conn, server, monkeypatch):
+        monkeypatch.setattr(database, "HTTP_IDLE_SECONDS", 0)
+        conn.execute("SELECT 1")
+        before = get_query_stats().phases()["connect"].count
+        conn.execute("INSERT INTO items (name) VALUES (?)", ("a",))
+        assert get_query_stats().phases()["connect"].count == before + 1
+
+    def test_failure_rate(self, db_path):
+        with HranaServer(db_path, failure_rate=0.3, seed=3) as server:
+            conn = TursoConnection(server.url, server.token)
+            failures = 0
+            for _ in range(40):
+                try:
+                    conn.execute("SELECT 1")
+                except HTTPError:
+                    failures += 1
+            assert failures <= 3
+            assert server.pipelines > 45
+
+
+class TestAgainstStandIn:
+    def test_alembic_turso_migrations(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "migrated.db")
+        sqlite3.connect(path).close()
+        with HranaServer(path) as server:
+            monkeypatch.setenv("TURSO_DATABASE_URL", server.url)
+            monkeypatch.setenv("TURSO_AUTH_TOKEN", server.token)
+            config = Config("alembic.ini")
+            command.upgrade(config, "head")
+            command.upgrade(config, "head")  # nothing pending the second time
+
+        conn = sqlite3.connect(path)
+        [(version,)] = conn.execute("SELECT version_num FROM alembic_version").fetchall()
+        triggers = conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger'").fetchone()[0]
+        conn.close()
+        assert version == "011"
+        assert triggers > 0
+
+    def test_repositories_over_turso(self, tmp_path):
+        path = str(tmp_path / "app.db")
+        config = Config("alembic.ini")
+        config.set_main_option("sqlalchemy.url", f"sqlite:///{path}")
+        command.upgrade(config, "head")
+
+        with HranaServer(path) as server:
+            db = Database(use_turso=True, turso_url=server.url, turso_token=server.token)
+            repo = SQLiteTaskRepository(db)
+            task = repo.save(Task(
+                id=None,
+                name="Dishes",
+                recurrence=RecurrencePattern(type=RecurrenceType.WEEKLY, days=(0, 3)),
+                next_due=date(2026, 3, 2),
+            ))
+            repo.update_next_due_dates({task.id: date(2026, 3, 5)})
+
+            [loaded] = repo.get_all()
+            assert loaded.id == task.id
+            assert loaded.recurrence.days == (0, 3)
+            assert loaded.next_due == date(2026, 3, 5)
+            db.close()
+
+    def test_snapshot_is_a_transaction(self, server):
+        db = Database(use_turso=True, turso_url=server.url, turso_token=server.token)
+        with pytest.raises(RuntimeError):
+            with db.snapshot():
+                db.execute("INSERT INTO items (name) VALUES (?)", ("a",))
+                assert db.execute("SELECT COUNT(*) AS n FROM items")[0]["n"] == 1
+                raise RuntimeError()
+        assert db.execute("SELECT COUNT(*) AS n FROM items")[0]["n"] == 0
+
+        with db.snapshot():
+            db.execute("INSERT INTO items (name) VALUES (?)", ("a",))
+        assert db.execute("SELECT COUNT(*) AS n FROM items")[0]["n"] == 1
+        db.close()
+
+    def test_cached_reads_see_the_snapshot(self, app_db_path):
+        # Turso reads don't block writers; WAL lets the stand-in do the same
+        sqlite3.connect(app_db_path).execute("PRAGMA journal_mode=WAL").close()
+        with HranaServer(app_db_path) as server:
+            db = Database(use_turso=True, turso_url=server.url, turso_token=server.token)
+            other = Database(use_turso=True, turso_url=server.url, turso_token=server.token)
+            repo = SQLiteTaskRepository(db)
+            repo.save(Task(id=None, name="Dishes", recurrence=RecurrencePattern(type=RecurrenceType.DAILY)))
+
+            with db.snapshot():
+                assert [t.name for t in repo.get_all()] == ["Dishes"]
+                # Another worker renames the task and this one hears of it
+                other.execute("UPDATE tasks SET name = 'Laundry'")
+                db.read_cache.invalidate(("tasks",))
+                assert [t.name for t in repo.get_all()] == ["Dishes"]
+            assert [t.name for t in repo.get_all()] == ["Laundry"]
+            other.close()
+            db.close()
+
+
+class TestFailureHandling:
+    def test_stalled_reads_time_out(self, conn, server, monkeypatch):
+        monkeypatch.setattr(database, "TURSO_READ_TIMEOUT", 0.05)
+        monkeypatch.setattr(database, "TURSO_READ_RETRIES", 1)
+        conn.close()
+        server.slow_next(2, 0.3)
+
+        started = time.perf_counter()
+        with pytest.raises(TimeoutError):
+            conn.execute("SELECT 1")
+        assert time.perf_counter() - started < 0.3
+        assert conn.execute("SELECT 1 AS one").fetchone()["one"] == 1
+
+    def test_breaker_fails_fast_then_recovers(self, conn, server):
+        conn.breaker = CircuitBreaker(failures=2, reset_seconds=0.1)
+        server.fail_next(2, 503)
+        with pytest.raises(HTTPError):
+            conn.execute("INSERT INTO items (name) VALUES (?)", ("a",))
+        with pytest.raises(HTTPError):
+            conn.execute("INSERT INTO items (name) VALUES (?)", ("b",))
+
+        pipelines = server.pipelines
+        with pytest.raises(CircuitOpenError):
+            conn.execute("SELECT 1")
+        assert server.pipelines == pipelines  # refused without a request
+
+        time.sleep(0.15)
+        assert conn.execute("SELECT 1 AS one").fetchone()["one"] == 1
+        assert not conn.breaker.is_open
+
+    def test_slow_read_is_hedged(self, conn, server, monkeypatch):
+        window = LatencyWindow()
+        for _ in range(50):
+            window.observe(0.005)
+        monkeypatch.setattr(database, "_read_latencies", window)
+        monkeypatch.setattr(database, "TURSO_HEDGE_READS", True)
+        monkeypatch.setattr(database, "HEDGE_MIN_DELAY", 0.02)
+        conn.execute("INSERT INTO items (name) VALUES (?)", ("a",))
+        before = get_query_stats().events().get("hedge_won", 0)
+
+        server.slow_next(1, 1.0)
+        started = time.perf_counter()
+        assert conn.execute("SELECT name FROM items").fetchone()["name"] == "a"
+        assert time.perf_counter() - started < 0.5
+        assert get_query_stats().events()["hedge_won"] == before + 1
+
+        # The connection carries on after its request was cut off
+        assert conn.execute("SELECT COUNT(*) AS n FROM items").fetchone()["n"] == 1
+
+    def test_fast_read_is_not_hedged(self, conn, server, monkeypatch):
+        window = LatencyWindow()
+        for _ in range(50):
+            window.observe(0.2)
+        monkeypatch.setattr(database, "_read_latencies", window)
+        monkeypatch.setattr(database, "TURSO_HEDGE_READS", True)
+
+        conn.execute("SELECT 1")
+        assert server.pipelines == 1
+
+    def test_open_breaker_serves_stale_reads_or_503(self, app_db_path):
+        member = SQLiteMemberRepository(Database(app_db_path, use_turso=False)).save(HouseholdMember(id=None, name="A"))
+
+        with HranaServer(app_db_path) as server:
+            db = Database(use_turso=True, turso_url=server.url, turso_token=server.token)
+            set_database(db)
+            try:
+                client = TestClient(app)
+                headers = {"Authorization": f"Bearer {AuthService().create_access_token(member.id)}"}
+                assert client.get("/api/members", headers=headers).status_code == 200
+
+                breaker = TursoConnection(server.url, server.token).breaker
+                for _ in range(breaker.failures):
+                    breaker.record_failure()
+                # Cached reads degrade to the last good result
+                response = client.get("/api/members", headers=headers)
+                assert response.status_code == 200
+                assert [m["name"] for m in response.json()] == ["A"]
+                assert "X-Data-Stale" in response.headers
+                assert "ETag" not in response.headers
+                # Others fail fast
+                response = client.get("/api/history", headers=headers)
+                assert response.status_code == 503
+                assert "Retry-After" in response.headers
+            finally:
+                breaker.record_success()
+                set_database(None)
+                db.close()
+
+    def test_slow_read_does_not_block_other_requests(self, app_db_path):
+        member = SQLiteMemberRepository(Database(app_db_path, use_turso=False)).save(HouseholdMember(id=None, name="A"))
+
+        async def requests(server):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                headers = {"Authorization": f"Bearer {AuthService().create_access_token(member.id)}"}
+                started = time.perf_counter()
+                slow = asyncio.create_task(client.get("/api/members", headers=headers))
+                while not server.pipelines:  # the user lookup has reached Turso
+                    await asyncio.sleep(0.01)
+                assert (await client.get("/health")).status_code == 200
+                health_seconds = time.perf_counter() - started
+                assert (await slow).status_code == 200
+                return health_seconds
+
+        with HranaServer(app_db_path) as server:
+            db = Database(use_turso=True, turso_url=server.url, turso_token=server.token)
+            set_database(db)
+            try:
+                server.slow_next(1, 0.5)  # the user lookup
+                assert asyncio.run(requests(server)) < 0.3
+            finally:
+                set_database(None)
+                db.close()
+
+
+class TestStaleReads:
+    def test_slow_reads_are_served_stale(self, app_db_path):
+        with HranaServer(app_db_path) as server:
+            db = Database(use_turso=True, turso_url=server.url, turso_token=server.token)
+            db.read_cache.budget = 0.1
+            repo = SQLiteTaskRepository(db)
+            repo.save(Task(id=None, name="Dishes", recurrence=RecurrencePattern(type=RecurrenceType.DAILY)))
+            assert [t.name for t in repo.get_all()] == ["Dishes"]
+
+            # Another worker renames the task; this one hasn't heard yet
+            other = Database(use_turso=True, turso_url=server.url, turso_token=server.token)
+            other.execute("UPDATE tasks SET name = 'Laundry'")
+            server.slow_next(1, 0.5)
+            started = time.perf_counter()
+            with track_queries() as queries:
+                assert [t.name for t in repo.get_all()] == ["Dishes"]
+            assert time.perf_counter() - started < 0.4
+            assert queries.stale_seconds is not None
+
+            time.sleep(0.6)  # the slow read completes in the background
+            server.fail_next(1, 503)
+            assert [t.name for t in repo.get_all()] == ["Laundry"]
+            other.close()
+            db.close()
+
+    def test_own_writes_are_not_hidden_by_slow_reads(self, app_db_path):
+        with HranaServer(app_db_path) as server:
+            db = Database(use_turso=True, turso_url=server.url, turso_token=server.token)
+            db.read_cache.budget = 0.1
+            repo = SQLiteTaskRepository(db)
+            task = repo.save(Task(id=None, name="Dishes", recurrence=RecurrencePattern(type=RecurrenceType.DAILY)))
+            repo.get_all()
+
+            task.name = "Laundry"
+            repo.save(task)
+            server.slow_next(1, 0.3)
+            with track_queries() as queries:
+                assert [t.name for t in repo.get_all()] == ["Laundry"]
+            assert queries.stale_seconds is None
+            db.close()
@@ -0,0 +1,62 @@
+"""Unit tests for response compression helpers."""
+
+import gzip
+
+import pytest
+from fastapi import Response
+from starlette.requests import Request
+
+from src.presentation import compression
+from src.presentation.compression import accepted_encodings, choose_encoding, compress_response
+
+
+def make_request(accept_encoding: str) -> Request:
+    return Request({"type": "http", "headers": [(b"accept-encoding", accept_encoding.encode())]})
+
+
+class TestAcceptEncoding:
+    def test_parses_codings_and_quality(self):
+        assert accepted_encodings("gzip, deflate;q=0.5, br;q=0") == {"gzip", "deflate"}
+
+    def test_prefers_brotli_when_available(self, monkeypatch):
+        monkeypatch.setattr(compression, "brotli", object())
+        assert choose_encoding("gzip, br") == "br"
+
+    def test_falls_back_to_gzip_without_brotli(self, monkeypatch):
+        monkeypatch.setattr(compression, "brotli", None)
+        assert choose_encoding("gzip, br") == "gzip"
+
+    def test_identity_only(self):
+        assert choose_encoding("identity") is None
+
+    def test_wildcard_does_not_override_refusals(self, monkeypatch):
+        monkeypatch.setattr(compression, "brotli", object())
+        assert choose_encoding("*") == "br"
+        assert choose_encoding("br;q=0, *") == "gzip"
+        assert choose_encoding("*, br;q=0, gzip;q=0") is None
+
+
+class TestCompressResponse:
+    def test_compresses_large_bodies(self, monkeypatch):
+        monkeypatch.setattr(compression, "brotli", None)
+        body = b"x" * 2000
+        response = Response(content=body, headers={"ETag": '"abc"'})
+
+        result = compress_response(make_request("gzip"), response)
+
+        assert gzip.decompress(result.body) == body
+        assert result.headers["Content-Encoding"] == "gzip"
+        assert result.headers["Content-Length"] == str(len(result.body))
+        assert result.headers["ETag"] == '"abc"'  # conditional_get already named the encoding
+
+    def test_leaves_small_bodies_alone(self):
+        response = Response(content=b"small")
+        result = compress_response(make_request("gzip"), response)
+        assert result.body == b"small"
+        assert "Content-Encoding" not in result.headers
+
+    @pytest.mark.parametrize("status_code", [201, 404])
+    def test_only_successful_get_bodies(self, status_code):
+        response = Response(content=b"x" * 2000, status_code=status_code)
+        result = compress_response(make_request("gzip"), response)
+        assert "Content-Encoding" not in result.headers
@@ -1,8 +1,14 @@
 """Unit tests for database infrastructure."""
 
+from datetime import date, datetime
+from unittest.mock import patch
+from urllib.error import HTTPError
+
 import pytest
 
-from src.infrastructure.database import TursoConnection, TursoCursor
+from src.domain import Urgency
+from src.infrastructure import database
+from src.infrastructure.database import Database, TursoConnection, TursoCursor, TursoRow, encode_args
 
 
 class TestTursoConnectionURLConstruction:
@@ -59,6 +65,192 @@ class TestTursoConnectionURLConstruction:
             assert api_url == "https://db.turso.io/v2/pipeline", f"Failed for input: {url}"
 
 
+class TestTursoArgumentEncoding:
+    """Parameters are sent as typed Hrana values and read back unchanged."""
+
+    def round_trip(self, value):
+        [cell] = encode_args((value,))
+        cursor = TursoCursor({"response": {"result": {"cols": [{"name": "v"}], "rows": [[cell]]}}})
+        return cursor.fetchone()["v"]
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            (None, {"type": "null"}),
+            (42, {"type": "integer", "value": "42"}),
+            (True, {"type": "integer", "value": "1"}),
+            (False, {"type": "integer", "value": "0"}),
+            (1.5, {"type": "float", "value": 1.5}),
+            ("text", {"type": "text", "value": "text"}),
+            (b"\x00\xff", {"type": "blob", "base64": "AP8"}),
+            (date(2024, 1, 8), {"type": "text", "value": "2024-01-08"}),
+            (datetime(2024, 1, 8, 9, 30), {"type": "text", "value": "2024-01-08T09:30:00"}),
+        ],
+    )
+    def test_encodes_hrana_values(self, value, expected):
+        assert encode_args((value,)) == [expected]
+
+    @pytest.mark.parametrize(
+        "value",
+        [None, 0, -7, 2**62, 3.25, -0.5, "", "héllo", b"", b"\x00\x01binary\xff", bytes(range(256))],
+    )
+    def test_round_trip(self, value):
+        result = self.round_trip(value)
+        assert result == value
+        assert type(result) is type(value)
+
+    def test_bool_and_dates_read_back_as_stored(self):
+        assert self.round_trip(True) == 1
+        assert self.round_trip(date(2024, 1, 8)) == "2024-01-08"
+
+    def test_enum_values_use_their_base_type(self):
+        assert encode_args((Urgency.HIGH,)) == [{"type": "text", "value": "high"}]
+
+    @pytest.mark.parametrize("value", [float("nan"), float("inf"), float("-inf")])
+    def test_non_finite_floats_are_rejected(self, value):
+        with pytest.raises(ValueError, match="finite"):
+            encode_args((value,))
+
+    def test_unsupported_type_is_rejected(self):
+        with pytest.raises(TypeError, match="dict"):
+            encode_args(({},))
+
+    def test_execute_sends_typed_args(self):
+        conn = TursoConnection("libsql://db.turso.io", "token")
+        with patch.object(conn, "_request", return_value=[{}]) as request:
+            conn.execute("SELECT ?, ?, ?", (1, 2.5, None))
+        [stmt] = request.call_args.args[0]
+        assert stmt["args"] == [
+            {"type": "integer", "value": "1"},
+            {"type": "float", "value": 2.5},
+            {"type": "null"},
+        ]
+
+
+class FakeHranaServer:
+    """Minimal stand-in for the pipeline endpoint that tracks streams and stored SQL."""
+
+    def __init__(self):
+        self.streams = {}
+        self.payloads = []
+        self.next_baton = 0
+
+    def post(self, url, payload, idempotent=True):
+        self.payloads.append(payload)
+        baton = payload.get("baton")
+        if baton is None:
+            self.next_baton += 1
+            stored = {}
+        else:
+            if baton not in self.streams:
+                raise HTTPError(url, 400, "stream expired", {}, None)
+            stored = self.streams.pop(baton)
+
+        results = []
+        for request in payload["requests"]:
+            if request["type"] == "store_sql":
+                stored[request["sql_id"]] = request["sql"]
+            elif request["type"] == "close_sql":
+                del stored[request["sql_id"]]
+            elif request["type"] == "execute":
+                stmt = request["stmt"]
+                sql = stmt["sql"] if "sql" in stmt else stored[stmt["sql_id"]]
+                results.append({"type": "ok", "response": {"type": "execute", "result": {
+                    "cols": [{"name": "sql"}], "rows": [[{"type": "text", "value": sql}]],
+                }}})
+                continue
+            results.append({"type": "ok", "response": {"type": request["type"]}})
+
+        if payload["requests"][-1]["type"] == "close":
+            return {"baton": None, "base_url": None, "results": results}
+        new_baton = f"baton-{self.next_baton}-{len(self.payloads)}"
+        self.streams[new_baton] = stored
+        return {"baton": new_baton, "base_url": None, "results": results}
+
+
+LONG_SQL = "SELECT " + ", ".join(f"{i} AS c{i}" for i in range(40))
+
+
+class TestTursoStoredStatements:
+    @pytest.fixture
+    def server(self):
+        return FakeHranaServer()
+
+    @pytest.fixture
+    def conn(self, server):
+        conn = TursoConnection("libsql://db.turso.io", "token")
+        with patch.object(conn, "_post", side_effect=server.post):
+            yield conn
+
+    def requests_of(self, server, n):
+        return server.payloads[n]["requests"]
+
+    def test_long_statement_is_stored_once_and_reused(self, conn, server):
+        assert conn.execute(LONG_SQL).fetchone()["sql"] == LONG_SQL
+        assert conn.execute(LONG_SQL).fetchone()["sql"] == LONG_SQL
+
+        first, second = self.requests_of(server, 0), self.requests_of(server, 1)
+        assert [r["type"] for r in first] == ["store_sql", "execute"]
+        assert first[1]["stmt"] == {"sql_id": first[0]["sql_id"]}
+        assert second == [{"type": "execute", "stmt": {"sql_id": first[0]["sql_id"]}}]
+        assert server.payloads[1]["baton"] is not None
+
+    def test_short_statements_are_sent_inline(self, conn, server):
+        conn.execute("SELECT 1")
+        assert self.requests_of(server, 0) == [{"type": "execute", "stmt": {"sql": "SELECT 1"}}]
+
+    def test_lru_eviction_closes_stored_statement(self, conn, server, monkeypatch):
+        monkeypatch.setattr(database, "STORED_SQL_CACHE_SIZE", 2)
+        statements = [LONG_SQL + f" WHERE {i} = {i}" for i in range(3)]
+        for sql in statements:
+            assert conn.execute(sql).fetchone()["sql"] == sql
+
+        third = self.requests_of(server, 2)
+        assert third[0] == {"type": "close_sql", "sql_id": 1}
+        assert conn.execute(statements[1]).fetchone()["sql"] == statements[1]
+
+    def test_idle_stream_is_replaced(self, conn, server):
+        conn.execute(LONG_SQL)
+        conn._last_used -= database.STREAM_IDLE_SECONDS + 1
+        assert conn.execute(LONG_SQL).fetchone()["sql"] == LONG_SQL
+
+        second = server.payloads[1]
+        assert second["baton"] is None
+        assert second["requests"][0]["type"] == "store_sql"
+
+    def test_rejected_baton_retries_on_new_stream(self, conn, server):
+        conn.execute(LONG_SQL)
+        server.streams.clear()
+        assert conn.execute(LONG_SQL).fetchone()["sql"] == LONG_SQL
+        assert server.payloads[-1]["baton"] is None
+
+    def test_close_ends_stream(self, conn, server):
+        conn.execute("SELECT 1")
+        conn.close()
+        assert server.payloads[-1]["requests"] == [{"type": "close"}]
+        assert server.streams == {}
+
+
+class TestTursoConnectionPool:
+    def test_connections_are_reused(self, monkeypatch):
+        monkeypatch.setattr(database, "TURSO_URL", "libsql://db.turso.io")
+        monkeypatch.setattr(database, "TURSO_TOKEN", "token")
+        db = Database(use_turso=True)
+
+        with db.get_connection() as first:
+            pass
+        with db.get_connection() as second:
+            pass
+        assert first is second
+
+        with db.get_connection() as outer, db.get_connection() as inner:
+            assert outer is not inner
+        assert len(db._turso_pool) == 2
+
+        db.close()
+        assert db._turso_pool == []
+
+
 class TestTursoCursorTypeParsing:
     """Test that TursoCursor correctly parses Turso API response types."""
 
@@ -82,6 +274,11 @@ class TestTursoCursorTypeParsing:
         assert rows[0]["count"] == 0
         assert isinstance(rows[0]["count"], int)
 
+    def test_last_insert_rowid_is_an_int(self):
+        cursor = TursoCursor({"response": {"result": {"cols": [], "rows": [], "last_insert_rowid": "17"}}})
+        assert cursor.lastrowid == 17
+        assert TursoCursor({"response": {"result": {"cols": [], "rows": []}}}).lastrowid is None
+
     def test_integer_zero_is_falsy(self):
         """Integer 0 should be falsy when used as boolean (the autocomplete bug)."""
         result = {
@@ -177,3 +374,116 @@ class TestTursoCursorTypeParsing:
         assert bool(rows[0]["is_active"]) is True
         assert rows[0]["score"] == 95.5
         assert rows[0]["deleted_at"] is None
+
+
+class TestTursoColumnarParsing:
+    def make_cursor(self, cols, rows):
+        return TursoCursor({"response": {"result": {"cols": [{"name": c} for c in cols], "rows": rows}}})
+
+    def test_column_with_nulls(self):
+        cursor = self.make_cursor(
+            ["assigned_to_id"],
+            [[{"type": "integer", "value": "3"}], [{"type": "null"}], [{"type": "integer", "value": "4"}]],
+        )
+        assert [row["assigned_to_id"] for row in cursor.fetchall()] == [3, None, 4]
+
+    def test_mixed_type_column_falls_back_per_cell(self):
+        cursor = self.make_cursor(
+            ["value"],
+            [[{"type": "integer", "value": "1"}], [{"type": "text", "value": "x"}], [{"type": "float", "value": 2.5}]],
+        )
+        assert [row["value"] for row in cursor.fetchall()] == [1, "x", 2.5]
+
+    def test_short_rows_are_padded_with_none(self):
+        cursor = self.make_cursor(["a", "b"], [[{"type": "integer", "value": "1"}]])
+        assert cursor.fetchone()["b"] is None
+
+    def test_rows_support_sequence_access(self):
+        cursor = self.make_cursor(["id"], [[{"type": "integer", "value": str(i)}] for i in range(3)])
+        rows = cursor.fetchall()
+
+        assert len(rows) == 3
+        assert rows[-1]["id"] == 2
+        assert [row["id"] for row in rows[1:]] == [1, 2]
+        with pytest.raises(IndexError):
+            rows[3]
+
+    def test_rows_are_parsed_on_first_access(self):
+        cursor = self.make_cursor(["id"], [[{"type": "integer", "value": "1"}]])
+        assert cursor._rows is None
+        cursor.fetchall()
+        assert cursor.fetchall() is cursor._rows
+
+    def test_empty_result(self):
+        cursor = self.make_cursor([], [])
+        assert len(cursor.fetchall()) == 0
+        assert cursor.fetchone() is None
+
+
+class TestTursoRow:
+    def test_rows_share_one_column_index(self):
+        result = {
+            "response": {
+                "result": {
+                    "cols": [{"name": "id"}, {"name": "name"}],
+                    "rows": [
+                        [{"type": "integer", "value": "1"}, {"type": "text", "value": "a"}],
+                        [{"type": "integer", "value": "2"}, {"type": "text", "value": "b"}],
+                    ]
+                }
+            }
+        }
+        first, second = TursoCursor(result).fetchall()
+
+        assert first._index is second._index
+        assert second["name"] == "b"
+        assert second[0] == 2
+        assert first.keys() == ["id", "name"]
+        assert tuple(first) == (1, "a")
+        assert dict(zip(first.keys(), first)) == {"id": 1, "name": "a"}
+
+    def test_rows_have_no_instance_dict(self):
+        row = TursoRow((1,), {"id": 0})
+        assert not hasattr(row, "__dict__")
+
+
+class TestDatabaseSnapshot:
+    """Test that snapshot() pins one connection for all queries in the block."""
+
+    @pytest.fixture
+    def db(self, tmp_path):
+        db = Database(str(tmp_path / "snapshot.db"), use_turso=False)
+        db.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        return db
+
+    def test_queries_share_one_connection(self, db, monkeypatch):
+        created = []
+        original = db._create_connection
+
+        def counting_create():
+            created.append(1)
+            return original()
+
+        monkeypatch.setattr(db, "_create_connection", counting_create)
+        with db.snapshot():
+            db.execute("SELECT * FROM items")
+            db.execute("SELECT COUNT(*) FROM items")
+            with db.snapshot():
+                db.execute("SELECT * FROM items")
+
+        assert len(created) == 1
+
+    def test_writes_are_committed(self, db):
+        with db.snapshot():
+            db.execute_returning_id("INSERT INTO items (name) VALUES (?)", ("a",))
+
+        rows = db.execute("SELECT name FROM items")
+        assert [row["name"] for row in rows] == ["a"]
+
+    def test_writes_are_rolled_back_on_error(self, db):
+        with pytest.raises(RuntimeError):
+            with db.snapshot():
+                db.execute("INSERT INTO items (name) VALUES (?)", ("a",))
+                raise RuntimeError("boom")
+
+        assert db.execute("SELECT * FROM items") == []
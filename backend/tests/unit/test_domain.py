@@ -375,3 +375,11 @@ class TestRecurrencePattern:
         pattern = RecurrencePattern(type=RecurrenceType.DAILY)
         with pytest.raises(AttributeError):
             pattern.type = RecurrenceType.WEEKLY
+
+
+class TestEntities:
+    def test_entities_are_slotted(self):
+        task = Task(id=1, name="Test", recurrence=RecurrencePattern(type=RecurrenceType.DAILY))
+        assert not hasattr(task, "__dict__")
+        with pytest.raises(AttributeError):
+            task.unknown = True
@@ -0,0 +1,63 @@
+"""Unit tests for the in-process change event hub."""
+
+import asyncio
+import threading
+from datetime import datetime
+
+from src.domain import Task, Note, RecurrencePattern, RecurrenceType
+from src.application import ChangeEvent, ChangeEventType
+from src.infrastructure.events import EventHub
+
+
+def task_event(task_id: int = 1) -> ChangeEvent:
+    task = Task(id=task_id, name="Task", recurrence=RecurrencePattern(type=RecurrenceType.DAILY))
+    return ChangeEvent(type=ChangeEventType.TASK_UPDATED, task=task)
+
+
+class TestEventHub:
+    async def test_broadcasts_to_all_subscribers(self):
+        hub = EventHub()
+        first = hub.subscribe()
+        second = hub.subscribe()
+
+        event = task_event()
+        hub.publish(event)
+
+        assert await asyncio.wait_for(first.get(), 1) is event
+        assert await asyncio.wait_for(second.get(), 1) is event
+
+    async def test_publish_from_worker_thread(self):
+        hub = EventHub()
+        subscription = hub.subscribe()
+
+        event = ChangeEvent(type=ChangeEventType.NOTE_UPDATED, note=Note(id=1, content="x", updated_at=datetime.now()))
+        thread = threading.Thread(target=hub.publish, args=(event,))
+        thread.start()
+        thread.join()
+
+        assert await asyncio.wait_for(subscription.get(), 1) is event
+
+    async def test_unsubscribed_listener_gets_nothing(self):
+        hub = EventHub()
+        subscription = hub.subscribe()
+        hub.unsubscribe(subscription)
+
+        hub.publish(task_event())
+        await asyncio.sleep(0)
+
+        assert subscription.queue.empty()
+        assert hub.subscriber_count == 0
+
+    async def test_slow_subscriber_is_evicted(self):
+        hub = EventHub(queue_size=2)
+        slow = hub.subscribe()
+        fast = hub.subscribe()
+
+        for task_id in range(3):
+            hub.publish(task_event(task_id))
+            assert (await asyncio.wait_for(fast.get(), 1)).task.id == task_id
+
+        # The slow subscriber's backlog is dropped and it is told to go away
+        assert await asyncio.wait_for(slow.get(), 1) is None
+        assert await slow.get() is None
+        assert hub.subscriber_count == 1
@@ -0,0 +1,195 @@
+"""Unit tests for query instrumentation."""
+
+import contextvars
+import json
+import logging
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+
+import pytest
+
+from src.infrastructure import query_stats
+from src.infrastructure.database import Database, TursoConnection
+from src.infrastructure.query_stats import (
+    Histogram,
+    QueryStats,
+    get_query_stats,
+    normalize_sql,
+    track_queries,
+)
+
+
+class TestNormalizeSql:
+    def test_collapses_whitespace(self):
+        assert normalize_sql("SELECT *\n   FROM tasks\n  WHERE id = ?  ") == "SELECT * FROM tasks WHERE id = ?"
+
+    def test_replaces_literals(self):
+        assert normalize_sql("SELECT * FROM t WHERE a = 'x''y' AND b > -1.5 LIMIT 20") == (
+            "SELECT * FROM t WHERE a = ? AND b > ? LIMIT ?"
+        )
+        assert normalize_sql("SELECT col_1 FROM t2") == "SELECT col_1 FROM t2"
+
+    def test_collapses_lists_of_any_length(self):
+        for size in (2, 3, 50):
+            ids = ", ".join("?" * size)
+            cases = " ".join(["WHEN ? THEN ?"] * size)
+            rows = ", ".join(["(?, ?)"] * size)
+            assert normalize_sql(f"UPDATE t SET v = CASE id {cases} END WHERE id IN ({ids})") == (
+                "UPDATE t SET v = CASE id WHEN ? THEN ? ... END WHERE id IN (?, ...)"
+            )
+            assert normalize_sql(f"INSERT INTO t (a, b) VALUES {rows}") == "INSERT INTO t (a, b) VALUES (?, ...), ..."
+        assert normalize_sql("SELECT * FROM t WHERE id IN (?)") == "SELECT * FROM t WHERE id IN (?)"
+
+
+class TestHistogram:
+    def test_observations_land_in_their_bucket(self):
+        histogram = Histogram(buckets=(0.01, 0.1))
+        for seconds in (0.005, 0.01, 0.05, 3.0):
+            histogram.observe(seconds)
+
+        assert histogram.counts == [2, 1, 1]
+        assert histogram.count == 4
+        assert histogram.sum == pytest.approx(3.065)
+
+
+class TestQueryStats:
+    def test_groups_by_normalized_statement(self):
+        stats = QueryStats()
+        stats.record_query("SELECT * FROM tasks LIMIT 1", 0.002)
+        stats.record_query("SELECT *   FROM tasks LIMIT 2", 0.004)
+        stats.record_query("SELECT * FROM notes", 0.001, failed=True)
+
+        statements = stats.statements()
+        assert statements["SELECT * FROM tasks LIMIT ?"].count == 2
+        assert statements["SELECT * FROM tasks LIMIT ?"].total_seconds == pytest.approx(0.006)
+        assert statements["SELECT * FROM tasks LIMIT ?"].max_seconds == 0.004
+        assert statements["SELECT * FROM notes"].errors == 1
+
+    def test_statements_beyond_the_cap_are_counted_together(self, monkeypatch):
+        monkeypatch.setattr(query_stats, "MAX_STATEMENTS", 2)
+        stats = QueryStats()
+        for table in ("a", "b", "c", "d", "a"):
+            stats.record_query(f"SELECT * FROM {table}", 0.001)
+
+        statements = stats.statements()
+        assert set(statements) == {"SELECT * FROM a", "SELECT * FROM b", query_stats.OTHER_STATEMENT}
+        assert statements["SELECT * FROM a"].count == 2
+        assert statements[query_stats.OTHER_STATEMENT].count == 2
+
+    def test_counts_queries_per_request(self):
+        stats = QueryStats()
+        stats.record_query("SELECT 0", 0.001)
+        with track_queries() as queries:
+            stats.record_query("SELECT 1", 0.001)
+            stats.record_query("SELECT 2", 0.002)
+
+        assert queries.count == 2
+        assert queries.total_seconds == pytest.approx(0.003)
+
+    def test_request_counts_include_worker_threads(self):
+        stats = QueryStats()
+        with track_queries() as queries:
+            context = contextvars.copy_context()
+            thread = threading.Thread(target=context.run, args=(stats.record_query, "SELECT 1", 0.001))
+            thread.start()
+            thread.join()
+        assert queries.count == 1
+
+    def test_slow_queries_are_logged(self, caplog, monkeypatch):
+        monkeypatch.setattr(query_stats, "SLOW_QUERY_SECONDS", 0.1)
+        # Alembic's fileConfig in the integration tests disables existing loggers
+        monkeypatch.setattr(query_stats.logger, "disabled", False)
+        stats = QueryStats()
+        with caplog.at_level(logging.WARNING, logger=query_stats.__name__):
+            stats.record_query("SELECT fast", 0.01)
+            stats.record_query("SELECT\n  slow", 0.5)
+
+        assert len(caplog.records) == 1
+        assert "SELECT slow" in caplog.records[0].getMessage()
+
+    def test_database_execute_is_recorded(self):
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        try:
+            db = Database(path, use_turso=False)
+            db.execute("CREATE TABLE t (x INTEGER)")
+            with track_queries() as queries:
+                db.execute_returning_id("INSERT INTO t (x) VALUES (?)", (1,))
+                db.execute("SELECT x FROM t")
+                with pytest.raises(Exception):
+                    db.execute("SELECT missing FROM t")
+
+            assert queries.count == 3
+            statements = get_query_stats().statements()
+            assert statements["SELECT missing FROM t"].errors >= 1
+        finally:
+            os.unlink(path)
+
+
+class PipelineHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.payloads.append(payload)
+        if self.server.fail_status:
+            status, body = self.server.fail_status, b"{}"
+        else:
+            status = 200
+            body = json.dumps({
+                "baton": "b",
+                "base_url": None,
+                "results": [
+                    {"type": "ok", "response": {"type": "execute", "result": {
+                        "cols": [{"name": "one"}], "rows": [[{"type": "integer", "value": "1"}]],
+                    }}}
+                    for request in payload["requests"] if request["type"] == "execute"
+                ],
+            }).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def pipeline_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PipelineHandler)
+    server.payloads = []
+    server.fail_status = None
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestTursoTransport:
+    def test_round_trip_phases_are_recorded(self, pipeline_server):
+        stats = get_query_stats()
+        before = {phase: h.count for phase, h in stats.phases().items()}
+
+        conn = TursoConnection(f"http://127.0.0.1:{pipeline_server.server_port}", "token")
+        assert conn.execute("SELECT 1 AS one").fetchone()["one"] == 1
+        assert conn.execute("SELECT 1 AS one").fetchone()["one"] == 1
+        conn.close()
+
+        after = {phase: h.count for phase, h in stats.phases().items()}
+        assert after["connect"] - before["connect"] == 1  # keep-alive connection reused
+        assert after["send"] - before["send"] == 3  # two statements and the stream close
+        assert after["wait"] - before["wait"] == 3
+        assert after["parse"] - before["parse"] == 3
+
+    def test_http_errors_are_raised(self, pipeline_server):
+        pipeline_server.fail_status = 500
+        conn = TursoConnection(f"http://127.0.0.1:{pipeline_server.server_port}", "token")
+        with pytest.raises(HTTPError) as error:
+            conn.execute("SELECT 1")
+        assert error.value.code == 500
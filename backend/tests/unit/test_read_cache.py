@@ -0,0 +1,136 @@
+"""Unit tests for the stale-while-revalidate read cache."""
+
+import threading
+import time
+
+import pytest
+
+from src.domain import HouseholdMember
+from src.infrastructure import track_queries
+from src.infrastructure.change_log import ChangeLogEntry
+from src.infrastructure.read_cache import StaleReadCache
+
+
+@pytest.fixture
+def cache():
+    cache = StaleReadCache(budget=0.05)
+    yield cache
+    cache.close()
+
+
+def fail():
+    raise ConnectionResetError()
+
+
+def slow(value, seconds=0.3):
+    def load():
+        time.sleep(seconds)
+        return value
+    return load
+
+
+class TestStaleReadCache:
+    def test_disabled_cache_calls_through(self):
+        cache = StaleReadCache(budget=0)
+        assert cache.read("k", ("tasks",), lambda: 1) == 1
+        with pytest.raises(ConnectionResetError):
+            cache.read("k", ("tasks",), fail)
+
+    def test_fresh_results_are_copies(self, cache):
+        member = HouseholdMember(id=1, name="A")
+        first = cache.read("k", ("household_members",), lambda: [member])
+        first[0].name = "Changed"
+        assert cache.read("k", ("household_members",), fail)[0].name == "A"
+
+    def test_transient_failure_serves_stale(self, cache):
+        cache.read("k", ("tasks",), lambda: 1)
+        with track_queries() as queries:
+            assert cache.read("k", ("tasks",), fail) == 1
+        assert queries.stale_seconds is not None
+        assert cache.counts() == (1, 1)
+
+    def test_failure_without_entry_raises(self, cache):
+        with pytest.raises(ConnectionResetError):
+            cache.read("k", ("tasks",), fail)
+
+    def test_other_errors_raise(self, cache):
+        cache.read("k", ("tasks",), lambda: 1)
+        with pytest.raises(ValueError):
+            cache.read("k", ("tasks",), lambda: int("x"))
+
+    def test_slow_read_serves_stale_then_refreshes(self, cache):
+        cache.read("k", ("tasks",), lambda: 1)
+
+        started = time.perf_counter()
+        assert cache.read("k", ("tasks",), slow(2)) == 1
+        assert time.perf_counter() - started < 0.2
+
+        time.sleep(0.4)  # the read completes in the background
+        assert cache.read("k", ("tasks",), fail) == 2
+
+    def test_concurrent_slow_reads_share_one_load(self, cache):
+        cache.read("k", ("tasks",), lambda: 1)
+        calls = []
+
+        def load():
+            calls.append(1)
+            time.sleep(0.2)
+            return 2
+
+        assert cache.read("k", ("tasks",), load) == 1
+        assert cache.read("k", ("tasks",), load) == 1
+        assert len(calls) == 1
+
+    def test_outdated_entry_waits_for_slow_read(self, cache):
+        cache.read("k", ("tasks",), lambda: 1)
+        cache.on_changes([ChangeLogEntry(id=1, table_name="tasks", row_id=1, operation="update")])
+
+        assert cache.read("k", ("tasks",), slow(2, seconds=0.1)) == 2
+        # ...but still serves it when the read fails
+        cache.invalidate()
+        assert cache.read("k", ("tasks",), fail) == 2
+
+    def test_invalidation_is_per_table(self, cache):
+        cache.read("tasks", ("tasks",), lambda: 1)
+        cache.read("notes", ("notes",), lambda: 1)
+        cache.invalidate(["notes"])
+
+        assert cache.read("tasks", ("tasks",), slow(2)) == 1
+        assert cache.read("notes", ("notes",), slow(2, seconds=0.1)) == 2
+
+    def test_reads_without_a_fallback_run_in_the_calling_thread(self, cache):
+        threads = []
+
+        def load():
+            threads.append(threading.get_ident())
+            return 1
+
+        cache.read("k", ("tasks",), load)
+        cache.invalidate()
+        cache.read("k", ("tasks",), load)
+        assert threads == [threading.get_ident()] * 2
+        assert cache._executor is None
+
+    def test_concurrent_waits_share_a_read_in_the_calling_thread(self, cache):
+        calls = []
+
+        def load():
+            calls.append(1)
+            time.sleep(0.2)
+            return 1
+
+        other = threading.Thread(target=cache.read, args=("k", ("tasks",), load))
+        other.start()
+        time.sleep(0.05)
+        assert cache.read("k", ("tasks",), load) == 1
+        other.join()
+        assert len(calls) == 1
+
+    def test_oldest_keys_are_evicted(self):
+        cache = StaleReadCache(budget=0.05, max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.read(key, ("tasks",), lambda: 1)
+        with pytest.raises(ConnectionResetError):
+            cache.read("a", ("tasks",), fail)
+        assert cache.read("c", ("tasks",), fail) == 1
+        cache.close()
@@ -0,0 +1,134 @@
+"""Unit tests for the compiled task row mappers and bulk reads and writes."""
+
+import sqlite3
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from src.domain import RecurrenceType, TaskCompletion, TimeOfDay, Urgency
+from src.infrastructure import Database, SQLiteCompletionRepository, SQLiteTaskRepository
+from src.infrastructure.database import TursoRow
+from src.infrastructure.repositories import task_mapper, recurrence_pattern
+
+COLUMNS = (
+    "id", "name", "recurrence_type", "recurrence_days", "recurrence_interval", "time_of_day",
+    "urgency_label", "last_completed", "next_due", "is_active", "assigned_to_id", "autocomplete",
+    "description",
+)
+
+
+def sqlite_rows(*values):
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    placeholders = ", ".join(f"? AS {name}" for name in COLUMNS)
+    return [conn.execute(f"SELECT {placeholders}", v).fetchone() for v in values]
+
+
+ROW = (1, "Dishes", "weekly", "[0, 3]", 2, "evening", "high", "2024-01-01T08:00:00", "2024-01-08", 1, 5, 0, "Text")
+
+
+class TestTaskMapper:
+    def test_maps_all_columns(self):
+        [row] = sqlite_rows(ROW)
+        task = task_mapper(tuple(row.keys()))(row)
+
+        assert task.id == 1
+        assert task.name == "Dishes"
+        assert task.recurrence.type == RecurrenceType.WEEKLY
+        assert task.recurrence.days == (0, 3)
+        assert task.recurrence.interval == 2
+        assert task.recurrence.time_of_day == TimeOfDay.EVENING
+        assert task.urgency_label == Urgency.HIGH
+        assert task.last_completed.hour == 8
+        assert task.next_due == date(2024, 1, 8)
+        assert task.is_active is True
+        assert task.assigned_to_id == 5
+        assert task.autocomplete is False
+        assert task.description == "Text"
+
+    def test_identical_recurrences_are_shared(self):
+        rows = sqlite_rows(ROW, (2,) + ROW[1:])
+        mapper = task_mapper(tuple(rows[0].keys()))
+        first, second = (mapper(row) for row in rows)
+        assert first.recurrence is second.recurrence
+        assert first is not second
+
+    def test_mapper_is_compiled_once_per_layout(self):
+        assert task_mapper(COLUMNS) is task_mapper(COLUMNS)
+
+    def test_missing_optional_columns_use_defaults(self):
+        columns = ("id", "recurrence_type", "recurrence_days", "recurrence_interval",
+                   "urgency_label", "next_due", "is_active", "autocomplete")
+        row = TursoRow((3, "daily", None, None, None, None, 1, None), {name: i for i, name in enumerate(columns)})
+        task = task_mapper(columns)(row)
+
+        assert task.name == ""
+        assert task.description is None
+        assert task.assigned_to_id is None
+        assert task.recurrence == recurrence_pattern("daily", None, 1, None)
+
+    def test_missing_core_column_is_rejected(self):
+        with pytest.raises(ValueError, match="next_due"):
+            task_mapper(("id", "name"))
+
+
+class TestCompletionSaveMany:
+    @pytest.fixture
+    def repo(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("src.infrastructure.repositories.COMPLETIONS_PER_INSERT", 4)
+        db = Database(str(tmp_path / "completions.db"), use_turso=False)
+        db.execute("""CREATE TABLE task_completions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, task_id INTEGER, completed_at TEXT, completed_by_id INTEGER
+        )""")
+        return SQLiteCompletionRepository(db)
+
+    def test_inserts_in_chunks_and_assigns_ids(self, repo):
+        repo.save(TaskCompletion(id=None, task_id=1, completed_at=datetime(2024, 1, 1)))
+        start = datetime(2024, 2, 1, 9)
+        completions = [
+            TaskCompletion(id=None, task_id=i, completed_at=start + timedelta(days=i), completed_by_id=i % 2 or None)
+            for i in range(10)
+        ]
+
+        repo.save_many(completions)
+
+        assert [c.id for c in completions] == list(range(2, 12))
+        stored = {c.id: c for c in repo.get_all()}
+        for completion in completions:
+            assert stored[completion.id] == completion
+
+    def test_empty(self, repo):
+        assert repo.save_many([]) == []
+
+    def test_save_missing_skips_stored_completions(self, repo):
+        at = datetime(2024, 2, 1, 9, 30, 0, 123456)
+        first = [TaskCompletion(id=None, task_id=1, completed_at=at), TaskCompletion(id=None, task_id=2, completed_at=at)]
+        assert len(repo.save_missing(first)) == 2
+
+        replayed = [
+            TaskCompletion(id=None, task_id=1, completed_at=at),
+            TaskCompletion(id=None, task_id=1, completed_at=at + timedelta(seconds=1)),
+        ]
+        assert [c.completed_at for c in repo.save_missing(replayed)] == [at + timedelta(seconds=1)]
+        assert len(repo.get_all()) == 3
+
+
+class TestTaskBulkStatements:
+    @pytest.fixture
+    def repo(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("src.infrastructure.repositories.IDS_PER_STATEMENT", 2)
+        db = Database(str(tmp_path / "tasks.db"), use_turso=False)
+        db.execute("CREATE TABLE tasks (id INTEGER PRIMARY KEY, name TEXT, next_due TEXT)")
+        for i in range(1, 6):
+            db.execute("INSERT INTO tasks (id, name) VALUES (?, ?)", (i, f"Task {i}"))
+        return SQLiteTaskRepository(db)
+
+    def test_get_names_in_chunks(self, repo):
+        assert repo.get_names([5, 1, 3, 1, 4, 99]) == {1: "Task 1", 3: "Task 3", 4: "Task 4", 5: "Task 5"}
+        assert repo.get_names([]) == {}
+
+    def test_update_next_due_dates_in_chunks(self, repo):
+        repo.update_next_due_dates({i: date(2024, 3, i) for i in range(1, 6)} | {5: None})
+        rows = repo.db.execute("SELECT id, next_due FROM tasks ORDER BY id")
+        assert [row["next_due"] for row in rows] == ["2024-03-01", "2024-03-02", "2024-03-03", "2024-03-04", None]
+        repo.update_next_due_dates({})
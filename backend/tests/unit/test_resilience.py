@@ -0,0 +1,107 @@
+"""Unit tests for the Turso retry policy and circuit breaker."""
+
+import http.client
+import time
+from urllib.error import HTTPError
+
+import pytest
+
+from src.infrastructure.resilience import (
+    RETRY_BACKOFF_CAP,
+    CircuitBreaker,
+    CircuitOpenError,
+    LatencyWindow,
+    backoff_delay,
+    is_read_statement,
+    is_transient,
+)
+
+
+class TestIsReadStatement:
+    @pytest.mark.parametrize("sql", [
+        "SELECT * FROM tasks",
+        "  select 1",
+        "WITH recent AS (SELECT 1) SELECT * FROM recent",
+        "EXPLAIN QUERY PLAN SELECT 1",
+    ])
+    def test_reads(self, sql):
+        assert is_read_statement(sql)
+
+    @pytest.mark.parametrize("sql", [
+        "INSERT INTO tasks (name) VALUES (?)",
+        "UPDATE tasks SET name = ?",
+        "WITH old AS (SELECT id FROM tasks) DELETE FROM tasks WHERE id IN old",
+        "BEGIN",
+        "",
+    ])
+    def test_writes_and_others(self, sql):
+        assert not is_read_statement(sql)
+
+
+class TestIsTransient:
+    def test_network_errors_and_overload_statuses(self):
+        assert is_transient(ConnectionResetError())
+        assert is_transient(TimeoutError())
+        assert is_transient(http.client.RemoteDisconnected())
+        assert is_transient(HTTPError("url", 503, "Unavailable", {}, None))
+        assert is_transient(HTTPError("url", 429, "Too Many Requests", {}, None))
+
+    def test_client_errors_are_not(self):
+        assert not is_transient(HTTPError("url", 401, "Unauthorized", {}, None))
+        assert not is_transient(ValueError())
+
+
+def test_backoff_grows_and_is_capped():
+    for attempt in range(10):
+        delay = backoff_delay(attempt)
+        assert 0 <= delay <= min(RETRY_BACKOFF_CAP, 0.05 * 2 ** attempt)
+
+
+class TestLatencyWindow:
+    def test_percentile_needs_enough_samples(self):
+        window = LatencyWindow(size=100)
+        for i in range(19):
+            window.observe(i / 1000)
+        assert window.percentile(95) is None
+
+    def test_percentile_of_recent_samples(self):
+        window = LatencyWindow(size=100)
+        for i in range(1, 201):
+            window.observe(i / 1000)
+        # Only the last 100 samples (0.101 .. 0.200) are kept
+        assert window.percentile(95) == pytest.approx(0.196)
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker(failures=3, reset_seconds=60)
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()  # resets the count
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.before_call()
+        breaker.record_failure()
+
+        assert breaker.is_open
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+    def test_half_open_trial(self):
+        breaker = CircuitBreaker(failures=1, reset_seconds=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+
+        breaker.before_call()  # the trial call
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()  # only one trial at a time
+        breaker.record_failure()
+        assert breaker.is_open
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+        time.sleep(0.02)
+        breaker.before_call()
+        breaker.record_success()
+        assert not breaker.is_open
+        breaker.before_call()
@@ -0,0 +1,85 @@
+"""Unit tests for the fast task list serialization path."""
+
+from datetime import date, datetime
+
+import pytest
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from src.domain import Task, RecurrencePattern, RecurrenceType, Urgency, TimeOfDay
+from src.application import TaskWithUrgency
+from src.presentation.main import app
+from src.presentation.routes.tasks import task_with_urgency_to_response
+from src.presentation.schemas import TaskResponse
+from src.presentation.serialization import task_list_payload, json_response
+
+TASKS = [
+    TaskWithUrgency(
+        task=Task(id=1, name="Minimal", recurrence=RecurrencePattern(type=RecurrenceType.EENMALIG)),
+        calculated_urgency=Urgency.LOW,
+    ),
+    TaskWithUrgency(
+        task=Task(
+            id=2,
+            name="Everything set – met ünïcode",
+            recurrence=RecurrencePattern(
+                type=RecurrenceType.WEEKLY,
+                days=(0, 3),
+                interval=2,
+                time_of_day=TimeOfDay.EVENING,
+            ),
+            urgency_label=Urgency.MEDIUM,
+            last_completed=datetime(2026, 1, 2, 3, 4, 5, 678901),
+            next_due=date(2026, 1, 9),
+            is_active=False,
+            assigned_to_id=7,
+            autocomplete=True,
+            description="Line one\nLine \"two\"",
+        ),
+        calculated_urgency=Urgency.HIGH,
+    ),
+    TaskWithUrgency(
+        task=Task(
+            id=3,
+            name="Unknown assignee",
+            recurrence=RecurrencePattern(type=RecurrenceType.MONTHLY),
+            assigned_to_id=99,
+        ),
+        calculated_urgency=Urgency.MEDIUM,
+    ),
+]
+
+
+class TestTaskListSerialization:
+    def test_matches_response_model_output(self):
+        member_names = {7: "John"}
+        expected = TypeAdapter(list[TaskResponse]).dump_json(
+            [task_with_urgency_to_response(t, member_names=member_names) for t in TASKS]
+        )
+
+        response = json_response(task_list_payload(TASKS, member_names))
+
+        assert response.body == expected
+        assert response.media_type == "application/json"
+
+    def test_repeated_headers_are_carried_over(self):
+        injected = Response()
+        injected.headers.append("Set-Cookie", "a=1")
+        injected.headers.append("Set-Cookie", "b=2")
+        injected.headers["ETag"] = '"v1"'
+
+        response = json_response([], injected)
+
+        assert response.headers.getlist("set-cookie") == ["a=1", "b=2"]
+        assert response.headers["etag"] == '"v1"'
+        assert response.headers["content-length"] == "2"
+
+    def test_payload_validates_against_response_model(self):
+        payload = task_list_payload(TASKS, {})
+        validated = TypeAdapter(list[TaskResponse]).validate_python(payload)
+        assert [t.id for t in validated] == [1, 2, 3]
+
+    @pytest.mark.parametrize("path", ["/api/tasks", "/api/tasks/urgent", "/api/tasks/upcoming"])
+    def test_openapi_schema_still_describes_task_response(self, path):
+        schema = app.openapi()["paths"][path]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+        assert "TaskResponse" in str(schema)
@@ -1,6 +1,6 @@
 """Unit tests for use cases with mocked repositories."""
 
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from unittest.mock import MagicMock
 
 import pytest
@@ -19,12 +19,15 @@ from src.application import (
     UpdateTask,
     CompleteTask,
     GetAllTasks,
+    GetTaskChanges,
     GetUrgentTasks,
     DeactivateTask,
     CreateMember,
     GetAllMembers,
     GetNote,
     UpdateNote,
+    GetDashboard,
+    ChangeEventType,
 )
 
 
@@ -163,6 +166,30 @@ class TestCompleteTask:
         assert completed_task.last_completed is not None
         mock_completion_repo.save.assert_called_once()
 
+    def test_journal_replaces_both_writes(self):
+        task = Task(
+            id=1,
+            name="Once",
+            recurrence=RecurrencePattern(type=RecurrenceType.EENMALIG),
+            next_due=date.today(),
+        )
+        mock_task_repo = MagicMock()
+        mock_task_repo.get_by_id.return_value = task
+        mock_completion_repo = MagicMock()
+        journal = MagicMock()
+        journal.record.side_effect = lambda completion, task: completion
+
+        completed_task, completion = CompleteTask(mock_task_repo, mock_completion_repo, journal=journal).execute(
+            task_id=1, member_id=2
+        )
+
+        journal.record.assert_called_once_with(completion, completed_task)
+        assert completion.completed_by_id == 2
+        assert completed_task.last_completed == completion.completed_at
+        assert not completed_task.is_active
+        mock_task_repo.save.assert_not_called()
+        mock_completion_repo.save.assert_not_called()
+
     def test_returns_none_for_nonexistent_task(self):
         mock_task_repo = MagicMock()
         mock_task_repo.get_by_id.return_value = None
@@ -202,6 +229,38 @@ class TestGetAllTasks:
         assert result[1].calculated_urgency == Urgency.LOW
 
 
+class TestGetTaskChanges:
+    def test_splits_changed_and_deactivated_tasks(self):
+        task_repo = MagicMock()
+        task_repo.get_changed_since.return_value = [
+            Task(id=1, name="Changed", recurrence=RecurrencePattern(type=RecurrenceType.DAILY)),
+            Task(id=2, name="Gone", recurrence=RecurrencePattern(type=RecurrenceType.DAILY), is_active=False),
+        ]
+        version_repo = MagicMock()
+        version_repo.get_version.return_value = 12
+
+        use_case = GetTaskChanges(task_repo, version_repo)
+        result = use_case.execute(since=10)
+
+        assert result.version == 12
+        assert [t.task.id for t in result.tasks] == [1]
+        assert result.deleted_ids == [2]
+        task_repo.get_changed_since.assert_called_once_with(10)
+
+    def test_includes_inactive_tasks_when_not_active_only(self):
+        task_repo = MagicMock()
+        task_repo.get_changed_since.return_value = [
+            Task(id=2, name="Gone", recurrence=RecurrencePattern(type=RecurrenceType.DAILY), is_active=False),
+        ]
+        version_repo = MagicMock()
+        version_repo.get_version.return_value = 3
+
+        result = GetTaskChanges(task_repo, version_repo).execute(since=0, active_only=False)
+
+        assert [t.task.id for t in result.tasks] == [2]
+        assert result.deleted_ids == []
+
+
 class TestGetUrgentTasks:
     def test_returns_only_high_urgency_tasks(self):
         tasks = [
@@ -371,3 +430,133 @@ class TestUpdateNote:
 
         assert result.content == ""
         mock_repo.save.assert_called_once()
+
+
+class TestGetDashboard:
+    def test_partitions_tasks_in_single_scan(self):
+        tasks = [
+            Task(
+                id=1,
+                name="Due today",
+                recurrence=RecurrencePattern(type=RecurrenceType.DAILY),
+                next_due=date.today(),
+            ),
+            Task(
+                id=2,
+                name="Due in three days",
+                recurrence=RecurrencePattern(type=RecurrenceType.WEEKLY),
+                next_due=date.today() + timedelta(days=3),
+            ),
+            Task(
+                id=3,
+                name="Far away",
+                recurrence=RecurrencePattern(type=RecurrenceType.MONTHLY),
+                next_due=date.today() + timedelta(days=30),
+            ),
+        ]
+        task_repo = MagicMock()
+        task_repo.get_all.return_value = tasks
+        member_repo = MagicMock()
+        member_repo.get_all.return_value = [HouseholdMember(id=1, name="John")]
+        note_repo = MagicMock()
+        note_repo.get.return_value = Note(id=1, content="Milk", updated_at=datetime.now())
+
+        use_case = GetDashboard(task_repo, member_repo, note_repo)
+        result = use_case.execute(upcoming_days=7)
+
+        assert [t.task.id for t in result.tasks] == [1, 2, 3]
+        assert [t.task.id for t in result.urgent] == [1]
+        assert [t.task.id for t in result.upcoming] == [1, 2]
+        assert result.members[0].name == "John"
+        assert result.note.content == "Milk"
+        task_repo.get_all.assert_called_once_with(active_only=True)
+        member_repo.get_all.assert_called_once()
+
+    def test_advances_overdue_autocomplete_tasks(self):
+        task = Task(
+            id=1,
+            name="Auto",
+            recurrence=RecurrencePattern(type=RecurrenceType.DAILY),
+            next_due=date.today() - timedelta(days=2),
+            autocomplete=True,
+        )
+        task_repo = MagicMock()
+        task_repo.get_all.return_value = [task]
+
+        use_case = GetDashboard(task_repo, MagicMock(), MagicMock())
+        result = use_case.execute()
+
+        assert result.tasks[0].task.next_due == date.today()
+        task_repo.update_next_due_dates.assert_called_once_with({1: date.today()})
+        task_repo.save.assert_not_called()
+
+
+class TestChangeEventPublishing:
+    def test_create_task_publishes_created_event(self):
+        saved = Task(id=1, name="New", recurrence=RecurrencePattern(type=RecurrenceType.DAILY))
+        task_repo = MagicMock()
+        task_repo.save.return_value = saved
+        publisher = MagicMock()
+
+        CreateTask(task_repo, publisher).execute(name="New", recurrence=saved.recurrence)
+
+        event = publisher.publish.call_args.args[0]
+        assert event.type == ChangeEventType.TASK_CREATED
+        assert event.task is saved
+
+    def test_complete_task_publishes_completed_event(self):
+        task = Task(id=1, name="Task", recurrence=RecurrencePattern(type=RecurrenceType.DAILY))
+        task_repo = MagicMock()
+        task_repo.get_by_id.return_value = task
+        task_repo.save.return_value = task
+        publisher = MagicMock()
+
+        CompleteTask(task_repo, MagicMock(), publisher).execute(task_id=1)
+
+        event = publisher.publish.call_args.args[0]
+        assert event.type == ChangeEventType.TASK_COMPLETED
+        assert event.task.last_completed is not None
+
+    def test_update_deactivating_task_publishes_deactivated_event(self):
+        task = Task(id=1, name="Task", recurrence=RecurrencePattern(type=RecurrenceType.DAILY))
+        task_repo = MagicMock()
+        task_repo.get_by_id.return_value = task
+        task_repo.save.return_value = task
+        publisher = MagicMock()
+
+        UpdateTask(task_repo, publisher).execute(task_id=1, is_active=False)
+
+        assert publisher.publish.call_args.args[0].type == ChangeEventType.TASK_DEACTIVATED
+
+    def test_deactivate_task_publishes_deactivated_event(self):
+        task = Task(id=1, name="Task", recurrence=RecurrencePattern(type=RecurrenceType.DAILY))
+        task_repo = MagicMock()
+        task_repo.get_by_id.return_value = task
+        task_repo.save.return_value = task
+        publisher = MagicMock()
+
+        DeactivateTask(task_repo, publisher).execute(task_id=1)
+
+        assert publisher.publish.call_args.args[0].type == ChangeEventType.TASK_DEACTIVATED
+
+    def test_missing_task_publishes_nothing(self):
+        task_repo = MagicMock()
+        task_repo.get_by_id.return_value = None
+        publisher = MagicMock()
+
+        UpdateTask(task_repo, publisher).execute(task_id=999, name="x")
+
+        publisher.publish.assert_not_called()
+
+    def test_update_note_publishes_note_event(self):
+        note = Note(id=1, content="Old", updated_at=datetime.now())
+        note_repo = MagicMock()
+        note_repo.get.return_value = note
+        note_repo.save.return_value = note
+        publisher = MagicMock()
+
+        UpdateNote(note_repo, publisher).execute(content="New")
+
+        event = publisher.publish.call_args.args[0]
+        assert event.type == ChangeEventType.NOTE_UPDATED
+        assert event.note.content == "New"